@@ -15,11 +15,12 @@ class Animation:
         controllers,
         plotting,
         result,
+        deterministic: bool = False,
     ):
         self.visual = visual
         self.parameters = parameters
         self.history = history
-        self.movement = Movement(parameters, history)
+        self.movement = Movement(parameters, history, deterministic)
         self.controllers = controllers
         self.plotting = plotting
         self.result = result
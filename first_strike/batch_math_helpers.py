@@ -0,0 +1,160 @@
+"""Vectorised maths helpers, for many objects at once.
+
+Kept apart from math_helpers, which every game imports, so numpy is only
+imported by the code that uses these.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+class RelativeObjectsBatch:
+    """Vectorised version of RelativeObjects, for many pairs of objects at once.
+
+    Locations and velocities are arrays of shape (n, 2), or anything that
+    broadcasts to it (eg: a single (2,) location shared by every pair).
+    Where RelativeObjects would return None, the batch returns nan.
+
+    Attributes:
+        - object_a_locations: The current locations of objects a.
+        - object_b_locations: The current locations of objects b.
+        - object_a_velocities: The current velocities of objects a.
+        - object_b_velocities: The current velocities of objects b.
+    Methods:
+        - locations: Calculates the locations of objects a and b at given times.
+        - distance: Calculates the distances between objects a and b at given times.
+        - minimum_distance_between_objects: Calculates when and where each pair is closest together.
+        - times_objects_within_distance: Calculates when each pair enters and exits a given distance.
+        - time_objects_first_within_distance: Calculates when each pair is first a given distance apart.
+    """
+
+    def __init__(
+        self,
+        object_a_locations,
+        object_b_locations,
+        object_a_velocities=(0.0, 0.0),
+        object_b_velocities=(0.0, 0.0),
+    ):
+        """Create an instance of RelativeObjectsBatch
+
+        args:
+            - object_a_locations: The current locations of objects a.
+            - object_b_locations: The current locations of objects b.
+            - object_a_velocities: The current velocities of objects a.
+            - object_b_velocities: The current velocities of objects b.
+        """
+        self.object_a_locations = np.asarray(object_a_locations, dtype=float)
+        self.object_b_locations = np.asarray(object_b_locations, dtype=float)
+        self.object_a_velocities = np.asarray(object_a_velocities, dtype=float)
+        self.object_b_velocities = np.asarray(object_b_velocities, dtype=float)
+
+        # Relative position and velocity of b from a
+        self._dp = self.object_b_locations - self.object_a_locations
+        self._dv = self.object_b_velocities - self.object_a_velocities
+        self._dp, self._dv = np.broadcast_arrays(self._dp, self._dv)
+
+    def locations(self, times=0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculates the locations of objects a and b at given times.
+
+        args:
+            times: Scalar, or one time per pair.
+        return:
+            locations: Locations of objects a and b at the given times, each (n, 2).
+        """
+        times = np.asarray(times, dtype=float)[..., None]
+
+        return (
+            self.object_a_locations + self.object_a_velocities * times,
+            self.object_b_locations + self.object_b_velocities * times,
+        )
+
+    def distance(self, times=0.0) -> np.ndarray:
+        """Calculates the distances between objects a and b at given times."""
+
+        location_a, location_b = self.locations(times)
+        return np.hypot(*(location_b - location_a).T)
+
+    def _get_relative_position_equation_constants(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Same constants as RelativeObjects, one per pair.
+
+        For internal use only
+        """
+
+        x1, y1 = self._dv[..., 0], self._dv[..., 1]
+        x2, y2 = self._dp[..., 0], self._dp[..., 1]
+
+        a = x1 ** 2 + y1 ** 2
+        b = 2 * (x1 * x2 + y1 * y2)
+        c = x2 ** 2 + y2 ** 2
+
+        return a, b, c
+
+    def minimum_distance_between_objects(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray, Tuple[np.ndarray, np.ndarray]]:
+        """Calculates when and where each pair of objects is closest together.
+
+        As with RelativeObjects, times in the past are clamped to 0, and pairs with
+        exactly equal velocities are closest at time 0.
+
+        return:
+            min_dist: Minimum distance between each pair, (n,).
+            time: Time at which the minimum distance occurs, (n,).
+            locations: Locations of objects a and b at the minimum distance, each (n, 2).
+        """
+
+        a, b, _ = self._get_relative_position_equation_constants()
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            time = np.where(a == 0, 0.0, -b / (2 * a))
+        time = np.maximum(time, 0.0)
+
+        location_a, location_b = self.locations(time)
+        min_dist = np.hypot(*(location_b - location_a).T)
+
+        return min_dist, time, (location_a, location_b)
+
+    def times_objects_within_distance(self, distance) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculates when each pair of objects enters and exits a given distance.
+
+        args:
+            distance: Scalar, or one distance per pair.
+        return:
+            entry_time: When the pair first comes within distance; nan if the pair
+                never does, or is already within distance at t = 0.
+            exit_time: When the pair stops being within distance; nan if the pair
+                is never within distance for positive time.
+        """
+
+        a, b, c = self._get_relative_position_equation_constants()
+        c = c - np.asarray(distance, dtype=float) ** 2
+
+        determinant = b ** 2 - 4 * a * c
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sqrt_det = np.sqrt(determinant)  # nan where determinant < 0
+            t1 = (-b - sqrt_det) / (2 * a)
+            t2 = (-b + sqrt_det) / (2 * a)
+        t1 = np.where(a == 0, np.nan, t1)
+        t2 = np.where(a == 0, np.nan, t2)
+
+        t_min = np.fmin(t1, t2)
+        t_max = np.fmax(t1, t2)
+
+        exit_time = np.where(t_max >= 0, t_max, np.nan)
+        entry_time = np.where((t_min >= 0) & (t_max >= 0), t_min, np.nan)
+
+        return entry_time, exit_time
+
+    def time_objects_first_within_distance(self, distance) -> np.ndarray:
+        """Calculates when each pair of objects is first a given distance apart.
+
+        nan where the pair never comes within distance, or already is at t = 0.
+        """
+
+        entry_time, _ = self.times_objects_within_distance(distance)
+
+        return entry_time
@@ -0,0 +1,313 @@
+"""Command line interface to first strike.
+
+Usage: python first_strike/cli.py <command> [options]
+
+    play [game_parameters.json]              Play a game, drawing it as it goes.
+    run [game_parameters.json]               Play a game headless and print the outcome.
+    tournament scenarios.jsonl               Play every matchup on every scenario.
+    replay scenarios.jsonl [--index N]       Replay a scenario exactly as a tournament played it.
+    bench [game_parameters.json]             Time headless games.
+    profile [game_parameters.json]           Profile a headless game with cProfile.
+
+Run any command with -h for its options.
+
+Each command imports only what it uses, when it runs: matplotlib and the
+plotting modules are only imported by play and by replay without --headless,
+so the headless commands start without paying for them.
+"""
+
+import argparse
+import sys
+
+DEFAULT_GAME_PARAMETERS_PATH = "first_strike/game_parameters.json"
+
+
+def _play(args):
+
+    from game import play
+
+    result = play(args.path)
+    print(f"Cause: {result.cause}, winner: {result.winner}")
+
+
+def _run(args):
+
+    from game_parameters import process_game_parameters
+    from headless import play_headless
+
+    controller_parameters, _, parameters, history = process_game_parameters(args.path)
+    telemetry = _telemetry(args.telemetry) if args.telemetry else None
+    try:
+        result = play_headless(
+            controller_parameters,
+            parameters,
+            history,
+            args.deterministic,
+            args.early_resolution,
+            telemetry,
+        )
+    finally:
+        if telemetry:
+            telemetry.close()
+    print(f"Cause: {result.cause}, winner: {result.winner}")
+
+
+def _telemetry(target: str):
+    """Telemetry to a file, or to a Unix socket given as unix:path."""
+
+    from telemetry import FileSink, Telemetry, UnixSocketSink
+
+    if target.startswith("unix:"):
+        return Telemetry(UnixSocketSink(target[len("unix:") :]))
+
+    return Telemetry(FileSink(target))
+
+
+def _matchups(rockets, turrets):
+
+    return [(rocket, turret) for rocket in rockets for turret in turrets]
+
+
+def _tournament(args):
+
+    import csv
+
+    from result_store import ResultStore
+    from scenario_cache import ScenarioCache
+    from tournament import Tournament
+
+    scenarios = ScenarioCache().load_jsonl(args.scenarios)
+    store = ResultStore(args.store) if args.store else None
+    tournament = Tournament(
+        scenarios,
+        _matchups(args.rocket, args.turret),
+        store,
+        args.early_resolution,
+    )
+    try:
+        if args.summary:
+            rows = tournament.aggregate(args.workers).summary()
+        else:
+            rows = tournament.run(args.workers)
+    finally:
+        if store:
+            store.close()
+
+    if not rows:
+        print("No games played")
+        return
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    elif args.summary:
+        for row in rows:
+            print(f"{row.pop('rocket')} vs {row.pop('turret')}:")
+            for name, value in row.items():
+                print(f"    {name}: {value}")
+    else:
+        for row in rows:
+            print(
+                f"{row['rocket']} vs {row['turret']}: {row['cause']}, "
+                f"winner: {row['winner']}, ticks: {row['ticks']}"
+            )
+
+
+def _replay(args):
+
+    from scenario_cache import ScenarioCache
+
+    scenario = ScenarioCache().load_jsonl(args.scenarios)[args.index]
+    matchup = (args.rocket, args.turret)
+
+    if args.headless:
+        from headless import new_game, summarise_game
+
+        headless = new_game(scenario, matchup)
+        headless.run()
+        outcome = summarise_game(headless)
+        print(
+            f"Cause: {outcome['cause']}, winner: {outcome['winner']}, "
+            f"ticks: {outcome['ticks']}, final state: {headless.state_digests[-1]}"
+        )
+        return
+
+    from game import animate
+
+    controller_parameters, visual, parameters, history = scenario.new_game()
+    controller_parameters = matchup + controller_parameters[2:]
+    result = animate(
+        controller_parameters, visual, parameters, history, deterministic=True
+    )
+    print(f"Cause: {result.cause}, winner: {result.winner}")
+
+
+def _bench(args):
+
+    import time
+
+    from headless import new_game
+    from scenario_cache import ScenarioCache
+
+    scenario = ScenarioCache().load(args.path)
+
+    ticks = 0
+    start = time.perf_counter()
+    for _ in range(args.games):
+        headless = new_game(scenario, early_resolution=args.early_resolution)
+        headless.run()
+        ticks += headless.movement.tick
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{args.games} games, {ticks} ticks in {elapsed:.3f} s: "
+        f"{args.games / elapsed:.2f} games/s, {1000 * elapsed / ticks:.3f} ms/tick"
+    )
+
+
+def _profile(args):
+
+    import cProfile
+    import pstats
+
+    from game_parameters import process_game_parameters
+    from headless import play_headless
+
+    controller_parameters, _, parameters, history = process_game_parameters(args.path)
+    profiler = cProfile.Profile()
+    profiler.runcall(
+        play_headless,
+        controller_parameters,
+        parameters,
+        history,
+        args.deterministic,
+        args.early_resolution,
+    )
+
+    if args.output:
+        profiler.dump_stats(args.output)
+    else:
+        pstats.Stats(profiler).sort_stats(args.sort).print_stats(args.limit)
+
+
+def _add_game_options(parser: argparse.ArgumentParser):
+
+    parser.add_argument(
+        "path",
+        nargs="?",
+        default=DEFAULT_GAME_PARAMETERS_PATH,
+        help="game parameters file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--early-resolution",
+        action="store_true",
+        help="stop the game as soon as its outcome is certain",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+
+    parser = argparse.ArgumentParser(
+        prog="first_strike",
+        description="Programming game between a rocket and a turret.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    play = commands.add_parser("play", help="play a game, drawing it as it goes")
+    play.add_argument("path", nargs="?", default=DEFAULT_GAME_PARAMETERS_PATH)
+    play.set_defaults(handler=_play)
+
+    run = commands.add_parser("run", help="play a game headless")
+    _add_game_options(run)
+    run.add_argument(
+        "--deterministic", action="store_true", help="play in determinism mode"
+    )
+    run.add_argument(
+        "--telemetry",
+        help="stream a record of every tick to a file, or to a Unix socket as unix:path",
+    )
+    run.set_defaults(handler=_run)
+
+    tournament = commands.add_parser(
+        "tournament", help="play every matchup on every scenario"
+    )
+    tournament.add_argument("scenarios", help="scenarios, one per line (.jsonl)")
+    tournament.add_argument(
+        "--rocket",
+        nargs="+",
+        default=["default"],
+        help="rocket controllers: registered names or dotted paths",
+    )
+    tournament.add_argument(
+        "--turret",
+        nargs="+",
+        default=["default"],
+        help="turret controllers: registered names or dotted paths",
+    )
+    tournament.add_argument("--store", help="store of previous outcomes (.sqlite3)")
+    tournament.add_argument(
+        "--workers", type=int, help="worker processes (default: one per CPU)"
+    )
+    tournament.add_argument(
+        "--early-resolution",
+        action="store_true",
+        help="stop each game as soon as its outcome is certain",
+    )
+    tournament.add_argument(
+        "--summary",
+        action="store_true",
+        help="a row per matchup of running statistics and ratings, instead of per game",
+    )
+    tournament.add_argument("--output", help="write the rows to a CSV file")
+    tournament.set_defaults(handler=_tournament)
+
+    replay = commands.add_parser(
+        "replay", help="replay a scenario exactly as a tournament played it"
+    )
+    replay.add_argument("scenarios", help="scenarios, one per line (.jsonl)")
+    replay.add_argument(
+        "--index", type=int, default=0, help="line of the scenario (default: 0)"
+    )
+    replay.add_argument("--rocket", default="default", help="rocket controller")
+    replay.add_argument("--turret", default="default", help="turret controller")
+    replay.add_argument(
+        "--headless",
+        action="store_true",
+        help="print the outcome and final state digest instead of drawing the game",
+    )
+    replay.set_defaults(handler=_replay)
+
+    bench = commands.add_parser("bench", help="time headless games")
+    _add_game_options(bench)
+    bench.add_argument(
+        "--games", type=int, default=10, help="games to play (default: 10)"
+    )
+    bench.set_defaults(handler=_bench)
+
+    profile = commands.add_parser("profile", help="profile a headless game")
+    _add_game_options(profile)
+    profile.add_argument(
+        "--deterministic", action="store_true", help="play in determinism mode"
+    )
+    profile.add_argument("--output", help="write the raw stats to a file")
+    profile.add_argument(
+        "--sort", default="cumulative", help="sort order (default: %(default)s)"
+    )
+    profile.add_argument(
+        "--limit", type=int, default=30, help="functions to print (default: 30)"
+    )
+    profile.set_defaults(handler=_profile)
+
+    return parser
+
+
+def main(argv=None):
+
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,219 @@
+"""Continuous collision detection between consecutive ticks.
+
+The discrete checks in Helpers only test where objects are at each tick, so a
+fast rocket or projectile can pass straight through another object between
+two ticks. Here each object is swept in a straight line from where it was at
+the previous tick to where it is now, and a collision is found if the two
+swept circles touch at any point in between:
+
+    |(b0 - a0) + s * ((b1 - b0) - (a1 - a0))| <= radius, for some 0 <= s <= 1
+
+A broad phase discards pairs whose swept bounding boxes don't overlap before
+solving that quadratic. Projectile and obstacle pairs are further limited to
+the obstacles on the projectile's line of fire (see VisibilityTable).
+
+Every check returns the fraction of the timestep at which the objects first
+touch, or None if they don't; 0 if they were already touching.
+"""
+
+import math
+from typing import Optional, Sequence, Tuple
+
+from helpers import Helpers
+from math_helpers import Coordinate
+
+Box = Tuple[float, float, float, float]
+
+
+def swept_box(start: Coordinate, end: Coordinate, radius: float) -> Box:
+    """Bounding box (min x, min y, max x, max y) of a circle swept from start to end."""
+
+    return (
+        min(start.x, end.x) - radius,
+        min(start.y, end.y) - radius,
+        max(start.x, end.x) + radius,
+        max(start.y, end.y) + radius,
+    )
+
+
+def boxes_overlap(box_a: Box, box_b: Box) -> bool:
+
+    return (
+        box_a[0] <= box_b[2]
+        and box_b[0] <= box_a[2]
+        and box_a[1] <= box_b[3]
+        and box_b[1] <= box_a[3]
+    )
+
+
+def first_contact(
+    a_start: Coordinate,
+    a_end: Coordinate,
+    b_start: Coordinate,
+    b_end: Coordinate,
+    distance: float,
+) -> Optional[float]:
+    """Fraction of the sweep at which a and b are first within a distance.
+
+    Arguments
+    ----------
+    a_start, a_end (m): Location of a at the start and end of the sweep.
+    b_start, b_end (m): Location of b at the start and end of the sweep.
+    distance (m): Separation at which a and b touch (the sum of their radii).
+
+    Return
+    ----------
+    fraction: Between 0 and 1; None if a and b are never within the distance.
+    """
+
+    px = b_start.x - a_start.x
+    py = b_start.y - a_start.y
+    vx = (b_end.x - b_start.x) - (a_end.x - a_start.x)
+    vy = (b_end.y - b_start.y) - (a_end.y - a_start.y)
+
+    c = px ** 2 + py ** 2 - distance ** 2
+    if c <= 0:
+        return 0.0
+
+    a = vx ** 2 + vy ** 2
+    b = 2 * (px * vx + py * vy)
+    if a == 0 or b >= 0:
+        return None  # Not moving closer
+
+    determinant = b ** 2 - 4 * a * c
+    if determinant < 0:
+        return None
+
+    fraction = (-b - math.sqrt(determinant)) / (2 * a)
+
+    return fraction if fraction <= 1 else None
+
+
+def earliest(fractions) -> Optional[float]:
+    """The earliest of some fractions, ignoring None; None if there are none."""
+
+    return min((f for f in fractions if f is not None), default=None)
+
+
+class ContinuousCollisions:
+    """Swept collision checks over the most recent timestep.
+
+    Only meaningful after Movement has moved the objects and updated the time.
+
+    Methods
+    ----------
+    rocket_hit_obstacle: When the rocket first touched an obstacle.
+    rocket_hit_turret: When the rocket first touched the turret.
+    projectile_hit_rocket: When a projectile first touched the rocket.
+    projectile_hit_obstacle: When a projectile first entered an obstacle.
+    """
+
+    def __init__(self, parameters, history):
+        self.parameters = parameters
+        self.history = history
+        self.helpers = Helpers(parameters, history)
+
+    def _rocket_sweep(self) -> Tuple[Coordinate, Coordinate]:
+
+        locations = self.history.rocket.locations
+
+        return locations[-2 if len(locations) > 1 else -1], locations[-1]
+
+    def _projectile_sweep(
+        self, projectile, time: float
+    ) -> Tuple[Coordinate, Coordinate]:
+        """Where the projectile was a timestep before a time, and at the time."""
+
+        velocity = self.helpers.calc_projectile_velocity(projectile)
+        turret_location = self.parameters.turret.location
+        dtime = time - projectile.launch_time
+        start_dtime = max(dtime - self.parameters.time.timestep, 0.0)
+
+        return (
+            velocity * start_dtime + turret_location,
+            velocity * dtime + turret_location,
+        )
+
+    def rocket_hit_obstacle(self) -> Optional[float]:
+
+        start, end = self._rocket_sweep()
+        rocket_radius = self.parameters.rocket.target_radius
+        rocket_box = swept_box(start, end, rocket_radius)
+
+        return earliest(
+            first_contact(
+                start,
+                end,
+                obstacle.location,
+                obstacle.location,
+                obstacle.radius + rocket_radius,
+            )
+            for obstacle in self.parameters.environment.obstacles
+            if boxes_overlap(
+                rocket_box,
+                swept_box(obstacle.location, obstacle.location, obstacle.radius),
+            )
+        )
+
+    def rocket_hit_turret(self) -> Optional[float]:
+
+        start, end = self._rocket_sweep()
+        turret = self.parameters.turret
+
+        return first_contact(
+            start,
+            end,
+            turret.location,
+            turret.location,
+            turret.radius + self.parameters.rocket.target_radius,
+        )
+
+    def projectile_hit_rocket(self, projectiles: Sequence = None) -> Optional[float]:
+
+        if projectiles is None:
+            projectiles = self.history.active_projectiles
+
+        start, end = self._rocket_sweep()
+        rocket_radius = self.parameters.rocket.target_radius
+        rocket_box = swept_box(start, end, rocket_radius)
+
+        fractions = []
+        for projectile in projectiles:
+            projectile_start, projectile_end = self._projectile_sweep(
+                projectile, self.history.time
+            )
+            if not boxes_overlap(
+                rocket_box, swept_box(projectile_start, projectile_end, 0.0)
+            ):
+                continue
+
+            fraction = first_contact(
+                start, end, projectile_start, projectile_end, rocket_radius
+            )
+            if fraction is None:
+                continue
+
+            # A projectile stops at the first obstacle it enters
+            obstacle_fraction = self.projectile_hit_obstacle(
+                projectile, self.history.time
+            )
+            if obstacle_fraction is None or fraction <= obstacle_fraction:
+                fractions.append(fraction)
+
+        return earliest(fractions)
+
+    def projectile_hit_obstacle(self, projectile, time: float) -> Optional[float]:
+        """When a projectile first entered an obstacle in the timestep up to a time."""
+
+        start, end = self._projectile_sweep(projectile, time)
+
+        return earliest(
+            first_contact(
+                start,
+                end,
+                shadow.obstacle.location,
+                shadow.obstacle.location,
+                shadow.obstacle.radius,
+            )
+            for shadow in self.helpers.visibility.candidates(projectile.firing_angle)
+        )
@@ -29,3 +29,16 @@ class Controller(ABC):
     @abstractmethod
     def calc_inputs(self):
         pass
+
+    def calc_hold_time(self) -> float:
+        """How long the inputs just returned by calc_inputs hold for (s).
+
+        Called straight after calc_inputs. Until the hold time has passed, the
+        game reuses those inputs rather than calling calc_inputs every timestep.
+        A turret's fire command is only used once. The hold ends early if a
+        projectile is fired or leaves the board. The default of 0 asks to be
+        called every timestep. Anything but a finite, non-negative float makes
+        the inputs invalid.
+        """
+
+        return 0.0
@@ -9,9 +9,10 @@ from typing import Optional
 
 from helpers import Helpers
 from history import History
-from math_helpers import normalise_angle
+from math_helpers import Coordinate, normalise_angle
 from parameters import ObstacleParameters, Parameters
 from physics import Physics
+from visibility import VisibilityTable
 
 
 @dataclass
@@ -21,7 +22,15 @@ class ControllerHelpers:
     physics: Physics
     helpers: Helpers
 
-    def firing_angle2hit_rocket(self) -> Optional[float]:
+    @property
+    def visibility(self) -> VisibilityTable:
+        """Line of fire from the turret to the first obstacle, for every firing angle."""
+
+        return self.helpers.visibility
+
+    def firing_angle2hit_rocket(
+        self, rocket_velocity: Optional[Coordinate] = None
+    ) -> Optional[float]:
         """
         Calculates the firing angle to hit the rocket.
 
@@ -29,6 +38,8 @@ class ControllerHelpers:
         then the projectile would hit the target.
         https://math.stackexchange.com/questions/213545/solving-trigonometric-equations-of-the-form-a-sin-x-b-cos-x-c
 
+        args:
+            rocket_velocity: The rocket velocity, if already calculated this timestep.
         return:
             firing angle (rad): The angle as described above
                 Will return None if no firing angle is possible due to high rocket velocity
@@ -36,7 +47,8 @@ class ControllerHelpers:
         projectile_speed = self.parameters.turret.projectile_speed
         turret_location = self.parameters.turret.location
 
-        rocket_velocity = self.physics.calc_rocket_velocity()
+        if rocket_velocity is None:
+            rocket_velocity = self.physics.calc_rocket_velocity()
         rocket_location = self.history.rocket.location
 
         try:
@@ -64,11 +76,13 @@ class ControllerHelpers:
             beta = math.atan2(B, A)
 
         firing_angle = normalise_angle(m - beta)
-        if self.will_firing_angle_hit(firing_angle):
+        if self.will_firing_angle_hit(firing_angle, rocket_velocity):
             return firing_angle
         return normalise_angle(math.pi - m - beta)
 
-    def will_firing_angle_hit(self, theta: float) -> bool:
+    def will_firing_angle_hit(
+        self, theta: float, rocket_velocity: Optional[Coordinate] = None
+    ) -> bool:
         """Checks if the current firing angle will hit the rocket.
 
         If the turret was a angle theta, and a projectile was fired, and the rocket
@@ -76,12 +90,14 @@ class ControllerHelpers:
 
         args:
             theta (rad): The firing angle of the turret
+            rocket_velocity: The rocket velocity, if already calculated this timestep.
         return:
             _: Projectile will intercept rocket
         """
 
         rocket_location = self.history.rocket.location
-        rocket_velocity = self.physics.calc_rocket_velocity()
+        if rocket_velocity is None:
+            rocket_velocity = self.physics.calc_rocket_velocity()
 
         turret_location = self.parameters.turret.location
         projectile_speed = self.parameters.turret.projectile_speed
@@ -0,0 +1,153 @@
+"""Registries of the rocket and turret controllers that can be played.
+
+A controller is referred to by name, or by where its class can be imported from:
+
+    - A registered name: "default" and "player" are built in, and more can be
+      added with register.
+    - A dotted path: "my_controllers.rocket:RocketController" (or
+      "my_controllers.rocket.RocketController"), importable from sys.path.
+    - An entry point: the name of an entry point in the "first_strike.rocket_controllers"
+      or "first_strike.turret_controllers" group of an installed package.
+
+Controller classes are only imported when first needed, and each is imported once
+per process, so a worker can play any number of controllers without re-importing.
+"""
+
+import importlib
+from typing import Any, Dict, Iterator, Type, Union
+
+from controller import Controller
+
+ENTRY_POINT_GROUP = "first_strike.{side}_controllers"
+
+ControllerReference = Union[str, Type[Controller]]
+
+
+def _entry_points(group: str):
+
+    # Slow to import, and only needed for controllers that aren't registered
+    from importlib import metadata
+
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=group)
+
+    return entry_points.get(group, [])
+
+
+def import_class(path: str) -> type:
+    """Import a class from "module:Class" or "module.Class"."""
+
+    module_name, separator, class_name = path.partition(":")
+    if not separator:
+        module_name, _, class_name = path.rpartition(".")
+    if not module_name or not class_name:
+        raise ValueError(f"Not a dotted path to a class: {path}")
+
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class ControllerRegistry:
+    """The controllers that can be played on one side.
+
+    Attributes
+    ----------
+    side: "rocket" or "turret".
+    references: Registered name of each controller, to its dotted path or class.
+    options: Registered name of a controller, to the keyword arguments it is
+        created with (eg: the weights and gains of a tuned default rocket).
+
+    Methods
+    ----------
+    register: Add a controller under a name.
+    get: The controller class for a name, dotted path or entry point.
+    create: Create a controller from its name, with its registered options.
+    """
+
+    def __init__(self, side: str, references: Dict[str, ControllerReference]):
+        self.side = side
+        self.references = dict(references)
+        self.options: Dict[str, Dict[str, Any]] = {}
+        self._classes: Dict[str, Type[Controller]] = {}
+
+    def register(self, name: str, reference: ControllerReference, **options):
+        """Add a controller under a name, created with the given keyword arguments.
+
+        eg: register("tuned", "default", weights=..., gains=...) plays the default
+        rocket with other weights and gains, under the name "tuned".
+        """
+
+        if isinstance(reference, str) and reference in self.references:
+            reference = self.references[reference]
+        self.references[name] = reference
+        self.options[name] = options
+        self._classes.pop(name, None)
+
+    def get(self, name: str) -> Type[Controller]:
+
+        try:
+            return self._classes[name]
+        except KeyError:
+            pass
+
+        controller = self._load(name)
+        if not (isinstance(controller, type) and issubclass(controller, Controller)):
+            raise TypeError(f"{name} is not a Controller")
+        self._classes[name] = controller
+
+        return controller
+
+    def create(self, name: str, parameters, history, **options) -> Controller:
+        """A new controller; options are added to (or replace) the registered ones."""
+
+        return self.get(name)(
+            parameters, history, **{**self.options.get(name, {}), **options}
+        )
+
+    def _load(self, name: str) -> type:
+
+        reference = self.references.get(name, name)
+        if not isinstance(reference, str):
+            return reference
+        if "." in reference or ":" in reference:
+            return import_class(reference)
+
+        for entry_point in _entry_points(ENTRY_POINT_GROUP.format(side=self.side)):
+            if entry_point.name == reference:
+                return entry_point.load()
+
+        raise KeyError(f"Unknown {self.side} controller: {name}")
+
+    def __getitem__(self, name: str) -> Type[Controller]:
+
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        """Whether a name refers to a controller that can be loaded."""
+
+        try:
+            self.get(name)
+        except (ImportError, AttributeError, KeyError, TypeError, ValueError):
+            return False
+
+        return True
+
+    def __iter__(self) -> Iterator[str]:
+
+        return iter(self.references)
+
+
+ROCKET_CONTROLLERS = ControllerRegistry(
+    "rocket",
+    {
+        "default": "default_controllers.rocket_controller:RocketController",
+        "player": "player_controllers.rocket_controller:RocketController",
+    },
+)
+TURRET_CONTROLLERS = ControllerRegistry(
+    "turret",
+    {
+        "default": "default_controllers.turret_controller:TurretController",
+        "player": "player_controllers.turret_controller:TurretController",
+    },
+)
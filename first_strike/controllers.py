@@ -1,13 +1,32 @@
+import time
 from copy import deepcopy
 
 from meta_controller import RocketMetaController, TurretMetaController
 
 
 class Controllers:
-    def __init__(self, parameters, history, controller_parameters):
+    def __init__(
+        self,
+        parameters,
+        history,
+        controller_parameters,
+        telemetry=None,
+        rocket_options: dict = None,
+        turret_options: dict = None,
+    ):
         self.parameters = parameters
         self.history = history
+        self.telemetry = telemetry
+        # Time each controller took to calculate its inputs this tick, for telemetry
+        self._controller_times = [0.0, 0.0]
         self.state_copy = [None, None]
+        # Copies of objects the game never changes again, reused by every state copy
+        self._settled_copies = {}
+        self._settled = []
+        self._settled_lengths = (0, 0, 0)
+        self._settled_projectiles = 0
+        self._live_projectiles = []
+        self.projectile_events = None
         (
             rocket_active_controller,
             turret_active_controller,
@@ -23,6 +42,7 @@ class Controllers:
             rocket_active_controller,
             rocket_raise_errors,
             rocket_check_execution_time,
+            rocket_options,
         )
         self.turret_controller = TurretMetaController(
             parameters,
@@ -31,6 +51,7 @@ class Controllers:
             turret_active_controller,
             turret_raise_errors,
             turret_check_execution_time,
+            turret_options,
         )
 
     @property
@@ -42,17 +63,98 @@ class Controllers:
     def store_state_copy(self):
 
         self.state_copy[0] = deepcopy(self.parameters)
-        self.state_copy[1] = deepcopy(self.history)
+        memo = dict(self._settled_copies)
+        self.state_copy[1] = deepcopy(self.history, memo)
+        self._settle(memo)
+
+    def _settle(self, memo):
+        """Keep the copies of objects the game won't change again, from a deepcopy memo.
+
+        Past rocket states are never changed once stored, nor are projectiles
+        once they're off the board. Unless a controller tampers with one, which
+        ends the game, its first copy stays equal to it, so the history is only
+        copied in full once rather than every tick.
+        """
+
+        rocket = self.history.rocket
+        coordinates = (rocket.locations, rocket.velocities, rocket.accelerations)
+        settled = [
+            coordinate
+            for values, length in zip(coordinates, self._settled_lengths)
+            for coordinate in values[length:]
+        ]
+        self._settled_lengths = tuple(len(values) for values in coordinates)
+
+        projectiles = self.history.projectiles
+        settled += [
+            projectile
+            for projectile in (
+                self._live_projectiles + projectiles[self._settled_projectiles :]
+            )
+            if not projectile.on_board
+        ]
+        self._settled_projectiles = len(projectiles)
+        self._live_projectiles = list(self.history.live_projectiles)
+
+        for original in settled:
+            self._settled_copies[id(original)] = memo[id(original)]
+        # Kept alive so that their ids aren't reused
+        self._settled += settled
+
+    def _projectile_events(self):
+        """Changes when a projectile is fired or leaves the board."""
+
+        return len(self.history.projectiles), len(self.history.active_projectiles)
 
     def process_inputs(self):
 
-        self.store_state_copy()
+        if self.telemetry is None:
+            self._process_inputs()
+            return
 
-        self.rocket_controller.process_inputs()
-        if self.rocket_controller.state_changed:
+        start = time.perf_counter()
+        self._process_inputs()
+        self.telemetry.controllers_processed(
+            *self._controller_times, time.perf_counter() - start
+        )
+
+    def _timed(self, index, process_inputs):
+
+        if self.telemetry is None:
+            process_inputs()
             return
 
-        self.turret_controller.process_inputs()
+        start = time.perf_counter()
+        process_inputs()
+        self._controller_times[index] = time.perf_counter() - start
+
+    def _process_inputs(self):
+
+        projectile_events = self._projectile_events()
+        if projectile_events != self.projectile_events:
+            self.projectile_events = projectile_events
+            self.rocket_controller.release_hold()
+            self.turret_controller.release_hold()
+
+        rocket_holding = self.rocket_controller.is_holding
+        turret_holding = self.turret_controller.is_holding
+
+        # Only take a copy if a controller will run and so could tamper with it
+        if not (rocket_holding and turret_holding):
+            self.store_state_copy()
+
+        self._controller_times = [0.0, 0.0]
+        if rocket_holding:
+            self.rocket_controller.hold_inputs()
+        else:
+            self._timed(0, self.rocket_controller.process_inputs)
+            if self.rocket_controller.state_changed:
+                return
+
+        if turret_holding:
+            self.turret_controller.hold_inputs()
+        else:
+            self._timed(1, self.turret_controller.process_inputs)
 
         if not self.issue_raised:
             self.rocket_controller.store_inputs()
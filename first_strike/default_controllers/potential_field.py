@@ -0,0 +1,289 @@
+"""Vectorised potential field for the default rocket controller.
+
+The default rocket steers along a weighted sum of force terms. The terms that
+depend only on where the rocket is (and where the projectiles are), not on how
+it's moving, form a static potential field. PotentialField evaluates those
+terms with numpy for any number of rocket locations at once, so the field can
+be plotted over the whole arena or compared across sets of weights.
+
+The velocity dependent terms (intersecting, within buffer and path avoidance)
+are not part of the field; they are only evaluated by the controller itself.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from default_controllers.rocket_controller import (
+    DEFAULT_DIRECTION_WEIGHTS,
+    DirectionWeights,
+)
+from parameters import Parameters
+from shadow_map import ShadowMap
+
+MIN_TURRET_PULL = 0.01
+MAX_TURRET_PULL = 0.1
+
+
+def _unit_vectors(deltas: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Magnitudes and unit vectors of an array of vectors, last axis (x, y)."""
+
+    magnitudes = np.hypot(deltas[..., 0], deltas[..., 1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        units = deltas / magnitudes[..., None]
+
+    return magnitudes, units
+
+
+def _closest_points_on_lines(
+    points: np.ndarray, gradients: np.ndarray, y_intercepts: np.ndarray
+) -> np.ndarray:
+    """Closest point on each line y = gradient * x + y_intercept to each point.
+
+    points is (n, 2) and the lines are (m,); the output is (n, m, 2).
+    """
+
+    x = points[:, 0, None]
+    y = points[:, 1, None]
+    line_x = (x + gradients * (y - y_intercepts)) / (1 + gradients ** 2)
+    line_y = gradients * line_x + y_intercepts
+
+    return np.stack((line_x, line_y), axis=-1)
+
+
+def _mean_where(vectors: np.ndarray, mask: np.ndarray = None) -> np.ndarray:
+    """Mean over axis 1 of (n, m, 2) vectors, using only where mask; 0 if none."""
+
+    if mask is None:
+        mask = np.ones(vectors.shape[:2], dtype=bool)
+
+    counts = mask.sum(axis=1)
+    totals = np.where(mask[..., None], vectors, 0.0).sum(axis=1)
+
+    return np.divide(
+        totals,
+        counts[:, None],
+        out=np.zeros_like(totals),
+        where=counts[:, None] > 0,
+    )
+
+
+class PotentialField:
+    """The location dependent terms of the default rocket's direction.
+
+    Every method takes rocket locations as an (n, 2) array and returns one
+    (x, y) vector per location, as an (n, 2) array. Each term matches the
+    equivalent RocketController._calc_* method at a single location.
+
+    Methods
+    ----------
+    turret_attraction: Pull towards the turret.
+    edge_avoidance: Push away from the edges of the arena.
+    obstacle_avoidance: Push away from the obstacles.
+    projectile_avoidance: Push away from the projectiles.
+    obstacle_shadow_attraction: Pull towards the shadows of the obstacles.
+    evaluate: Weighted sum of every term.
+    grid: Evaluate the field over a grid covering the arena.
+    """
+
+    def __init__(self, parameters: Parameters):
+        self.parameters = parameters
+        self.width = parameters.environment.width
+        self.height = parameters.environment.height
+        self.rocket_radius = parameters.rocket.target_radius
+        self.turret_location = np.array(list(parameters.turret.location))
+        self.turret_radius = parameters.turret.radius
+
+        obstacles = parameters.environment.obstacles
+        self.obstacle_locations = np.array(
+            [list(obstacle.location) for obstacle in obstacles], dtype=float
+        ).reshape(-1, 2)
+        self.obstacle_radii = np.array(
+            [obstacle.radius for obstacle in obstacles], dtype=float
+        )
+
+        shadows = ShadowMap(parameters).shadows
+        self.shadow_dists2turret = np.array(
+            [shadow.dist2turret for shadow in shadows], dtype=float
+        )
+        self.shadow_angles = np.array(
+            [shadow.angle_from_turret for shadow in shadows], dtype=float
+        )
+        self.shadow_lines = np.array(
+            [
+                [shadow.line2turret.gradient, shadow.line2turret.y_intercept]
+                for shadow in shadows
+            ],
+            dtype=float,
+        ).reshape(-1, 2)
+        # (m, 2 edges, gradient and y intercept)
+        self.shadow_edges = np.array(
+            [
+                [[line.gradient, line.y_intercept] for line in shadow.edge_lines]
+                for shadow in shadows
+            ],
+            dtype=float,
+        ).reshape(-1, 2, 2)
+
+    def turret_attraction(self, locations: np.ndarray) -> np.ndarray:
+
+        distances, directions = _unit_vectors(self.turret_location - locations)
+        with np.errstate(divide="ignore"):
+            strengths = 1 / (distances - self.rocket_radius - self.turret_radius)
+
+        strengths = np.clip(strengths, MIN_TURRET_PULL, MAX_TURRET_PULL)
+
+        return strengths[:, None] * directions
+
+    def edge_avoidance(self, locations: np.ndarray) -> np.ndarray:
+
+        half_size = np.array([self.width, self.height]) / 2
+        with np.errstate(divide="ignore"):
+            return 1 / (half_size + locations) - 1 / (half_size - locations)
+
+    def obstacle_avoidance(self, locations: np.ndarray) -> np.ndarray:
+
+        deltas = locations[:, None, :] - self.obstacle_locations
+        distances, directions = _unit_vectors(deltas)
+        with np.errstate(divide="ignore"):
+            strengths = 1 / (distances - self.obstacle_radii - self.rocket_radius)
+
+        return _mean_where(strengths[..., None] * directions)
+
+    def projectile_avoidance(
+        self, locations: np.ndarray, projectile_locations: np.ndarray
+    ) -> np.ndarray:
+
+        projectile_locations = np.asarray(projectile_locations, dtype=float)
+        deltas = locations[:, None, :] - projectile_locations.reshape(-1, 2)
+        distances, directions = _unit_vectors(deltas)
+        with np.errstate(divide="ignore"):
+            strengths = 1 / (distances - self.rocket_radius)
+
+        return _mean_where(strengths[..., None] * directions)
+
+    def obstacle_shadow_attraction(self, locations: np.ndarray) -> np.ndarray:
+
+        # Only shadows where the rocket's closest point on the line from the
+        # turret through the obstacle is behind the obstacle
+        closest_points = _closest_points_on_lines(
+            locations, self.shadow_lines[:, 0], self.shadow_lines[:, 1]
+        )
+        closest_dists2turret, _ = _unit_vectors(closest_points - self.turret_location)
+        closest_dists2obstacle, _ = _unit_vectors(
+            closest_points - self.obstacle_locations
+        )
+        in_shadow = (closest_dists2turret > self.shadow_dists2turret) & (
+            closest_dists2turret > closest_dists2obstacle
+        )
+
+        attraction = np.zeros((len(locations), len(self.shadow_angles), 2))
+        for edge in range(2):
+            edge_points = _closest_points_on_lines(
+                locations, self.shadow_edges[:, edge, 0], self.shadow_edges[:, edge, 1]
+            )
+            distances, _ = _unit_vectors(edge_points - locations[:, None, :])
+            with np.errstate(divide="ignore"):
+                strengths = 1 / distances
+
+            turret2edge = edge_points - self.turret_location
+            angles = np.arctan2(turret2edge[..., 1], turret2edge[..., 0])
+            offsets = np.mod(angles - self.shadow_angles + np.pi, 2 * np.pi) - np.pi
+            rotations = np.where(offsets > 0, -1.0, 1.0)
+            direction_angles = angles + rotations * np.pi / 2
+
+            attraction += strengths[..., None] * np.stack(
+                (np.cos(direction_angles), np.sin(direction_angles)), axis=-1
+            )
+
+        return _mean_where(attraction, in_shadow)
+
+    def evaluate(
+        self,
+        locations: np.ndarray,
+        projectile_locations: np.ndarray = None,
+        weights: DirectionWeights = DEFAULT_DIRECTION_WEIGHTS,
+    ) -> np.ndarray:
+        """Weighted sum of every term of the field.
+
+        Arguments
+        ----------
+        locations (m): Rocket locations, (n, 2).
+        projectile_locations (m): Locations of the active projectiles, (p, 2).
+        weights: Weight of each term.
+
+        Return
+        ----------
+        direction: The direction the rocket would steer in at each location, (n, 2).
+        """
+
+        locations = np.asarray(locations, dtype=float).reshape(-1, 2)
+        if projectile_locations is None:
+            projectile_locations = np.empty((0, 2))
+
+        return (
+            weights.turret_attraction * self.turret_attraction(locations)
+            + weights.edge_avoidance * self.edge_avoidance(locations)
+            + weights.obstacle_avoidance * self.obstacle_avoidance(locations)
+            + weights.projectile_avoidance
+            * self.projectile_avoidance(locations, projectile_locations)
+            + weights.obstacle_shadow_attraction
+            * self.obstacle_shadow_attraction(locations)
+        )
+
+    def grid(
+        self,
+        nx: int = 60,
+        ny: int = 60,
+        projectile_locations: np.ndarray = None,
+        weights: DirectionWeights = DEFAULT_DIRECTION_WEIGHTS,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Evaluate the field at the centre of each cell of a grid over the arena.
+
+        Cells whose centre is inside an obstacle or the turret are nan.
+
+        Return
+        ----------
+        xs (m): x coordinate of each column, (nx,).
+        ys (m): y coordinate of each row, (ny,).
+        field: The field at each cell, (ny, nx, 2).
+        """
+
+        xs = (np.arange(nx) + 0.5) / nx * self.width - self.width / 2
+        ys = (np.arange(ny) + 0.5) / ny * self.height - self.height / 2
+        locations = np.stack(np.meshgrid(xs, ys), axis=-1).reshape(-1, 2)
+
+        field = self.evaluate(locations, projectile_locations, weights)
+
+        dists2obstacles, _ = _unit_vectors(
+            locations[:, None, :] - self.obstacle_locations
+        )
+        dists2turret, _ = _unit_vectors(locations - self.turret_location)
+        blocked = (dists2obstacles <= self.obstacle_radii).any(axis=1) | (
+            dists2turret <= self.turret_radius
+        )
+        field[blocked] = np.nan
+
+        return xs, ys, field.reshape(ny, nx, 2)
+
+    def plot(
+        self,
+        nx: int = 40,
+        ny: int = 40,
+        projectile_locations: np.ndarray = None,
+        weights: DirectionWeights = DEFAULT_DIRECTION_WEIGHTS,
+    ):
+        """Plot the direction of the field over the arena."""
+
+        import matplotlib.pyplot as plt
+
+        xs, ys, field = self.grid(nx, ny, projectile_locations, weights)
+        _, directions = _unit_vectors(field)
+
+        _, ax = plt.subplots()
+        ax.quiver(xs, ys, directions[..., 0], directions[..., 1])
+        for location, radius in zip(self.obstacle_locations, self.obstacle_radii):
+            ax.add_patch(plt.Circle(location, radius, color="c"))
+        ax.add_patch(plt.Circle(self.turret_location, self.turret_radius, color="b"))
+        ax.set_aspect("equal")
+        plt.show()
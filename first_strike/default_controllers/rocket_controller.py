@@ -1,18 +1,189 @@
 import math
-from typing import Union, Tuple
+from dataclasses import dataclass, fields
+from functools import cached_property
+from typing import List, Tuple, Union
 
 from controller import Controller
+from history import ProjectileHistory
 from math_helpers import (
     Coordinate,
     PolarCoordinate,
     RelativeObjects,
-    Line,
     average,
     normalise_angle,
 )
+from parameters import ObstacleParameters
+from shadow_map import ObstacleShadow, ShadowMap
+
+
+class ObstacleGeometry:
+    """Relationship between the rocket and a single obstacle during the current tick."""
+
+    def __init__(
+        self,
+        obstacle: ObstacleParameters,
+        rocket_location: Coordinate,
+        rocket_velocity: Coordinate,
+    ):
+        self.obstacle = obstacle
+        self.rocket2obstacle = RelativeObjects(
+            rocket_location, obstacle.location, rocket_velocity
+        )
+
+    @cached_property
+    def min_distance(self):
+        """Output of rocket2obstacle.minimum_distance_between_objects."""
+        return self.rocket2obstacle.minimum_distance_between_objects()
+
+
+class ProjectileGeometry:
+    """Relationship between the rocket and a single projectile during the current tick."""
+
+    def __init__(
+        self,
+        projectile: ProjectileHistory,
+        location: Coordinate,
+        velocity: Coordinate,
+        rocket_location: Coordinate,
+        rocket_velocity: Coordinate,
+    ):
+        self.projectile = projectile
+        self.location = location
+        self.velocity = velocity
+        self.rocket_location = rocket_location
+        self.rocket_velocity = rocket_velocity
+
+    @cached_property
+    def rocket2projectile(self) -> RelativeObjects:
+        return RelativeObjects(
+            self.rocket_location, self.location, self.rocket_velocity, self.velocity
+        )
+
+    @cached_property
+    def min_distance(self):
+        """Output of rocket2projectile.minimum_distance_between_objects."""
+        return self.rocket2projectile.minimum_distance_between_objects()
+
+
+class TickGeometry:
+    """Every rocket-obstacle and rocket-projectile relationship for the current tick.
+
+    Built once at the start of calc_inputs so that each avoidance and attraction
+    term, as well as is_within_buffer, share the same locations, velocities and
+    minimum distance solutions instead of each recomputing them.
+    Minimum distance solutions are only calculated the first time they're needed.
+    Only active projectiles are included, so the cost of a tick doesn't grow
+    with every projectile ever fired.
+    """
+
+    def __init__(self, controller: "RocketController"):
+        self.helpers = controller.helpers
+        self.rocket_location = controller.history.rocket.location
+        self.rocket_velocity = controller.physics.calc_rocket_velocity()
+
+        self.obstacles: List[ObstacleGeometry] = [
+            ObstacleGeometry(obstacle, self.rocket_location, self.rocket_velocity)
+            for obstacle in controller.parameters.environment.obstacles
+        ]
+
+        self.active_projectiles: List[ProjectileGeometry] = [
+            self.projectile_geometry(projectile)
+            for projectile in controller.history.active_projectiles
+        ]
+
+    def projectile_geometry(self, projectile: ProjectileHistory) -> ProjectileGeometry:
+
+        return ProjectileGeometry(
+            projectile,
+            self.helpers.calc_projectile_location(projectile),
+            self.helpers.calc_projectile_velocity(projectile),
+            self.rocket_location,
+            self.rocket_velocity,
+        )
+
+
+@dataclass(frozen=True)
+class DirectionWeights:
+    """Weight of each term in the default rocket's direction.
+
+    Attributes
+    ----------
+    One float per term, in the order they are summed by RocketController._calc_direction.
+
+    Methods
+    ----------
+    names: Names of the weights, in order.
+    """
+
+    turret_attraction: float = 60.0
+    edge_avoidance: float = 70.0
+    obstacle_avoidance: float = 30.0
+    projectile_avoidance: float = 10.0
+    intersecting_obstacle_avoidance: float = 60.0
+    intersecting_projectile_avoidance: float = 70.0
+    within_buffer_obstacle_avoidance: float = 15.0
+    within_buffer_projectile_avoidance: float = 15.0
+    projectile_path_avoidance: float = 10.0
+    firing_path_avoidance: float = 10.0
+    obstacle_shadow_attraction: float = 15.0
+
+    @classmethod
+    def names(cls) -> Tuple[str, ...]:
+
+        return tuple(field.name for field in fields(cls))
+
+
+DEFAULT_DIRECTION_WEIGHTS = DirectionWeights()
+
+
+@dataclass(frozen=True)
+class ControlGains:
+    """Constants of the default rocket's controller.
+
+    Attributes
+    ----------
+    p_c: Proportional gain of the PD controller that turns the rocket.
+    d_c: Derivative gain of the PD controller that turns the rocket.
+    direction_velocity_ratio: Scale of the direction relative to the current velocity
+        when choosing which way to thrust.
+    safety_buffer: Multiple of the collision distance within which the rocket
+        takes evasive action.
+    """
+
+    p_c: float = 0.75
+    d_c: float = -0.35
+    direction_velocity_ratio: float = 250.0
+    safety_buffer: float = 2.0
+
+
+DEFAULT_CONTROL_GAINS = ControlGains()
 
 
 class RocketController(Controller):
+    """The default rocket controller.
+
+    Steers along a weighted sum of attractive and repulsive terms. The weights
+    and the controller constants (gains) are given when the controller is
+    created, so other values can be tried without editing the controller: pass
+    them as rocket options to Controllers, or register a tuned controller (see
+    ControllerRegistry.register).
+
+    Attributes
+    ----------
+    weights: Weight of each term in the direction the rocket steers.
+    gains: Constants of the controller.
+    """
+
+    def __init__(
+        self,
+        parameters,
+        history,
+        weights: DirectionWeights = DEFAULT_DIRECTION_WEIGHTS,
+        gains: ControlGains = DEFAULT_CONTROL_GAINS,
+    ):
+        super().__init__(parameters, history)
+        self.weights = weights
+        self.gains = gains
 
     def _calc_turret_attraction(self):
 
@@ -91,11 +262,11 @@ class RocketController(Controller):
 
     def _calc_projectile_avoidance(self):
 
-        rocket_location = self.history.rocket.location
+        rocket_location = self.geometry.rocket_location
 
         projectile_avoidance = []
-        for projectile in self.history.active_projectiles:
-            delta = rocket_location - self.helpers.calc_projectile_location(projectile)
+        for projectile in self.geometry.active_projectiles:
+            delta = rocket_location - projectile.location
             avoidance_strength = 1 / (
                 delta.magnitude - self.parameters.rocket.target_radius
             )
@@ -111,19 +282,17 @@ class RocketController(Controller):
 
     def _calc_intersecting_obstacle_avoidance(self):
 
-        rocket_location = self.history.rocket.location
-        rocket_velocity = self.physics.calc_rocket_velocity()
+        rocket_location = self.geometry.rocket_location
 
         intersecting_obstacle_avoidance = []
-        for obstacle in self.parameters.environment.obstacles:
-            rocket2obstacle = RelativeObjects(
-                rocket_location, obstacle.location, rocket_velocity
-            )
+        for obstacle_geometry in self.geometry.obstacles:
+            obstacle = obstacle_geometry.obstacle
+            rocket2obstacle = obstacle_geometry.rocket2obstacle
             (
                 min_dist,
                 _,
                 (rocket_location_min_dist, _),
-            ) = rocket2obstacle.minimum_distance_between_objects()
+            ) = obstacle_geometry.min_distance
             threshold = self.parameters.rocket.target_radius + obstacle.radius
             if min_dist <= threshold and self.helpers.is_within_bounds(
                 rocket_location_min_dist
@@ -192,24 +361,16 @@ class RocketController(Controller):
 
     def _calc_intersecting_projectile_avoidance(self):
 
-        rocket_location = self.history.rocket.location
-        rocket_velocity = self.physics.calc_rocket_velocity()
+        rocket_location = self.geometry.rocket_location
 
         intersecting_projectile_avoidance = []
-        for projectile in self.history.active_projectiles:
-            projectile_location = self.helpers.calc_projectile_location(projectile)
-            projectile_velocity = self.helpers.calc_projectile_velocity(projectile)
-            rocket2projectile = RelativeObjects(
-                rocket_location,
-                projectile_location,
-                rocket_velocity,
-                projectile_velocity,
-            )
+        for projectile in self.geometry.active_projectiles:
+            rocket2projectile = projectile.rocket2projectile
             (
                 min_dist,
                 _,
                 (rocket_location_min_dist, projectile_location_min_dist),
-            ) = rocket2projectile.minimum_distance_between_objects()
+            ) = projectile.min_distance
 
             # Check if the projectile will ever get close enough
             threshold = self.parameters.rocket.target_radius
@@ -247,19 +408,15 @@ class RocketController(Controller):
 
     def _calc_within_buffer_obstacle_avoidance(self, safety_factor=2.0):
 
-        rocket_location = self.history.rocket.location
-        rocket_velocity = self.physics.calc_rocket_velocity()
-
         within_buffer_obstacle_avoidance = []
-        for obstacle in self.parameters.environment.obstacles:
-            rocket2obstacle = RelativeObjects(
-                rocket_location, obstacle.location, rocket_velocity
-            )
+        for obstacle_geometry in self.geometry.obstacles:
+            obstacle = obstacle_geometry.obstacle
+            rocket2obstacle = obstacle_geometry.rocket2obstacle
             (
                 min_dist,
                 _,
                 (rocket_location_min_dist, _),
-            ) = rocket2obstacle.minimum_distance_between_objects()
+            ) = obstacle_geometry.min_distance
             buffer = safety_factor * (
                 self.parameters.rocket.target_radius + obstacle.radius
             )
@@ -289,24 +446,16 @@ class RocketController(Controller):
 
     def _calc_within_buffer_projectile_avoidance(self, safety_factor=2.0):
 
-        rocket_location = self.history.rocket.location
-        rocket_velocity = self.physics.calc_rocket_velocity()
+        rocket_location = self.geometry.rocket_location
 
         within_buffer_projectile_avoidance = []
-        for projectile in self.history.active_projectiles:
-            projectile_location = self.helpers.calc_projectile_location(projectile)
-            projectile_velocity = self.helpers.calc_projectile_velocity(projectile)
-            rocket2projectile = RelativeObjects(
-                rocket_location,
-                projectile_location,
-                rocket_velocity,
-                projectile_velocity,
-            )
+        for projectile in self.geometry.active_projectiles:
+            rocket2projectile = projectile.rocket2projectile
             (
                 min_dist,
                 _,
                 (rocket_location_min_dist, projectile_location_min_dist),
-            ) = rocket2projectile.minimum_distance_between_objects()
+            ) = projectile.min_distance
             buffer = safety_factor * self.parameters.rocket.target_radius
             if min_dist > buffer:
                 continue
@@ -326,11 +475,7 @@ class RocketController(Controller):
                 ):
                     continue
 
-            current_dist = (
-                self.controller_helpers.calc_dist_between_rocket_and_projectile(
-                    projectile
-                )
-            )
+            current_dist = (projectile.location - rocket_location).magnitude
             try:
                 avoidance_strength = 1 / (
                     min_dist * (current_dist - self.parameters.rocket.target_radius)
@@ -367,11 +512,14 @@ class RocketController(Controller):
 
     def _calc_projectile_path_avoidance(self):
 
-        rocket_location = self.history.rocket.location
+        rocket_location = self.geometry.rocket_location
         turret_location = self.parameters.turret.location
 
         projectile_path_avoidance = []
-        for projectile in self.history.active_projectiles:
+        for projectile_geometry in self.geometry.active_projectiles:
+            projectile = projectile_geometry.projectile
+            if self._is_line_of_fire_blocked(projectile.firing_angle):
+                continue
             gradient = math.tan(projectile.firing_angle)
             y_intercept = turret_location.y - gradient * turret_location.x
             y_value = gradient * rocket_location.x + y_intercept
@@ -382,8 +530,9 @@ class RocketController(Controller):
             min_dist_rocket2path = self.calc_minimum_distance_from_location2line(
                 rocket_location, gradient, y_intercept
             )
-            projectile_location = self.helpers.calc_projectile_location(projectile)
-            dist_rockt2projectile = rocket_location.distance2(projectile_location)
+            dist_rockt2projectile = rocket_location.distance2(
+                projectile_geometry.location
+            )
             try:
                 avoidance_strength = 1 / (
                     min_dist_rocket2path
@@ -427,6 +576,16 @@ class RocketController(Controller):
 
         return 1 - abs(angle_turret_barrel2rocket) / math.pi
 
+    def _is_line_of_fire_blocked(self, angle: float) -> bool:
+        """Would an obstacle stop a projectile fired at angle reaching the rocket."""
+
+        distance = (
+            self.controller_helpers.calc_dist_between_rocket_and_turret()
+            - self.parameters.rocket.target_radius
+        )
+
+        return not self.controller_helpers.visibility.is_clear(angle, distance)
+
     def _calc_firing_path_avoidance(self):
 
         rocket_location = self.history.rocket.location
@@ -455,12 +614,19 @@ class RocketController(Controller):
             avoidance_angle,
         ).pol2cart()
 
+    @property
+    def shadow_map(self) -> ShadowMap:
+        """Shadows cast by the obstacles; shared with the visibility table."""
+        return self.controller_helpers.visibility.shadow_map
+
     def _calc_obstacle_shadow_attraction(self):
         obstacle_shadow_attraction = []
-        for obstacle in self.parameters.environment.obstacles:
-            if not self._is_closest_point_in_shadow(obstacle.location):
+        for shadow in self.shadow_map.shadows:
+            if not self._is_closest_point_in_shadow(shadow):
                 continue
-            obstacle_shadow_attraction.append(self._calc_single_obstacle_shadow_attraction(obstacle))
+            obstacle_shadow_attraction.append(
+                self._calc_single_obstacle_shadow_attraction(shadow)
+            )
 
         return (
             average(obstacle_shadow_attraction)
@@ -468,36 +634,30 @@ class RocketController(Controller):
             else Coordinate(0.0, 0.0)
         )
 
-    def _is_closest_point_in_shadow(self, obstacle: Coordinate) -> bool:
+    def _is_closest_point_in_shadow(self, shadow: ObstacleShadow) -> bool:
         turret_location = self.parameters.turret.location
-        line_obstacle2turret = Line.calculate_line(obstacle, turret_location)
-        closest_point = line_obstacle2turret.closest_point_on_line(
+        closest_point = shadow.line2turret.closest_point_on_line(
             self.history.rocket.location
         )
         dist_closest_point2turret = closest_point.distance2(turret_location)
-        return dist_closest_point2turret > obstacle.distance2(
-            turret_location
-        ) and dist_closest_point2turret > obstacle.distance2(closest_point)
-
-    def _point_in_shadow(self, point: Coordinate, obstacle: Coordinate) -> float:
-        return point.distance2(
-            self.parameters,
+        return dist_closest_point2turret > shadow.dist2turret and (
+            dist_closest_point2turret
+            > shadow.obstacle.location.distance2(closest_point)
         )
 
-    def _calc_single_obstacle_shadow_attraction(self, obstacle: Coordinate) -> Coordinate:
+    def _point_in_shadow(self, point: Coordinate) -> bool:
+        return self.shadow_map.in_shadow(point)
+
+    def _calc_single_obstacle_shadow_attraction(
+        self, shadow: ObstacleShadow
+    ) -> Coordinate:
 
-        # TODO: Make this more efficient by storing it between cycles
         # TODO: Deal with perfectly vertical gradients
-        angle_turret2obstacle = (obstacle.location - self.parameters.turret.location).angle
+        angle_turret2obstacle = shadow.angle_from_turret
 
-        edge_gradients = self.calc_shadow_edge_gradients(obstacle)
         shadow_attractions = []
         rocket_location = self.history.rocket.location
-        for gradient in edge_gradients:
-            y_intercept = Line.calculate_y_intercept(
-                gradient, self.parameters.turret.location
-            )
-            shadow_edge_line = Line(gradient, y_intercept)
+        for shadow_edge_line in shadow.edge_lines:
             closest_point = shadow_edge_line.closest_point_on_line(rocket_location)
             strength = 1 / rocket_location.distance2(closest_point)
             angle_turret2closest_point = (
@@ -515,33 +675,10 @@ class RocketController(Controller):
         return sum(shadow_attractions)
 
     def calc_shadow_edge_gradients(self, obstacle) -> Tuple[float, float]:
-        dx = self.parameters.turret.location.x - obstacle.location.x
-        dy = self.parameters.turret.location.y - obstacle.location.y
-        a = obstacle.radius ** 2 - dx ** 2
-        b = 2 * dx * dy
-        c = obstacle.radius ** 2 - dy ** 2
-
-        neg_b = -b
-        sqrt_det = math.sqrt(b ** 2 - 4 * a * c)
-        denom = 2 * a
-
-        return ((neg_b + sqrt_det) / denom, (neg_b - sqrt_det) / denom)
+        return ObstacleShadow(obstacle, self.parameters.turret.location).edge_gradients
 
     def _calc_direction(self, safety_buffer=2.0):
 
-        turret_attraction_factor = 60
-        edge_avoidance_factor = 70
-        obstacle_avoidance_factor = 30
-        projectile_avoidance_factor = 10
-        intersecting_obstacle_avoidance_factor = 60
-        intersecting_projectile_avoidance_factor = 70
-        within_buffer_obstacle_avoidance_factor = 15
-        within_buffer_projectile_avoidance_factor = 15
-
-        projectile_path_avoidance_factor = 10
-        firing_path_avoidance_factor = 10
-        obstacle_shadow_attraction_factor = 15
-
         turret_attraction = self._calc_turret_attraction()
         edge_avoidance = self._calc_edge_avoidance()
         obstacle_avoidance = self._calc_obstacle_avoidance()
@@ -560,51 +697,50 @@ class RocketController(Controller):
         firing_path_avoidance = self._calc_firing_path_avoidance()
         obstacle_shadow_attraction = self._calc_obstacle_shadow_attraction()
 
+        weights = self.weights
         return (
-            turret_attraction_factor * turret_attraction
-            + edge_avoidance_factor * edge_avoidance
-            + obstacle_avoidance_factor * obstacle_avoidance
-            + projectile_avoidance_factor * projectile_avoidance
-            + intersecting_obstacle_avoidance_factor * intersecting_obstacle_avoidance
-            + intersecting_projectile_avoidance_factor
+            weights.turret_attraction * turret_attraction
+            + weights.edge_avoidance * edge_avoidance
+            + weights.obstacle_avoidance * obstacle_avoidance
+            + weights.projectile_avoidance * projectile_avoidance
+            + weights.intersecting_obstacle_avoidance * intersecting_obstacle_avoidance
+            + weights.intersecting_projectile_avoidance
             * intersecting_projectile_avoidance
-            + within_buffer_obstacle_avoidance_factor * within_buffer_obstacle_avoidance
-            + within_buffer_projectile_avoidance_factor
+            + weights.within_buffer_obstacle_avoidance
+            * within_buffer_obstacle_avoidance
+            + weights.within_buffer_projectile_avoidance
             * within_buffer_projectile_avoidance
-            + projectile_path_avoidance_factor * projectile_path_avoidance
-            + firing_path_avoidance_factor * firing_path_avoidance
-            + obstacle_shadow_attraction_factor * obstacle_shadow_attraction
+            + weights.projectile_path_avoidance * projectile_path_avoidance
+            + weights.firing_path_avoidance * firing_path_avoidance
+            + weights.obstacle_shadow_attraction * obstacle_shadow_attraction
         )
 
     def is_within_buffer(self, safety_buffer=2.0):
 
-        rocket_location = self.history.rocket.location
-        rocket_velocity = self.physics.calc_rocket_velocity()
+        rocket_location = self.geometry.rocket_location
 
-        for obstacle in self.parameters.environment.obstacles:
+        for obstacle_geometry in self.geometry.obstacles:
+            obstacle = obstacle_geometry.obstacle
             threshold = safety_buffer * (
                 self.parameters.rocket.target_radius + obstacle.radius
             )
             if rocket_location.distance2(obstacle.location) <= threshold:
-                rocket2obstacle = RelativeObjects(
-                    rocket_location, obstacle.location, rocket_velocity
-                )
-                min_dist, *_ = rocket2obstacle.minimum_distance_between_objects()
+                min_dist, *_ = obstacle_geometry.min_distance
                 if min_dist <= self.parameters.rocket.target_radius + obstacle.radius:
                     return True
 
         threshold = safety_buffer * self.parameters.rocket.target_radius
-        for projectile in self.history.projectiles:
-            projectile_location = self.helpers.calc_projectile_location(projectile)
-            if rocket_location.distance2(projectile_location) <= threshold:
-                projectile_velocity = self.helpers.calc_projectile_velocity(projectile)
-                rocket2projectile = RelativeObjects(
-                    rocket_location,
-                    projectile_location,
-                    rocket_velocity,
-                    projectile_velocity,
-                )
-                min_dist, *_ = rocket2projectile.minimum_distance_between_objects()
+        # Projectiles off the board still count, where they'd be had they carried on
+        retired_projectiles = [
+            self.geometry.projectile_geometry(projectile)
+            for projectile in self.helpers.get_projectiles_near(
+                rocket_location, threshold, retired=True
+            )
+            if not projectile.on_board
+        ]
+        for projectile in self.geometry.active_projectiles + retired_projectiles:
+            if rocket_location.distance2(projectile.location) <= threshold:
+                min_dist, *_ = projectile.min_distance
                 if min_dist <= self.parameters.rocket.target_radius:
                     return True
 
@@ -619,14 +755,16 @@ class RocketController(Controller):
 
     def calc_inputs(self):
 
-        safety_buffer = 2.0
+        safety_buffer = self.gains.safety_buffer
+
+        self.geometry = TickGeometry(self)
 
         direction = self._calc_direction(safety_buffer)
 
         # Current velocity
-        rocket_velocity = self.physics.calc_rocket_velocity()
+        rocket_velocity = self.geometry.rocket_velocity
 
-        direction_velocity_ratio = 250.0
+        direction_velocity_ratio = self.gains.direction_velocity_ratio
 
         thrust_direction = direction_velocity_ratio * direction - rocket_velocity
         thrust_angle = thrust_direction.angle
@@ -636,8 +774,8 @@ class RocketController(Controller):
 
         # If facing away from the turret, spin the rocket using the thrusters
         # Use PD controller
-        p_c = 0.75
-        d_c = -0.35
+        p_c = self.gains.p_c
+        d_c = self.gains.d_c
 
         # Derivative
         angular_vel = self.physics.calc_rocket_angular_velocity()
@@ -1,13 +1,97 @@
 import math
+from functools import cached_property
+from typing import Optional, Tuple
 
 from controller import Controller
 from math_helpers import PolarCoordinate, RelativeObjects, normalise_angle
+from parameters import ObstacleParameters
+
+
+class FiringSolution:
+    """Everything the turret needs to decide how to aim and whether to fire this tick.
+
+    Each value is calculated at most once per tick, and only if it's needed.
+    """
+
+    def __init__(self, controller: "TurretController"):
+        self.parameters = controller.parameters
+        self.history = controller.history
+        self.helpers = controller.helpers
+        self.controller_helpers = controller.controller_helpers
+
+        self.rocket_location = controller.history.rocket.location
+        self.rocket_velocity = controller.physics.calc_rocket_velocity()
+
+        self.projectile_location = self.parameters.turret.location
+        self.projectile_velocity = PolarCoordinate(
+            self.parameters.turret.projectile_speed, self.history.turret.angle
+        ).pol2cart()
+
+    @cached_property
+    def intercept_angle(self) -> Optional[float]:
+        """Firing angle to hit the rocket; None if the rocket is moving too fast."""
+
+        return self.controller_helpers.firing_angle2hit_rocket(self.rocket_velocity)
+
+    @cached_property
+    def projectile2rocket(self) -> RelativeObjects:
+        """A projectile fired at the current turret angle, relative to the rocket."""
+
+        return RelativeObjects(
+            self.projectile_location,
+            self.rocket_location,
+            self.projectile_velocity,
+            self.rocket_velocity,
+        )
+
+    @cached_property
+    def closest_approach(self):
+        """Output of projectile2rocket.minimum_distance_between_objects."""
+
+        return self.projectile2rocket.minimum_distance_between_objects()
+
+    @cached_property
+    def closest_approach_within_bounds(self) -> bool:
+
+        _, _, (projectile_location, rocket_location) = self.closest_approach
+
+        return self.helpers.is_within_bounds(
+            projectile_location
+        ) and self.helpers.is_within_bounds(rocket_location)
+
+    @cached_property
+    def time_to_intercept(self) -> Optional[float]:
+        """Time for a projectile fired now to hit the rocket; None if it never does."""
+
+        output = self.projectile2rocket.time_objects_first_within_distance(
+            self.parameters.rocket.target_radius
+        )
+
+        return None if output is None else output[0]
+
+    @cached_property
+    def first_obstacle(self) -> Optional[Tuple[float, ObstacleParameters]]:
+        """Time and obstacle of the first obstacle hit by a projectile fired now.
+
+        None if the projectile doesn't hit any obstacle.
+        """
+
+        first = self.controller_helpers.visibility.first_obstacle(
+            self.history.turret.angle
+        )
+        if first is None:
+            return None
+
+        distance, obstacle = first
+        return distance / self.parameters.turret.projectile_speed, obstacle
 
 
 class TurretController(Controller):
 
     def calc_inputs(self):
 
+        self.firing_solution = FiringSolution(self)
+
         if not self.helpers.can_turret_fire():
             return self.calc_rotation_velocity(), False
 
@@ -21,7 +105,7 @@ class TurretController(Controller):
 
     def calc_rotation_velocity(self):
 
-        firing_angle = self.controller_helpers.firing_angle2hit_rocket()
+        firing_angle = self.firing_solution.intercept_angle
         angle2rocket = self.calc_angle2rocket()
         if firing_angle is None or abs(firing_angle - angle2rocket) > math.pi / 2:
             firing_angle = (
@@ -40,69 +124,25 @@ class TurretController(Controller):
 
         safety_buffer = 2.0
 
-        projectile_location = self.parameters.turret.location
-        projectile_speed = self.parameters.turret.projectile_speed
-        projectile_angle = self.history.turret.angle
-        projectile_velocity = PolarCoordinate(
-            projectile_speed, projectile_angle
-        ).pol2cart()
-
-        rocket_location = self.history.rocket.location
-        rocket_velocity = self.physics.calc_rocket_velocity()
-
-        projectile2rocket = RelativeObjects(
-            projectile_location, rocket_location, projectile_velocity, rocket_velocity
-        )
-
-        (
-            min_dist,
-            _,
-            (projectile_location_min_dist, rocket_location_min_dist),
-        ) = projectile2rocket.minimum_distance_between_objects()
+        min_dist, *_ = self.firing_solution.closest_approach
 
         return (
             min_dist <= self.parameters.rocket.target_radius / safety_buffer
-            and self.helpers.is_within_bounds(projectile_location_min_dist)
-            and self.helpers.is_within_bounds(rocket_location_min_dist)
+            and self.firing_solution.closest_approach_within_bounds
         )
 
     def will_projectile_hit_rocket_before_obstacle(self):
 
-        projectile_location = self.parameters.turret.location
-        projectile_speed = self.parameters.turret.projectile_speed
-        projectile_angle = self.history.turret.angle
-        projectile_velocity = PolarCoordinate(
-            projectile_speed, projectile_angle
-        ).pol2cart()
-
-        rocket_location = self.history.rocket.location
-        rocket_velocity = self.physics.calc_rocket_velocity()
-
-        projectile2rocket = RelativeObjects(
-            projectile_location, rocket_location, projectile_velocity, rocket_velocity
-        )
-
-        rocket_output = projectile2rocket.time_objects_first_within_distance(
-            self.parameters.rocket.target_radius
-        )
-        if rocket_output is None:
+        time_rocket_intercept = self.firing_solution.time_to_intercept
+        if time_rocket_intercept is None:
             return False  # Doesn't hit rocket at all
-        time_rocket_intercept, _ = rocket_output
 
-        for obstacle in self.parameters.environment.obstacles:
-            projectile2obstacle = RelativeObjects(
-                projectile_location, obstacle.location, projectile_velocity
-            )
-            obstacle_output = projectile2obstacle.time_objects_first_within_distance(
-                obstacle.radius
-            )
-            if obstacle_output is None:
-                continue
-            time_obstacle_intercept, _ = obstacle_output
-            if time_obstacle_intercept < time_rocket_intercept:
-                return False
+        first_obstacle = self.firing_solution.first_obstacle
+        if first_obstacle is None:
+            return True
 
-        return True
+        time_obstacle_intercept, _ = first_obstacle
+        return not time_obstacle_intercept < time_rocket_intercept
 
     def calc_angle2rocket(self):
 
@@ -0,0 +1,69 @@
+"""Hashing of the game state, for checking that games are bit-for-bit reproducible.
+
+A game played in determinism mode (see Headless) records the digest of the game
+state after every tick. Two runs of the same game can then be compared, and the
+first tick at which they diverge found, without storing the full history of either.
+"""
+
+import hashlib
+import struct
+from typing import List, Optional
+
+from history import History
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _pack_floats(values) -> bytes:
+
+    return b"".join(_DOUBLE.pack(value) for value in values)
+
+
+def state_digest(history: History) -> str:
+    """Digest of the current state of the game.
+
+    Covers the rocket pose and engine forces, the turret angle and firing times,
+    every projectile and the game time. Floats are hashed by their exact bit
+    pattern, so any difference at all between two states gives a different digest.
+    """
+
+    rocket = history.rocket
+    turret = history.turret
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(_pack_floats((history.time, rocket.location.x, rocket.location.y)))
+    digest.update(_pack_floats((rocket.angle, turret.angle)))
+    if rocket.main_engine_forces:
+        digest.update(_pack_floats(rocket.engine_forces))
+    digest.update(_pack_floats(turret.when_fired))
+    for projectile in history.projectiles:
+        digest.update(
+            _pack_floats((projectile.firing_angle, projectile.launch_time))
+            + (b"\x01" if projectile.on_board else b"\x00")
+        )
+
+    return digest.hexdigest()
+
+
+def find_divergence(digests_a: List[str], digests_b: List[str]) -> Optional[int]:
+    """Find the first tick at which two runs of a game differ.
+
+    Arguments
+    ----------
+    digests_a: State digest per tick of the first run.
+    digests_b: State digest per tick of the second run.
+
+    Return
+    ----------
+    tick: The first tick that differs, or None if the runs are identical.
+        If one run is a prefix of the other, the tick after the shorter run ends.
+    """
+
+    for tick, (a, b) in enumerate(zip(digests_a, digests_b)):
+        if a != b:
+            return tick
+
+    if len(digests_a) != len(digests_b):
+        return min(len(digests_a), len(digests_b))
+
+    return None
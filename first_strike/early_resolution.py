@@ -0,0 +1,313 @@
+"""Ending games early once their outcome can no longer change.
+
+After each tick, the rocket is projected forward with no knowledge of what
+the controllers will do. Its reachable set after n more ticks is a disc. The
+centre is where it would coast to. The radius is the furthest its engines
+could move it from there:
+
+    centre = location + n * timestep * velocity
+    radius = max_acc * timestep^2 * n * (n + 1) / 2
+
+Movement's default integrator updates velocity before location, which gives
+that radius; it also bounds the other integrators, for which the furthest is
+max_acc * (n * timestep)^2 / 2.
+Projectiles never change course, so their future locations are known exactly.
+Projectiles the turret has yet to fire can only be within
+projectile_speed * elapsed time of the turret.
+
+A game is resolved at tick n when both hold:
+    - A single cause is certain by tick n: the whole disc is inside its
+      collision zone (or, for out of bounds, outside the arena).
+    - No other cause is possible at any earlier tick: the disc doesn't reach
+      any other collision zone, and the game time isn't exceeded.
+Every distance check has a small tolerance in the conservative direction, so
+rounding error can't turn a possible collision into an impossible one.
+
+This assumes that the controllers keep returning valid inputs, on time,
+without raising errors or tampering with the game, until it is resolved. A
+controller that broke that would end the game with a different cause, so
+games are only resolved early when both controllers are trusted to (see
+is_trusted): the built-in default controllers, without their execution time
+checked, since that depends on the machine.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+from helpers import Helpers
+from history import History, ProjectileHistory
+from math_helpers import Coordinate, PolarCoordinate
+from parameters import Parameters
+from physics import Physics
+from result import (
+    PROJECTILE_HIT_ROCKET,
+    ROCKET_HIT_OBSTACLE,
+    ROCKET_HIT_TURRET,
+    ROCKET_OUT_OF_BOUNDS,
+)
+
+TOLERANCE = 1e-6
+
+# The game's own controllers, trusted not to fail or tamper part way through a game
+TRUSTED_CONTROLLERS = (
+    "default_controllers.rocket_controller:RocketController",
+    "default_controllers.turret_controller:TurretController",
+)
+
+
+def is_trusted(controllers) -> bool:
+    """Whether both of a game's Controllers can be trusted for early resolution."""
+
+    for meta_controller in (
+        controllers.rocket_controller,
+        controllers.turret_controller,
+    ):
+        controller_class = type(meta_controller.controller)
+        path = f"{controller_class.__module__}:{controller_class.__qualname__}"
+        if path not in TRUSTED_CONTROLLERS or meta_controller.check_execution_time:
+            return False
+
+    return True
+
+
+class ProjectileCourse:
+    """When a projectile that is already on the board is there for certain.
+
+    Attributes
+    ----------
+    projectile: The projectile.
+    certain_until (m): The projectile is certainly on the board while it has
+        travelled less than this.
+    removed_after (m): The projectile is certainly off the board once it has
+        travelled at least this; the distance to the arena edge unless it
+        certainly stops in the first obstacle on its line of fire.
+    """
+
+    def __init__(self, projectile: ProjectileHistory, helpers: Helpers):
+        self.projectile = projectile
+        parameters = helpers.parameters
+        self.speed = parameters.turret.projectile_speed
+        self.direction = PolarCoordinate(1.0, projectile.firing_angle).pol2cart()
+        self.turret_location = parameters.turret.location
+
+        bounds_exit = self._distance2bounds(parameters)
+        self.certain_until = bounds_exit - TOLERANCE
+        self.removed_after = bounds_exit + TOLERANCE
+
+        first_obstacle = helpers.visibility.first_obstacle(projectile.firing_angle)
+        if first_obstacle is not None:
+            entry, obstacle = first_obstacle
+            self.certain_until = min(self.certain_until, entry - TOLERANCE)
+            turret2obstacle = obstacle.location - self.turret_location
+            along = (
+                turret2obstacle.x * self.direction.x
+                + turret2obstacle.y * self.direction.y
+            )
+            self.obstacle_chord = (entry + TOLERANCE, 2 * along - entry - TOLERANCE)
+        else:
+            self.obstacle_chord = None
+
+    def _distance2bounds(self, parameters: Parameters) -> float:
+        """Distance along the line of fire from the turret to the arena edge."""
+
+        distances = []
+        for start, direction, size in (
+            (self.turret_location.x, self.direction.x, parameters.environment.width),
+            (self.turret_location.y, self.direction.y, parameters.environment.height),
+        ):
+            if direction > 0:
+                distances.append((size / 2 - start) / direction)
+            elif direction < 0:
+                distances.append((-size / 2 - start) / direction)
+
+        return min(distances)
+
+    def distance_travelled(self, time: float) -> float:
+
+        return self.speed * (time - self.projectile.launch_time)
+
+    def location(self, distance: float) -> Coordinate:
+
+        return self.direction * distance + self.turret_location
+
+    def note_tick(self, distance: float):
+        """Record where the projectile is at a tick, in order.
+
+        The first tick that lands properly inside the first obstacle is where
+        Movement is certain to remove the projectile.
+        """
+
+        if self.obstacle_chord is None:
+            return
+
+        entry, exit_ = self.obstacle_chord
+        if distance >= entry:
+            if distance <= exit_:
+                self.removed_after = min(self.removed_after, distance)
+            self.obstacle_chord = None
+
+
+class EarlyResolution:
+    """Decide games whose outcome is certain without playing them out.
+
+    Attributes
+    ----------
+    horizon: Maximum number of ticks to look ahead.
+
+    Methods
+    ----------
+    reachable: Centre and radius of where the rocket could be after n more ticks.
+    resolve: The certain outcome of the game, if there is one.
+    """
+
+    def __init__(self, parameters: Parameters, history: History, horizon: int = 200):
+        self.parameters = parameters
+        self.history = history
+        self.helpers = Helpers(parameters, history)
+        self.physics = Physics(parameters, history)
+        self.horizon = horizon
+
+        rocket = parameters.rocket
+        self.max_acc = (
+            math.hypot(rocket.max_main_engine_force, 2 * rocket.max_thruster_force)
+            / rocket.mass
+        )
+
+    def reachable(self, velocity: Coordinate, n: int) -> Tuple[Coordinate, float]:
+
+        timestep = self.parameters.time.timestep
+        centre = self.history.rocket.location + velocity * (n * timestep)
+        radius = self.max_acc * timestep ** 2 * n * (n + 1) / 2
+
+        return centre, radius + TOLERANCE
+
+    def _first_firing_tick(self) -> int:
+        """Earliest tick from now at which the turret could fire a new projectile."""
+
+        last_fired = self.history.turret.last_fired
+        if not last_fired or self.helpers.can_turret_fire():
+            return 1
+
+        timestep = self.parameters.time.timestep
+        ready_time = last_fired + self.parameters.turret.min_firing_interval
+
+        return max(1, math.ceil((ready_time - self.history.time) / timestep))
+
+    def _causes_at(
+        self,
+        centre: Coordinate,
+        radius: float,
+        time: float,
+        ticks_since_firing: int,
+        courses: List[ProjectileCourse],
+    ) -> Tuple[set, set]:
+        """The possible and certain causes for a rocket within a disc."""
+
+        parameters = self.parameters
+        target_radius = parameters.rocket.target_radius
+        possible = set()
+        certain = set()
+
+        half_width = parameters.environment.width / 2
+        half_height = parameters.environment.height / 2
+        dx = abs(centre.x) - half_width
+        dy = abs(centre.y) - half_height
+        if dx + radius >= 0 or dy + radius >= 0:
+            possible.add(ROCKET_OUT_OF_BOUNDS)
+        if math.hypot(max(dx, 0.0), max(dy, 0.0)) > radius:
+            certain.add(ROCKET_OUT_OF_BOUNDS)
+
+        for obstacle in parameters.environment.obstacles:
+            distance = centre.distance2(obstacle.location)
+            if distance - radius <= obstacle.radius + target_radius:
+                possible.add(ROCKET_HIT_OBSTACLE)
+            if distance + radius <= obstacle.radius + target_radius:
+                certain.add(ROCKET_HIT_OBSTACLE)
+
+        distance2turret = centre.distance2(parameters.turret.location)
+        if distance2turret - radius <= parameters.turret.radius + target_radius:
+            possible.add(ROCKET_HIT_TURRET)
+        if distance2turret + radius <= parameters.turret.radius + target_radius:
+            certain.add(ROCKET_HIT_TURRET)
+
+        # Projectiles not yet fired
+        if ticks_since_firing > 0:
+            reach = (
+                parameters.turret.projectile_speed
+                * ticks_since_firing
+                * parameters.time.timestep
+            )
+            if distance2turret - radius <= reach + target_radius:
+                possible.add(PROJECTILE_HIT_ROCKET)
+
+        for course in courses:
+            travelled = course.distance_travelled(time)
+            course.note_tick(travelled)
+            if travelled >= course.removed_after:
+                continue
+            distance = centre.distance2(course.location(travelled))
+            if distance - radius <= target_radius:
+                possible.add(PROJECTILE_HIT_ROCKET)
+            if travelled < course.certain_until and distance + radius <= target_radius:
+                certain.add(PROJECTILE_HIT_ROCKET)
+
+        return possible, certain
+
+    def resolve(self) -> Optional[Tuple[int, int]]:
+        """The certain outcome of the game, if there is one.
+
+        Return
+        ----------
+        cause: The cause the game is certain to end with.
+        ticks: Number of ticks from now by which it's certain to have ended.
+            None if the outcome isn't yet certain.
+        """
+
+        timestep = self.parameters.time.timestep
+        max_game_time = self.parameters.time.max_game_time
+        velocity = self.physics.calc_rocket_velocity()
+
+        first_firing_tick = self._first_firing_tick()
+        courses = [
+            ProjectileCourse(projectile, self.helpers)
+            for projectile in self.history.active_projectiles
+        ]
+
+        possible_before = set()
+        for n in range(1, self.horizon + 1):
+            time = self.history.time + n * timestep
+            centre, radius = self.reachable(velocity, n)
+            possible, certain = self._causes_at(
+                centre, radius, time, n - first_firing_tick + 1, courses
+            )
+
+            # Checked in the same order as Result.check_win_conditions
+            for cause in (
+                ROCKET_OUT_OF_BOUNDS,
+                ROCKET_HIT_OBSTACLE,
+                ROCKET_HIT_TURRET,
+                PROJECTILE_HIT_ROCKET,
+            ):
+                if cause in possible:
+                    break
+            else:
+                cause = None
+
+            if (
+                cause is not None
+                and cause in certain
+                and possible_before <= {cause}
+                # A rocket hitting the turret as a projectile hits it is a draw
+                and not (
+                    cause == ROCKET_HIT_TURRET and PROJECTILE_HIT_ROCKET in possible
+                )
+            ):
+                return cause, n
+
+            possible_before |= possible
+            if len(possible_before) > 1 or (
+                time > max_game_time - timestep - TOLERANCE
+            ):
+                return None
+
+        return None
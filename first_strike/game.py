@@ -1,18 +1,15 @@
-from animation import Animation
-from controllers import Controllers
-from game_parameters import process_game_parameters
-from plotting import Plotting
-from result import Result
+from game_parameters import GAME_PARAMETERS_PATH, process_game_parameters
 
 
-def play():
+def animate(controller_parameters, visual, parameters, history, deterministic=False):
+    """Play a game from already processed game parameters, drawing it as it goes."""
+
+    # Only loaded when a game is drawn, as they import matplotlib
+    from animation import Animation
+    from controllers import Controllers
+    from plotting import Plotting
+    from result import Result
 
-    (
-        controller_parameters,
-        visual,
-        parameters,
-        history,
-    ) = process_game_parameters()
     controllers = Controllers(
         parameters,
         history,
@@ -33,31 +30,25 @@ def play():
         controllers,
         plotting,
         result,
+        deterministic,
     )
     animation.run()
 
+    return result
 
-# Uncomment to run the game normally
-play()
 
-# Uncomment to profile the code
-# import cProfile
-# import pstats
-# import os
+def play(path=GAME_PARAMETERS_PATH):
 
-# modules2exclude = ("game.py", "animation.py", "plotting.py", "__init__.py", "__pycache__")
-# modules = os.listdir("first_strike")
-# modules2include = set(modules) - set(modules2exclude)
-# additional = ("rocket_controller.py", "turret_controller.py")
-# modules2include.update(additional)
-
-# regex = r'|'.join([f"^{m}" for m in modules2include])
+    (
+        controller_parameters,
+        visual,
+        parameters,
+        history,
+    ) = process_game_parameters(path)
 
-# cProfile.run("play()", "profile.dat")
+    return animate(controller_parameters, visual, parameters, history)
 
-# with open("profile.txt", "w") as f:
-#     p = pstats.Stats("profile.dat", stream=f)
-#     p.strip_dirs()
-#     p.sort_stats("tottime").print_stats(regex)
 
-# os.remove("profile.dat")
+if __name__ == "__main__":
+    # To profile a game, use: python first_strike/cli.py profile
+    play()
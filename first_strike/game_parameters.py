@@ -1,7 +1,9 @@
 import json
 import math
 
+from controller_registry import ROCKET_CONTROLLERS, TURRET_CONTROLLERS
 from history import History, RocketHistory, TurretHistory
+from integrators import INTEGRATORS, SEMI_IMPLICIT_EULER
 from math_helpers import Coordinate
 from parameters import (
     EnvironmentParameters,
@@ -13,10 +15,17 @@ from parameters import (
 )
 from visual import Visual
 
+GAME_PARAMETERS_PATH = "first_strike/game_parameters.json"
 
-def process_game_parameters():
 
-    game_parameters = _read_game_parameters()
+def process_game_parameters(path=GAME_PARAMETERS_PATH):
+
+    game_parameters = _read_game_parameters(path)
+
+    return build_game_parameters(game_parameters)
+
+
+def build_game_parameters(game_parameters):
 
     _validate_game_parameters(game_parameters)
 
@@ -28,9 +37,9 @@ def _is_colour(value):
     return value in ("b", "g", "r", "c", "m", "y", "k", "w")
 
 
-def _read_game_parameters():
+def _read_game_parameters(path=GAME_PARAMETERS_PATH):
 
-    with open("first_strike/game_parameters.json") as f:
+    with open(path) as f:
         return json.load(f)
 
 
@@ -71,8 +80,9 @@ def _is_within_limits(location, w, h):
 def _validate_game_parameters(game_params):
 
     controllers = game_params["controllers"]
-    assert controllers["rocket_active_controller"] in ["default", "player"]
-    assert controllers["turret_active_controller"] in ["default", "player"]
+    # Loaded rather than checked with `in`, so the reason one can't be loaded is raised
+    ROCKET_CONTROLLERS.get(controllers["rocket_active_controller"])
+    TURRET_CONTROLLERS.get(controllers["turret_active_controller"])
     assert type(controllers["rocket_raise_errors"]) is bool
     assert type(controllers["turret_raise_errors"]) is bool
     assert type(controllers["rocket_check_execution_time"]) is bool
@@ -119,6 +129,8 @@ def _validate_game_parameters(game_params):
     time = game_params["time"]
     assert _is_positive_float(time["timestep"])
     assert _is_positive_float(time["max_game_time"])
+    assert time.get("integrator", SEMI_IMPLICIT_EULER) in INTEGRATORS
+    assert isinstance(time.get("continuous_collisions", False), bool)
 
     rocket = game_params["rocket"]
     assert _is_positive_float(rocket["mass"])
@@ -207,7 +219,12 @@ def _store_game_parameters(game_params):
     )
 
     time = game_params["time"]
-    time_obj = TimeParameters(time["timestep"], time["max_game_time"])
+    time_obj = TimeParameters(
+        time["timestep"],
+        time["max_game_time"],
+        time.get("integrator", SEMI_IMPLICIT_EULER),
+        time.get("continuous_collisions", False),
+    )
 
     rocket_params = game_params["rocket"]
     rocket_params_obj = RocketParameters(
@@ -0,0 +1,200 @@
+"""Run games to completion without plotting or animation."""
+
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+from controllers import Controllers
+from determinism import state_digest
+from early_resolution import EarlyResolution, is_trusted
+from game_parameters import GAME_PARAMETERS_PATH, process_game_parameters
+from history import History
+from movement import Movement
+from parameters import Parameters
+from result import CAUSE2WINNER, Result
+from scenario_cache import Scenario
+
+if TYPE_CHECKING:
+    from telemetry import Telemetry
+
+
+class Headless:
+    """Steps a game in the same order as Animation.update, without drawing it.
+
+    In determinism mode, projectile firing and game time are computed exactly
+    (see Movement) and a digest of the game state is recorded after every tick.
+
+    With early resolution, the game stops as soon as its outcome is certain
+    (see EarlyResolution), rather than when it is reached. Early resolution
+    only reasons about collisions at each tick, so it's not used for games
+    with continuous collisions; nor unless both controllers are trusted to
+    play by the rules (see is_trusted), so the outcome is always the one a
+    full game would have.
+
+    With telemetry, a record of every tick is streamed out as the game is
+    played (see Telemetry).
+
+    Attributes
+    ----------
+    deterministic: Whether the game is played in determinism mode.
+    state_digests: Digest of the game state after each tick (determinism mode only).
+    early_resolution: Decides games early; None if early resolution is off.
+    ticks_skipped: Ticks the game was resolved ahead of being played; 0 if it wasn't.
+
+    Methods
+    ----------
+    step: Advance the game by a single timestep.
+    run: Advance the game until a winner has been decided.
+    """
+
+    def __init__(
+        self,
+        parameters: Parameters,
+        history: History,
+        controllers: Controllers,
+        result: Result,
+        deterministic: bool = False,
+        early_resolution: bool = False,
+        telemetry: "Telemetry" = None,
+    ):
+        self.parameters = parameters
+        self.history = history
+        self.movement = Movement(parameters, history, deterministic, telemetry)
+        self.controllers = controllers
+        self.result = result
+        self.deterministic = deterministic
+        self.state_digests = []
+        self.early_resolution = (
+            EarlyResolution(parameters, history)
+            if early_resolution
+            and not parameters.time.continuous_collisions
+            and is_trusted(controllers)
+            else None
+        )
+        self.ticks_skipped = 0
+
+    def step(self):
+
+        self.controllers.process_inputs()
+        self.result.check_controllers()
+        if not self.result.winner:
+            self.movement.move_objects()
+            self.result.check_win_conditions()
+            if self.early_resolution and not self.result.winner:
+                self._resolve_early()
+
+        if self.deterministic:
+            self.state_digests.append(state_digest(self.history))
+
+    def _resolve_early(self):
+
+        outcome = self.early_resolution.resolve()
+        if outcome is not None:
+            self.result.cause, self.ticks_skipped = outcome
+
+    def run(self) -> Result:
+
+        while not self.result.winner:
+            self.step()
+
+        return self.result
+
+
+def new_game(
+    scenario: Scenario,
+    matchup: Tuple[str, str] = None,
+    early_resolution: bool = False,
+    state: Tuple[Parameters, History] = None,
+    telemetry: "Telemetry" = None,
+) -> Headless:
+    """Set up a game on a scenario in determinism mode, ready to be stepped.
+
+    Arguments
+    ----------
+    scenario: The scenario to play.
+    matchup: Active rocket and turret controllers; the scenario's if None.
+    early_resolution: Stop the game as soon as its outcome is certain.
+    state: Parameters and starting history to play with; clones of the
+        scenario's if None.
+    telemetry: Where to stream a record of every tick; not recorded if None.
+    """
+
+    controller_parameters, _, parameters, history = (
+        scenario.new_game()
+        if state is None
+        else (scenario.controller_parameters, None, *state)
+    )
+    if matchup is not None:
+        controller_parameters = tuple(matchup) + controller_parameters[2:]
+
+    controllers = Controllers(parameters, history, controller_parameters, telemetry)
+    result = Result(parameters, history, controllers)
+
+    return Headless(
+        parameters,
+        history,
+        controllers,
+        result,
+        deterministic=True,
+        early_resolution=early_resolution,
+        telemetry=telemetry,
+    )
+
+
+def summarise_game(headless: Headless) -> Dict[str, Any]:
+    """Summary of the outcome of a finished game."""
+
+    cause = headless.result.cause
+
+    return {
+        "cause": cause,
+        "winner": CAUSE2WINNER[cause],
+        "ticks": headless.movement.tick,
+        "game_time": headless.history.time,
+        "projectiles_fired": len(headless.history.projectiles),
+    }
+
+
+def play_headless(
+    controller_parameters,
+    parameters,
+    history,
+    deterministic=False,
+    early_resolution=False,
+    telemetry=None,
+    rocket_options=None,
+) -> Result:
+    """Play a single game from already processed game parameters.
+
+    rocket_options are keyword arguments the rocket controller is created with
+    (eg: the weights and gains of the default rocket).
+
+    Return
+    ----------
+    result: The finished game's result; result.cause holds the outcome.
+    """
+
+    controllers = Controllers(
+        parameters, history, controller_parameters, telemetry, rocket_options
+    )
+    result = Result(parameters, history, controllers)
+
+    return Headless(
+        parameters,
+        history,
+        controllers,
+        result,
+        deterministic,
+        early_resolution,
+        telemetry,
+    ).run()
+
+
+def play_headless_from_file(path=GAME_PARAMETERS_PATH) -> Result:
+
+    controller_parameters, _, parameters, history = process_game_parameters(path)
+
+    return play_headless(controller_parameters, parameters, history)
+
+
+if __name__ == "__main__":
+    result = play_headless_from_file()
+    print(f"Cause: {result.cause}, winner: {result.winner}")
@@ -1,4 +1,13 @@
-from math_helpers import Coordinate, PolarCoordinate
+import math
+from functools import cached_property
+from typing import List
+
+from history import ProjectileHistory
+from math_helpers import Coordinate, PolarCoordinate, normalise_angle
+from visibility import VisibilityTable
+
+# Margin (m, rad) so rounding never culls a projectile the exact check would hit
+BROAD_PHASE_TOLERANCE = 1e-6
 
 
 class Helpers:
@@ -26,6 +35,20 @@ class Helpers:
             for obstacle in self.parameters.environment.obstacles
         )
 
+    @cached_property
+    def visibility(self) -> VisibilityTable:
+        """Line of fire from the turret to the first obstacle, built on first use."""
+
+        return VisibilityTable(self.parameters)
+
+    def has_projectile_hit_obstacle(self, projectile, location: Coordinate) -> bool:
+        """has_hit_obstacle, checking only obstacles on the projectile's line of fire."""
+
+        return any(
+            location.distance2(shadow.obstacle.location) <= shadow.obstacle.radius
+            for shadow in self.visibility.candidates(projectile.firing_angle)
+        )
+
     def has_rocket_hit_obstacle(self) -> bool:
 
         return self.has_hit_obstacle(
@@ -59,10 +82,65 @@ class Helpers:
         rocket_location = self.history.rocket.location
 
         return any(
-            rocket_location.distance2(projectile_location) <= target_radius
-            for projectile_location in self.get_active_projectile_locations()
+            rocket_location.distance2(self.calc_projectile_location(projectile))
+            <= target_radius
+            for projectile in self.get_projectiles_near(rocket_location, target_radius)
+        )
+
+    def get_projectiles_near(
+        self, location: Coordinate, distance: float, retired: bool = False
+    ) -> List[ProjectileHistory]:
+        """Active projectiles that could be within a distance of a location.
+
+        A broad phase for exact distance checks. Projectiles travel radially
+        from the turret, so only those launched when they'd now be within the
+        distance of the location's range from the turret, and fired at an angle
+        within the distance of its bearing, can be close enough. The projectiles
+        are in launch order, so that launch window is found by bisection.
+
+        With retired, projectiles no longer on the board are included too, by
+        where they'd be had they carried on.
+        """
+
+        turret_location = self.parameters.turret.location
+        speed = self.parameters.turret.projectile_speed
+        time = self.history.time
+        location_range = location.distance2(turret_location)
+        max_distance = distance + BROAD_PHASE_TOLERANCE
+
+        projectiles = self.history.projectiles
+        start = self._bisect_launch_time(time - (location_range + max_distance) / speed)
+        stop = self._bisect_launch_time(
+            time - (location_range - max_distance) / speed, start
         )
 
+        if location_range <= max_distance:
+            return [p for p in projectiles[start:stop] if retired or p.on_board]
+
+        bearing = turret_location.angle2(location)
+        max_angle = math.asin(max_distance / location_range) + BROAD_PHASE_TOLERANCE
+
+        return [
+            projectile
+            for projectile in projectiles[start:stop]
+            if (retired or projectile.on_board)
+            and abs(normalise_angle(projectile.firing_angle - bearing)) <= max_angle
+        ]
+
+    def _bisect_launch_time(self, launch_time: float, low: int = 0) -> int:
+        """Index of the first projectile launched at or after a time."""
+
+        projectiles = self.history.projectiles
+        high = len(projectiles)
+        while low < high:
+            middle = (low + high) // 2
+            if projectiles[middle].launch_time < launch_time:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
     def is_game_time_exceeded(self):
 
         current_time = self.history.time
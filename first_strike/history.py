@@ -4,10 +4,29 @@ from typing import List, Tuple
 from math_helpers import Coordinate
 
 
+def _at_rest() -> List[Coordinate]:
+    return [Coordinate(0.0, 0.0)]
+
+
+def _not_turning() -> List[float]:
+    return [0.0]
+
+
 @dataclass
 class RocketHistory:
+    """Rocket state at every timestep.
+
+    The velocities and accelerations are stored by Movement as the rocket
+    moves, rather than differenced from the locations and angles. The
+    accelerations are the mean over the previous timestep.
+    """
+
     locations: List[Coordinate]
     angles: List[float]
+    velocities: List[Coordinate] = field(default_factory=_at_rest)
+    angular_velocities: List[float] = field(default_factory=_not_turning)
+    accelerations: List[Coordinate] = field(default_factory=_at_rest)
+    angular_accelerations: List[float] = field(default_factory=_not_turning)
     main_engine_forces: List[float] = field(default_factory=list)
     left_front_thruster_forces: List[float] = field(default_factory=list)
     left_rear_thruster_forces: List[float] = field(default_factory=list)
@@ -22,6 +41,22 @@ class RocketHistory:
     def angle(self) -> float:
         return self.angles[-1]
 
+    @property
+    def velocity(self) -> Coordinate:
+        return self.velocities[-1]
+
+    @property
+    def angular_velocity(self) -> float:
+        return self.angular_velocities[-1]
+
+    @property
+    def acceleration(self) -> Coordinate:
+        return self.accelerations[-1]
+
+    @property
+    def angular_acceleration(self) -> float:
+        return self.angular_accelerations[-1]
+
     @property
     def main_engine_force(self) -> float:
         return self.main_engine_forces[-1]
@@ -58,6 +93,28 @@ class RocketHistory:
 
         return self.engine_forces[1:]
 
+    def reset(self):
+        """Return to the first state recorded, in place."""
+
+        for states in (
+            self.locations,
+            self.angles,
+            self.velocities,
+            self.angular_velocities,
+            self.accelerations,
+            self.angular_accelerations,
+        ):
+            del states[1:]
+
+        for forces in (
+            self.main_engine_forces,
+            self.left_front_thruster_forces,
+            self.left_rear_thruster_forces,
+            self.right_front_thruster_forces,
+            self.right_rear_thruster_forces,
+        ):
+            forces.clear()
+
     def __eq__(self, other):
         return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
 
@@ -87,6 +144,13 @@ class TurretHistory:
         except IndexError:
             return
 
+    def reset(self):
+        """Return to the first state recorded, in place."""
+
+        del self.angles[1:]
+        self.rotation_velocities.clear()
+        self.when_fired.clear()
+
     def __eq__(self, other):
         return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
 
@@ -109,14 +173,52 @@ class ProjectileHistory:
 
 @dataclass
 class History:
+    """Past and present state of the game.
+
+    projectiles holds every projectile ever fired, in launch order. The ones
+    still on the board are also indexed in live_projectiles, which Movement
+    keeps up to date through add_projectile and retire_projectile, so finding
+    the active projectiles doesn't slow down as more are fired.
+    """
+
     rocket: RocketHistory
     turret: TurretHistory
     projectiles: List[ProjectileHistory] = field(default_factory=list)
     time: float = 0.0
+    live_projectiles: List[ProjectileHistory] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.projectiles and not self.live_projectiles:
+            self.live_projectiles = [
+                projectile for projectile in self.projectiles if projectile.on_board
+            ]
 
     @property
     def active_projectiles(self):
-        return [projectile for projectile in self.projectiles if projectile.on_board]
+        return [
+            projectile for projectile in self.live_projectiles if projectile.on_board
+        ]
+
+    def add_projectile(self, projectile: ProjectileHistory):
+
+        self.projectiles.append(projectile)
+        if projectile.on_board:
+            self.live_projectiles.append(projectile)
+
+    def retire_projectile(self, projectile: ProjectileHistory):
+        """Take a projectile off the board."""
+
+        projectile.on_board = False
+        self.live_projectiles.remove(projectile)
+
+    def reset(self):
+        """Return to the start of the game, in place, so the history can be reused."""
+
+        self.rocket.reset()
+        self.turret.reset()
+        self.projectiles.clear()
+        self.live_projectiles.clear()
+        self.time = 0.0
 
     def __eq__(self, other):
         return self.__dict__ == other.__dict__
@@ -0,0 +1,181 @@
+"""Integrators for the motion of the rocket over a single timestep.
+
+During a timestep the engine forces are constant, so in the rocket's frame the
+acceleration and the angular acceleration are constant. Only the direction of
+the acceleration changes, as the rocket turns. Each integrator advances the
+rocket's location, velocity, angle and angular velocity by one timestep:
+
+    - semi_implicit_euler: Symplectic Euler; the original game integrator.
+    - velocity_verlet: Symplectic and second order.
+    - rk4: Classic fourth order Runge-Kutta.
+    - exact: Exact for constant thrust with constant angular acceleration. The
+        angle is a quadratic in time; the velocity and location integrals of
+        the turning thrust are evaluated with Gauss-Legendre quadrature, which
+        is exact to rounding error for the smooth integrand over a timestep.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from math_helpers import Coordinate, normalise_angle
+
+SEMI_IMPLICIT_EULER = "semi_implicit_euler"
+VELOCITY_VERLET = "velocity_verlet"
+RK4 = "rk4"
+EXACT = "exact"
+
+# 8 point Gauss-Legendre quadrature on [-1, 1], as numpy.polynomial.legendre.leggauss(8)
+_NODES = [
+    -0.9602898564975362,
+    -0.7966664774136267,
+    -0.525532409916329,
+    -0.18343464249564978,
+    0.18343464249564978,
+    0.525532409916329,
+    0.7966664774136267,
+    0.9602898564975362,
+]
+_WEIGHTS = [
+    0.10122853629037706,
+    0.22238103445337443,
+    0.3137066458778869,
+    0.36268378337836166,
+    0.36268378337836166,
+    0.3137066458778869,
+    0.22238103445337443,
+    0.10122853629037706,
+]
+
+
+@dataclass
+class RocketState:
+    """Kinematic state of the rocket.
+
+    Attributes
+    ----------
+    location (m): Location of the rocket.
+    velocity (m/s): Velocity of the rocket.
+    angle (rad): Angle of the rocket.
+    angular_velocity (rad/s): Angular velocity of the rocket.
+    """
+
+    location: Coordinate
+    velocity: Coordinate
+    angle: float
+    angular_velocity: float
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+def _acc(acc_relative: Coordinate, angle: float) -> Coordinate:
+    """Acceleration relative to the rocket, in the game frame."""
+
+    return acc_relative.rotate_by(angle - math.pi / 2)
+
+
+def semi_implicit_euler(
+    state: RocketState, acc_relative: Coordinate, angular_acc: float, timestep: float
+) -> RocketState:
+
+    acc = _acc(acc_relative, state.angle)
+    velocity = state.velocity + acc * timestep
+    angular_velocity = state.angular_velocity + angular_acc * timestep
+
+    return RocketState(
+        state.location + velocity * timestep,
+        velocity,
+        normalise_angle(state.angle + angular_velocity * timestep),
+        angular_velocity,
+    )
+
+
+def velocity_verlet(
+    state: RocketState, acc_relative: Coordinate, angular_acc: float, timestep: float
+) -> RocketState:
+
+    angular_velocity = state.angular_velocity + angular_acc * timestep
+    angle = (
+        state.angle
+        + state.angular_velocity * timestep
+        + angular_acc * timestep ** 2 / 2
+    )
+
+    acc_start = _acc(acc_relative, state.angle)
+    acc_end = _acc(acc_relative, angle)
+
+    return RocketState(
+        state.location + state.velocity * timestep + acc_start * (timestep ** 2 / 2),
+        state.velocity + (acc_start + acc_end) * (timestep / 2),
+        normalise_angle(angle),
+        angular_velocity,
+    )
+
+
+def rk4(
+    state: RocketState, acc_relative: Coordinate, angular_acc: float, timestep: float
+) -> RocketState:
+
+    def derivative(velocity, angle, angular_velocity):
+        # Derivatives of (location, velocity, angle, angular velocity)
+        return velocity, _acc(acc_relative, angle), angular_velocity, angular_acc
+
+    def advance(derivatives, dt):
+        _, d_velocity, d_angle, d_angular_velocity = derivatives
+        return (
+            state.velocity + d_velocity * dt,
+            state.angle + d_angle * dt,
+            state.angular_velocity + d_angular_velocity * dt,
+        )
+
+    k1 = derivative(state.velocity, state.angle, state.angular_velocity)
+    k2 = derivative(*advance(k1, timestep / 2))
+    k3 = derivative(*advance(k2, timestep / 2))
+    k4 = derivative(*advance(k3, timestep))
+
+    def combine(i):
+        return (k1[i] + 2 * k2[i] + 2 * k3[i] + k4[i]) * (timestep / 6)
+
+    return RocketState(
+        state.location + combine(0),
+        state.velocity + combine(1),
+        normalise_angle(state.angle + combine(2)),
+        state.angular_velocity + combine(3),
+    )
+
+
+def exact(
+    state: RocketState, acc_relative: Coordinate, angular_acc: float, timestep: float
+) -> RocketState:
+
+    def angle_at(t):
+        return state.angle + state.angular_velocity * t + angular_acc * t ** 2 / 2
+
+    # v(T) = v0 + int_0^T a(t) dt
+    # x(T) = x0 + v0 T + int_0^T (T - t) a(t) dt
+    delta_velocity = Coordinate(0.0, 0.0)
+    delta_location = Coordinate(0.0, 0.0)
+    for node, weight in zip(_NODES, _WEIGHTS):
+        t = (node + 1) * timestep / 2
+        acc = _acc(acc_relative, angle_at(t)) * (weight * timestep / 2)
+        delta_velocity += acc
+        delta_location += acc * (timestep - t)
+
+    return RocketState(
+        state.location + state.velocity * timestep + delta_location,
+        state.velocity + delta_velocity,
+        normalise_angle(angle_at(timestep)),
+        state.angular_velocity + angular_acc * timestep,
+    )
+
+
+INTEGRATORS: Dict[str, Callable[..., RocketState]] = {
+    SEMI_IMPLICIT_EULER: semi_implicit_euler,
+    VELOCITY_VERLET: velocity_verlet,
+    RK4: rk4,
+    EXACT: exact,
+}
@@ -1,21 +1,15 @@
+import math
 import time
 from abc import ABC, abstractmethod
 from typing import Callable
 
 from controller import Controller
-from default_controllers.rocket_controller import (
-    RocketController as DefaultRocketController,
-)
-from default_controllers.turret_controller import (
-    TurretController as DefaultTurretController,
+from controller_registry import (
+    ROCKET_CONTROLLERS,
+    TURRET_CONTROLLERS,
+    ControllerRegistry,
 )
 from math_helpers import float_in_range
-from player_controllers.rocket_controller import (
-    RocketController as PlayerRocketController,
-)
-from player_controllers.turret_controller import (
-    TurretController as PlayerTurretController,
-)
 
 
 class MetaController(Controller, ABC):
@@ -27,17 +21,16 @@ class MetaController(Controller, ABC):
         active_controller,
         raise_errors,
         check_execution_time,
-        default_controller,
-        player_controller,
+        registry: ControllerRegistry,
+        options: dict = None,
     ):
         super().__init__(parameters, history)
 
         self.parameters = parameters
         self.state_copy = state_copy
-        controller = (
-            default_controller if active_controller == "default" else player_controller
+        self.controller = registry.create(
+            active_controller, parameters, history, **(options or {})
         )
-        self.controller = controller(parameters, history)
         self.raise_errors = raise_errors
         self.check_execution_time = check_execution_time
         self.error = None
@@ -45,6 +38,8 @@ class MetaController(Controller, ABC):
         self.state_changed = None
         self.inputs = None
         self.inputs_valid = None
+        self.hold_time = None
+        self.hold_until = None
 
         if not self.raise_errors:
             self.calc_inputs = self._suppress_error_decorator(self.calc_inputs)
@@ -81,6 +76,33 @@ class MetaController(Controller, ABC):
     def calc_inputs(self):  # pylint: disable=method-hidden
 
         self.inputs = self.controller.calc_inputs()
+        self.hold_time = self.controller.calc_hold_time()
+
+    @property
+    def is_holding(self) -> bool:
+        """Are the last inputs still held, so the controller needn't be called."""
+
+        return (
+            self.hold_until is not None and self.history.time < self.hold_until - 1e-9
+        )
+
+    def release_hold(self):
+
+        self.hold_until = None
+
+    def hold_inputs(self):
+        """Reuse the last inputs for this timestep, without calling the controller."""
+
+        pass
+
+    @property
+    def is_hold_time_valid(self) -> bool:
+
+        return (
+            type(self.hold_time) is float
+            and math.isfinite(self.hold_time)
+            and self.hold_time >= 0
+        )
 
     @abstractmethod
     def are_inputs_valid(self):
@@ -110,8 +132,12 @@ class MetaController(Controller, ABC):
             return
 
         self.is_state_changed()
-        if not self.state_changed:
-            self.are_inputs_valid()
+        if self.state_changed:
+            return
+
+        self.are_inputs_valid()
+        if self.inputs_valid:
+            self.hold_until = self.history.time + self.hold_time
 
 
 class RocketMetaController(MetaController):
@@ -123,6 +149,7 @@ class RocketMetaController(MetaController):
         active_controller,
         raise_errors,
         check_execution_time,
+        options: dict = None,
     ):
         super().__init__(
             parameters,
@@ -131,8 +158,8 @@ class RocketMetaController(MetaController):
             active_controller,
             raise_errors,
             check_execution_time,
-            DefaultRocketController,
-            PlayerRocketController,
+            ROCKET_CONTROLLERS,
+            options,
         )
 
     def are_inputs_valid(self):
@@ -147,6 +174,7 @@ class RocketMetaController(MetaController):
                 float_in_range(input_, 0, self.parameters.rocket.max_thruster_force)
                 for input_ in self.inputs[1:]
             )
+            and self.is_hold_time_valid
         )
 
     def store_inputs(self):
@@ -175,6 +203,7 @@ class TurretMetaController(MetaController):
         active_controller,
         raise_errors,
         check_execution_time,
+        options: dict = None,
     ):
         super().__init__(
             parameters,
@@ -183,8 +212,8 @@ class TurretMetaController(MetaController):
             active_controller,
             raise_errors,
             check_execution_time,
-            DefaultTurretController,
-            PlayerTurretController,
+            TURRET_CONTROLLERS,
+            options,
         )
 
     def are_inputs_valid(self):
@@ -196,8 +225,14 @@ class TurretMetaController(MetaController):
             and float_in_range(self.inputs[0], -max_rotation_speed, max_rotation_speed)
             and type(self.inputs[1]) is bool
             and (not self.inputs[1] or self.helpers.can_turret_fire())
+            and self.is_hold_time_valid
         )
 
+    def hold_inputs(self):
+
+        rotation_velocity, _ = self.inputs
+        self.inputs = rotation_velocity, False  # Only fire once per command
+
     def store_inputs(self):
 
         rotation_velocity, fired = self.inputs
@@ -1,20 +1,39 @@
 import math
+import time
 
+from collisions import ContinuousCollisions
 from helpers import Helpers
 from history import ProjectileHistory
+from integrators import INTEGRATORS, RocketState
 from math_helpers import normalise_angle
 from physics import Physics
 
 
 class Movement:
-    def __init__(self, parameters, history):
+    def __init__(self, parameters, history, deterministic=False, telemetry=None):
         self.parameters = parameters
         self.history = history
+        self.telemetry = telemetry
         self.physics = Physics(parameters, history)
         self.helpers = Helpers(parameters, history)
+        self.collisions = ContinuousCollisions(parameters, history)
+        self.deterministic = deterministic
+        self.tick = 0
 
     def move_objects(self):
 
+        if self.telemetry is None:
+            self._move_objects()
+            return
+
+        start = time.perf_counter()
+        self._move_objects()
+        self.telemetry.objects_moved(
+            self.tick, self.history, time.perf_counter() - start
+        )
+
+    def _move_objects(self):
+
         self.move_the_rocket()
 
         self.mark_projectiles_off_board()
@@ -33,41 +52,58 @@ class Movement:
         rocket_hist = self.history.rocket
         rocket_params = self.parameters.rocket
 
-        vel = self.physics.calc_rocket_velocity()
         acc_relative = self.parameters.rocket.calc_acc_relative2rocket(
             rocket_hist.engine_forces
         )
-
-        acc = acc_relative.rotate_by(rocket_hist.angle - math.pi / 2)
-
-        updated_vel = vel + acc * timestep
-
-        rocket_hist.locations.append(rocket_hist.location + updated_vel * timestep)
-
-        angular_vel = self.physics.calc_rocket_angular_velocity()
         angular_acc = rocket_params.calc_angular_acc(rocket_hist.thruster_forces)
 
-        updated_angular_vel = angular_vel + angular_acc * timestep
+        state = RocketState(
+            rocket_hist.location,
+            rocket_hist.velocity,
+            rocket_hist.angle,
+            rocket_hist.angular_velocity,
+        )
+        new_state = INTEGRATORS[self.parameters.time.integrator](
+            state, acc_relative, angular_acc, timestep
+        )
 
-        updated_angle = normalise_angle(
-            rocket_hist.angle + updated_angular_vel * timestep
+        rocket_hist.locations.append(new_state.location)
+        rocket_hist.angles.append(new_state.angle)
+        rocket_hist.velocities.append(new_state.velocity)
+        rocket_hist.angular_velocities.append(new_state.angular_velocity)
+        rocket_hist.accelerations.append(
+            (new_state.velocity - state.velocity) / timestep
+        )
+        rocket_hist.angular_accelerations.append(
+            (new_state.angular_velocity - state.angular_velocity) / timestep
         )
-        rocket_hist.angles.append(updated_angle)
 
     def mark_projectiles_off_board(self):
 
-        for projectile in self.history.projectiles:
+        for projectile in self.history.active_projectiles:
             location = self.helpers.calc_projectile_location(projectile)
-            if not projectile.on_board:
-                continue
-
             if not self.helpers.is_within_bounds(
                 location
-            ) or self.helpers.has_hit_obstacle(location):
-                projectile.on_board = False
+            ) or self.has_projectile_hit_obstacle(projectile, location):
+                self.history.retire_projectile(projectile)
+
+    def has_projectile_hit_obstacle(self, projectile, location) -> bool:
+
+        if self.parameters.time.continuous_collisions:
+            # Also catches projectiles that passed through an obstacle since the last tick
+            return (
+                self.collisions.projectile_hit_obstacle(projectile, self.history.time)
+                is not None
+            )
+
+        return self.helpers.has_projectile_hit_obstacle(projectile, location)
 
     def should_fire_a_projectile(self):
 
+        if self.deterministic:
+            # Turret fired this tick if there is a firing time without a projectile
+            return len(self.history.turret.when_fired) > len(self.history.projectiles)
+
         last_fired = self.history.turret.last_fired
         current_time = self.history.time
         return last_fired and math.isclose(current_time, last_fired)
@@ -77,9 +113,7 @@ class Movement:
         launch_angle = self.history.turret.angle
         current_time = self.history.time
 
-        self.history.projectiles.append(
-            ProjectileHistory(launch_angle, current_time, True)
-        )
+        self.history.add_projectile(ProjectileHistory(launch_angle, current_time, True))
 
     def rotate_the_turret(self):
 
@@ -93,4 +127,10 @@ class Movement:
 
     def update_the_time(self):
 
-        self.history.time += self.parameters.time.timestep
+        self.tick += 1
+
+        if self.deterministic:
+            # Avoid accumulating rounding error by deriving the time from the tick
+            self.history.time = self.tick * self.parameters.time.timestep
+        else:
+            self.history.time += self.parameters.time.timestep
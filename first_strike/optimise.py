@@ -0,0 +1,314 @@
+"""Tune the default rocket controller against the default turret with CMA-ES.
+
+The search space is the eleven direction weights and the controller gains
+(p_c, d_c, direction_velocity_ratio and safety_buffer) of the default rocket.
+Each is searched on a log scale relative to its current value, so every
+dimension has a similar scale and keeps its sign.
+
+Each candidate is scored over a corpus of scenarios, played headless in
+determinism mode in a process pool. A game scores 1 if the rocket wins,
+otherwise up to 0.5 for how close to the turret the rocket got. Candidates are
+raced through the corpus in batches: once a candidate can no longer match the
+best fully scored candidate, it stops being played.
+
+Usage: python first_strike/optimise.py scenarios.jsonl tuned.json [generations] [seed]
+Where scenarios.jsonl is written by scenario_generator.py, and tuned.json has the
+same rocket_weights and rocket_gains entries that sweep.py accepts.
+"""
+
+import json
+import math
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, astuple, fields
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from controllers import Controllers
+from default_controllers.rocket_controller import (
+    DEFAULT_CONTROL_GAINS,
+    DEFAULT_DIRECTION_WEIGHTS,
+    ControlGains,
+    DirectionWeights,
+)
+from headless import Headless
+from result import CAUSE2WINNER, ROCKET_WIN, Result
+from scenario_cache import Scenario, ScenarioCache
+
+PARAMETER_NAMES = DirectionWeights.names() + tuple(
+    field.name for field in fields(ControlGains)
+)
+DEFAULT_VALUES = np.array(
+    astuple(DEFAULT_DIRECTION_WEIGHTS) + astuple(DEFAULT_CONTROL_GAINS), dtype=float
+)
+
+
+def decode(x: np.ndarray) -> Tuple[DirectionWeights, ControlGains]:
+    """Weights and gains of a point in the (log relative) search space."""
+
+    values = DEFAULT_VALUES * np.exp(x)
+    nweights = len(DirectionWeights.names())
+
+    return (
+        DirectionWeights(*(float(value) for value in values[:nweights])),
+        ControlGains(*(float(value) for value in values[nweights:])),
+    )
+
+
+def score_game(
+    scenario: Scenario, weights: DirectionWeights, gains: ControlGains
+) -> float:
+    """Play the tuned default rocket against the default turret on a scenario.
+
+    Return
+    ----------
+    score: 1 if the rocket wins; otherwise between 0 and 0.5, higher the closer
+        the rocket finished to the turret.
+    """
+
+    controller_parameters, _, parameters, history = scenario.new_game()
+    # Controller errors lose the game rather than stopping the optimiser
+    controller_parameters = ("default", "default", False, False) + tuple(
+        controller_parameters[4:]
+    )
+
+    controllers = Controllers(
+        parameters,
+        history,
+        controller_parameters,
+        rocket_options={"weights": weights, "gains": gains},
+    )
+    result = Result(parameters, history, controllers)
+    Headless(parameters, history, controllers, result, deterministic=True).run()
+
+    if CAUSE2WINNER[result.cause] == ROCKET_WIN:
+        return 1.0
+
+    half_diagonal = (
+        math.hypot(parameters.environment.width, parameters.environment.height) / 2
+    )
+    distance = history.rocket.location.distance2(parameters.turret.location)
+
+    return 0.5 * max(0.0, 1 - distance / half_diagonal)
+
+
+def _score_game(args):
+
+    return score_game(*args)
+
+
+class CMAES:
+    """Covariance matrix adaptation evolution strategy, minimising a function.
+
+    Follows Hansen, "The CMA Evolution Strategy: A Tutorial" (2016), with the
+    default population size and learning rates.
+
+    Methods
+    ----------
+    ask: Sample a population of candidate solutions.
+    tell: Update the distribution from the fitness of each candidate.
+    """
+
+    def __init__(
+        self,
+        mean: Sequence[float],
+        sigma: float,
+        popsize: int = None,
+        seed: int = None,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.mean = np.asarray(mean, dtype=float)
+        self.sigma = sigma
+        self.generation = 0
+
+        n = len(self.mean)
+        self.n = n
+        self.popsize = popsize or 4 + int(3 * math.log(n))
+        self.mu = self.popsize // 2
+        weights = math.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1 / (self.weights ** 2).sum()
+
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(
+            1 - self.c1,
+            2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff),
+        )
+        self.damps = (
+            1 + 2 * max(0.0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        )
+        self.chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self.C = np.eye(n)
+        self._decompose()
+
+    def _decompose(self):
+
+        self.C = (self.C + self.C.T) / 2
+        eigenvalues, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+    def ask(self) -> np.ndarray:
+        """popsize candidates, one per row."""
+
+        z = self.rng.standard_normal((self.popsize, self.n))
+
+        return self.mean + self.sigma * (z * self.D) @ self.B.T
+
+    def tell(self, candidates: np.ndarray, fitnesses: Sequence[float]):
+
+        self.generation += 1
+        order = np.argsort(fitnesses)[: self.mu]
+        steps = (candidates[order] - self.mean) / self.sigma
+
+        y = self.weights @ steps
+        self.mean = self.mean + self.sigma * y
+
+        inv_sqrt_c_y = self.B @ ((self.B.T @ y) / self.D)
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(
+            self.cs * (2 - self.cs) * self.mueff
+        ) * inv_sqrt_c_y
+        ps_norm = np.linalg.norm(self.ps)
+        hsig = ps_norm / math.sqrt(
+            1 - (1 - self.cs) ** (2 * self.generation)
+        ) / self.chi_n < 1.4 + 2 / (self.n + 1)
+        self.pc = (1 - self.cc) * self.pc + hsig * math.sqrt(
+            self.cc * (2 - self.cc) * self.mueff
+        ) * y
+
+        rank_one = (
+            np.outer(self.pc, self.pc) + (1 - hsig) * self.cc * (2 - self.cc) * self.C
+        )
+        rank_mu = (steps.T * self.weights) @ steps
+        self.C = (
+            (1 - self.c1 - self.cmu) * self.C + self.c1 * rank_one + self.cmu * rank_mu
+        )
+        self.sigma *= math.exp((self.cs / self.damps) * (ps_norm / self.chi_n - 1))
+        self._decompose()
+
+
+class Optimiser:
+    """CMA-ES over the default rocket's weights and gains, scored on a scenario corpus.
+
+    Attributes
+    ----------
+    scenarios: The corpus each candidate is scored on.
+    sigma: Initial step size, in log units (0.3 is roughly +-30%).
+    popsize: Candidates per generation; CMA-ES default if None.
+    seed: Seed for the CMA-ES samples.
+    batch_size: Scenarios played per candidate between early stopping checks.
+    patience: Generations without improvement before the search stops.
+
+    Methods
+    ----------
+    evaluate: Score candidates on the corpus, stopping early on clearly bad ones.
+    run: Search for the best weights and gains.
+    """
+
+    def __init__(
+        self,
+        scenarios: Sequence[Scenario],
+        sigma: float = 0.3,
+        popsize: int = None,
+        seed: int = None,
+        batch_size: int = 4,
+        patience: int = 5,
+    ):
+        self.scenarios = scenarios
+        self.sigma = sigma
+        self.popsize = popsize
+        self.seed = seed
+        self.batch_size = batch_size
+        self.patience = patience
+
+    def evaluate(
+        self, candidates: np.ndarray, executor: Executor, incumbent: float = 0.0
+    ) -> List[float]:
+        """Mean score of each candidate over the corpus.
+
+        Candidates are played on the corpus a batch at a time. A candidate that
+        can't reach the incumbent score even by winning every remaining game is
+        stopped, and given that upper bound as its score.
+        """
+
+        tunings = [decode(x) for x in candidates]
+        nscenarios = len(self.scenarios)
+        totals = [0.0] * len(candidates)
+        racing = list(range(len(candidates)))
+
+        for start in range(0, nscenarios, self.batch_size):
+            batch = range(start, min(start + self.batch_size, nscenarios))
+            games = [(i, j) for i in racing for j in batch]
+            scores = executor.map(
+                _score_game,
+                ((self.scenarios[j], *tunings[i]) for i, j in games),
+            )
+            for (i, _), score in zip(games, scores):
+                totals[i] += score
+
+            remaining = nscenarios - batch.stop
+            stopped = [
+                i for i in racing if totals[i] + remaining < incumbent * nscenarios
+            ]
+            for i in stopped:
+                totals[i] += remaining  # Upper bound on the final total
+            racing = [i for i in racing if i not in stopped]
+            if not racing:
+                break
+
+        return [total / nscenarios for total in totals]
+
+    def run(self, generations: int = 30, max_workers: int = None) -> Dict[str, Any]:
+        """Search for the best weights and gains.
+
+        Return
+        ----------
+        tuned: score, rocket_weights, rocket_gains and the number of generations run.
+        """
+
+        x0 = np.zeros(len(PARAMETER_NAMES))
+        es = CMAES(x0, self.sigma, self.popsize, self.seed)
+
+        with ProcessPoolExecutor(max_workers) as executor:
+            (best_score,) = self.evaluate(x0[None, :], executor)
+            best_x = x0
+            stale = 0
+            for _ in range(generations):
+                candidates = es.ask()
+                scores = self.evaluate(candidates, executor, best_score)
+                es.tell(candidates, [-score for score in scores])
+
+                best = int(np.argmax(scores))
+                if scores[best] > best_score:
+                    best_score, best_x = scores[best], candidates[best]
+                    stale = 0
+                else:
+                    stale += 1
+                if stale >= self.patience:
+                    break
+
+        weights, gains = decode(best_x)
+
+        return {
+            "score": best_score,
+            "rocket_weights": asdict(weights),
+            "rocket_gains": asdict(gains),
+            "generations": es.generation,
+        }
+
+
+if __name__ == "__main__":
+    scenarios_path, tuned_path = sys.argv[1:3]
+    generations = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+    seed = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    scenarios = ScenarioCache().load_jsonl(scenarios_path)
+    tuned = Optimiser(scenarios, seed=seed).run(generations)
+
+    with open(tuned_path, "w") as f:
+        json.dump(tuned, f, indent=4)
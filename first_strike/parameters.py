@@ -67,10 +67,15 @@ class TimeParameters:
     ----------
     timestep (s): Duration of the timestep between each game turn.
     max_game_time (s): If game time exceeds this value, it will be declared a draw.
+    integrator: Name of the integrator used to move the rocket (see integrators.py).
+    continuous_collisions: Whether collisions are swept between ticks, rather than
+        only checked at each tick (see collisions.py).
     """
 
     timestep: float
     max_game_time: float
+    integrator: str = "semi_implicit_euler"
+    continuous_collisions: bool = False
 
     def __eq__(self, other):
         return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
@@ -1,4 +1,4 @@
-from math_helpers import Coordinate, normalise_angle
+from math_helpers import Coordinate
 
 
 class Physics:
@@ -8,49 +8,19 @@ class Physics:
 
     def calc_rocket_velocity(self) -> Coordinate:
 
-        locations = self.history.rocket.locations
-        timestep = self.parameters.time.timestep
-
-        if len(locations) < 2:
-            return Coordinate(0.0, 0.0)
-
-        return (locations[-1] - locations[-2]) / timestep
+        return self.history.rocket.velocity
 
     def calc_rocket_acceleration(self) -> Coordinate:
 
-        locations = self.history.rocket.locations
-        timestep = self.parameters.time.timestep
-
-        if len(locations) < 3:
-            return Coordinate(0.0, 0.0)
-
-        v1 = (locations[-1] - locations[-2]) / timestep
-        v2 = (locations[-2] - locations[-3]) / timestep
-
-        return (v1 - v2) / timestep
+        return self.history.rocket.acceleration
 
     def calc_rocket_angular_velocity(self) -> float:
 
-        angles = self.history.rocket.angles
-        timestep = self.parameters.time.timestep
-
-        if len(angles) < 2:
-            return 0.0
-
-        return (angles[-1] - angles[-2]) / timestep
+        return self.history.rocket.angular_velocity
 
     def calc_rocket_angular_acceleration(self) -> float:
 
-        angles = self.history.rocket.angles
-        timestep = self.parameters.time.timestep
-
-        if len(angles) < 3:
-            return 0.0
-
-        theta1 = (angles[-1] - angles[-2]) / timestep
-        theta2 = (angles[-2] - angles[-3]) / timestep
-
-        return (theta1 - theta2) / timestep
+        return self.history.rocket.angular_acceleration
 
     def get_engine_force_by_label(self, engine: str) -> float:
 
@@ -1,3 +1,6 @@
+from functools import cached_property
+
+from collisions import ContinuousCollisions, earliest
 from controllers import Controllers
 from helpers import Helpers
 from history import History
@@ -68,6 +71,12 @@ class Result:
         self.turret_controller = controllers.turret_controller
         self.cause: int = None
 
+    @cached_property
+    def collisions(self) -> ContinuousCollisions:
+        """Swept collision checks, built on first use."""
+
+        return ContinuousCollisions(self.parameters, self.history)
+
     def is_game_over(self) -> bool:
         return bool(self.cause)
 
@@ -168,6 +177,10 @@ class Result:
 
     def check_win_conditions(self):
 
+        if self.parameters.time.continuous_collisions:
+            self._check_win_conditions_continuous()
+            return
+
         rocket_hit_turret = self.helpers.does_rocket_impact_turret()
         projectile_hit_rocket = self.helpers.does_projectile_impact_rocket()
 
@@ -183,3 +196,30 @@ class Result:
             self.cause = PROJECTILE_HIT_ROCKET
         elif self.helpers.is_game_time_exceeded():
             self.cause = GAME_TIME_EXCEEDED
+
+    def _check_win_conditions_continuous(self):
+        """check_win_conditions, with collisions swept over the last timestep.
+
+        Out of bounds is still checked at the tick. Otherwise the earliest
+        collision during the timestep decides the game.
+        """
+
+        collisions = self.collisions
+        obstacle = collisions.rocket_hit_obstacle()
+        turret = collisions.rocket_hit_turret()
+        projectile = collisions.projectile_hit_rocket()
+        first = earliest((obstacle, turret, projectile))
+
+        if not self.helpers.is_rocket_within_bounds():
+            self.cause = ROCKET_OUT_OF_BOUNDS
+        elif first is None:
+            if self.helpers.is_game_time_exceeded():
+                self.cause = GAME_TIME_EXCEEDED
+        elif obstacle == first:
+            self.cause = ROCKET_HIT_OBSTACLE
+        elif turret == first and projectile == first:
+            self.cause = BOTH_DESTROYED
+        elif turret == first:
+            self.cause = ROCKET_HIT_TURRET
+        else:
+            self.cause = PROJECTILE_HIT_ROCKET
@@ -0,0 +1,263 @@
+"""Persistent store of game outcomes, so that unchanged games are never replayed.
+
+Each outcome is keyed by hashes of everything that can affect it:
+    - The source of the rocket controller, the modules it imports and its options
+    - The source of the turret controller, the modules it imports and its options
+    - The scenario (parameters, starting history and controller settings)
+    - The source of the game engine
+Changing any of these gives a new key, so stale results are never returned.
+"""
+
+import ast
+import hashlib
+import importlib.util
+import inspect
+import os
+import sqlite3
+import sys
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Modules that determine how a game plays out, independently of the controllers
+ENGINE_MODULES = (
+    "collisions",
+    "controller",
+    "controller_helpers",
+    "controller_registry",
+    "controllers",
+    "headless",
+    "helpers",
+    "history",
+    "integrators",
+    "math_helpers",
+    "meta_controller",
+    "movement",
+    "parameters",
+    "physics",
+    "result",
+    "shadow_map",
+    "visibility",
+)
+
+ENGINE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+OUTCOME_FIELDS = ("cause", "winner", "ticks", "game_time", "projectiles_fired")
+
+
+def _sha256(text: str) -> str:
+
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _imported_names(source: str, package: str) -> Iterator[str]:
+    """Names of the modules a module imports, anywhere in its source.
+
+    For "from a import b", both a and a.b are given, as b may be a module.
+    """
+
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = importlib.util.resolve_name(
+                    "." * node.level + (node.module or ""), package
+                )
+            else:
+                base = node.module
+            yield base
+            yield from (f"{base}.{alias.name}" for alias in node.names)
+
+
+def _is_within(path: Optional[str], roots: Tuple[str, ...]) -> bool:
+
+    return path is not None and any(
+        path == root or path.startswith(root + os.sep) for root in roots
+    )
+
+
+def _find_within(name: str, roots: Tuple[str, ...], found: Dict[str, Any]):
+    """Spec of a module if it (and every package above it) is within the roots.
+
+    Checking the packages first means nothing outside the roots is imported.
+    """
+
+    if name in found:
+        return found[name]
+
+    spec = None
+    parent = name.rpartition(".")[0]
+    if not parent or _find_within(parent, roots, found) is not None:
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            pass
+    if spec is not None:
+        # Namespace packages have no file, only directories
+        location = spec.origin if spec.has_location else None
+        if location is None and spec.submodule_search_locations:
+            location = next(iter(spec.submodule_search_locations), None)
+        if not _is_within(location, roots):
+            spec = None
+    found[name] = spec
+
+    return spec
+
+
+def module_sources(module) -> Dict[str, str]:
+    """Source of a module and of every module it imports, directly or not, that
+    is part of first strike or of the same package as the module.
+
+    Keyed by module name. Imports from anywhere else (the standard library and
+    installed packages) are left out.
+    """
+
+    top_level = sys.modules[module.__name__.partition(".")[0]]
+    if hasattr(top_level, "__path__"):
+        roots = (ENGINE_DIR, *top_level.__path__)
+    else:
+        roots = (ENGINE_DIR, top_level.__file__)  # A lone module, not a package
+
+    sources = {}
+    found = {}
+    pending = [(module.__name__, module.__file__, module.__package__ or "")]
+    while pending:
+        name, path, package = pending.pop()
+        if name in sources:
+            continue
+        with open(path) as f:
+            sources[name] = f.read()
+
+        for imported in _imported_names(sources[name], package):
+            spec = _find_within(imported, roots, found)
+            if spec is not None and spec.has_location:
+                is_package = spec.submodule_search_locations is not None
+                pending.append(
+                    (
+                        imported,
+                        spec.origin,
+                        imported if is_package else imported.rpartition(".")[0],
+                    )
+                )
+
+    return sources
+
+
+def source_hash(obj, options: Dict[str, Any] = None) -> str:
+    """Hash of the source of a class, function or module, and of what it imports.
+
+    Covers the module that defines it and its imports (see module_sources). For
+    a controller, options are the keyword arguments it is created with (eg: the
+    weights and gains of a tuned default rocket), as they change how it plays
+    without changing its source.
+    """
+
+    module = obj if inspect.ismodule(obj) else sys.modules[obj.__module__]
+    sources = module_sources(module)
+
+    parts = [f"{name}\n{sources[name]}" for name in sorted(sources)]
+    parts.extend(f"{name}={value!r}" for name, value in sorted((options or {}).items()))
+
+    return _sha256("\n".join(parts))
+
+
+def engine_hash(early_resolution: bool = False) -> str:
+    """Hash of the source of every engine module.
+
+    Games resolved early end sooner than those played out, so they hash differently.
+    """
+
+    modules = ENGINE_MODULES + (("early_resolution",) if early_resolution else ())
+
+    sources = []
+    for module in modules:
+        with open(os.path.join(ENGINE_DIR, f"{module}.py")) as f:
+            sources.append(f.read())
+
+    return _sha256("\n".join(sources))
+
+
+def scenario_hash(controller_parameters, parameters, history) -> str:
+    """Hash of a scenario, as returned by process_game_parameters.
+
+    Dataclass reprs are deterministic and floats repr exactly, so the repr
+    uniquely identifies the scenario.
+    """
+
+    return _sha256(repr((controller_parameters, parameters, history)))
+
+
+def game_key(rocket_hash: str, turret_hash: str, scenario: str, engine: str) -> str:
+
+    return _sha256("|".join((rocket_hash, turret_hash, scenario, engine)))
+
+
+class ResultStore:
+    """SQLite backed store of game outcomes.
+
+    Methods
+    ----------
+    get: Get the outcome of a game, or None if it hasn't been played.
+    put: Store the outcome of a game.
+    """
+
+    def __init__(self, path: str = "results.sqlite3"):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                rocket_hash TEXT,
+                turret_hash TEXT,
+                scenario_hash TEXT,
+                engine_hash TEXT,
+                cause INTEGER,
+                winner INTEGER,
+                ticks INTEGER,
+                game_time REAL,
+                projectiles_fired INTEGER
+            )
+            """)
+        self.connection.commit()
+
+    def __contains__(self, key: str) -> bool:
+
+        return self.get(key) is not None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+
+        row = self.connection.execute(
+            f"SELECT {', '.join(OUTCOME_FIELDS)} FROM results WHERE key = ?", (key,)
+        ).fetchone()
+
+        return dict(zip(OUTCOME_FIELDS, row)) if row else None
+
+    def put(
+        self,
+        key: str,
+        hashes: Dict[str, str],
+        outcome: Dict[str, Any],
+    ):
+        """Store the outcome of a game.
+
+        Arguments
+        ----------
+        key: Key of the game, from game_key.
+        hashes: The rocket_hash, turret_hash, scenario_hash and engine_hash of the game.
+        outcome: The cause, winner, ticks, game_time and projectiles_fired of the game.
+        """
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                hashes["rocket_hash"],
+                hashes["turret_hash"],
+                hashes["scenario_hash"],
+                hashes["engine_hash"],
+                *(outcome[field] for field in OUTCOME_FIELDS),
+            ),
+        )
+        self.connection.commit()
+
+    def close(self):
+
+        self.connection.close()
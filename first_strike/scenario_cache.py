@@ -0,0 +1,190 @@
+"""Cache of parsed and validated scenarios, keyed by a hash of their contents.
+
+Reading, validating and storing the game parameters is done once per unique
+scenario. Each game is then given its own clone of the cached Parameters and
+starting History, which is far cheaper than going through game_parameters again.
+"""
+
+import hashlib
+import json
+import pickle
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from game_parameters import build_game_parameters
+from history import History, RocketHistory, TurretHistory
+from math_helpers import Coordinate
+from parameters import (
+    EnvironmentParameters,
+    ObstacleParameters,
+    Parameters,
+    RocketParameters,
+    TimeParameters,
+    TurretParameters,
+)
+from visual import Visual
+
+
+def clone_parameters(parameters: Parameters) -> Parameters:
+    """Create an independent copy of the parameters, without using deepcopy."""
+
+    environment = parameters.environment
+    time = parameters.time
+    rocket = parameters.rocket
+    turret = parameters.turret
+
+    return Parameters(
+        EnvironmentParameters(
+            environment.width,
+            environment.height,
+            [
+                ObstacleParameters(
+                    Coordinate(obstacle.location.x, obstacle.location.y),
+                    obstacle.radius,
+                )
+                for obstacle in environment.obstacles
+            ],
+        ),
+        TimeParameters(
+            time.timestep,
+            time.max_game_time,
+            time.integrator,
+            time.continuous_collisions,
+        ),
+        RocketParameters(
+            rocket.mass,
+            rocket.length,
+            rocket.max_main_engine_force,
+            rocket.max_thruster_force,
+            rocket.engine_labels,
+        ),
+        TurretParameters(
+            turret.radius,
+            Coordinate(turret.location.x, turret.location.y),
+            turret.max_rotation_speed,
+            turret.projectile_speed,
+            turret.min_firing_interval,
+        ),
+    )
+
+
+def clone_start_history(history: History) -> History:
+    """Create an independent copy of a starting history, without using deepcopy.
+
+    Only the start state is copied (no engine forces, projectiles, etc).
+    """
+
+    location = history.rocket.location
+
+    return History(
+        RocketHistory([Coordinate(location.x, location.y)], [history.rocket.angle]),
+        TurretHistory([history.turret.angle]),
+    )
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A validated scenario, used as a template for new games.
+
+    The objects held here are never given to a game directly; use new_game.
+
+    Attributes
+    ----------
+    key: Hash of the scenario's game parameters, as canonical (key sorted) JSON.
+    controller_parameters: Controller settings, as returned by process_game_parameters.
+    visual: Visual settings.
+    parameters: Template parameters.
+    history: Template starting history.
+    """
+
+    key: str
+    controller_parameters: tuple
+    visual: Visual
+    parameters: Parameters
+    history: History
+
+    def new_game(self) -> Tuple[tuple, Visual, Parameters, History]:
+        """Clone the template, in the same form as process_game_parameters."""
+
+        return (
+            self.controller_parameters,
+            self.visual,
+            clone_parameters(self.parameters),
+            clone_start_history(self.history),
+        )
+
+    def reset_game(
+        self, parameters: Parameters, history: History
+    ) -> Tuple[Parameters, History]:
+        """Reuse the parameters and history of a finished game of this scenario.
+
+        The history is reset in place. Either is only cloned from the template
+        again if it no longer matches it, eg: a controller tampered with it.
+        """
+
+        if parameters != self.parameters:
+            parameters = clone_parameters(self.parameters)
+
+        history.reset()
+        if history != self.history:
+            history = clone_start_history(self.history)
+
+        return parameters, history
+
+
+class ScenarioCache:
+    """In-memory cache of validated scenarios.
+
+    Methods
+    ----------
+    get: Get a scenario from its game parameters, as read from the JSON file.
+    load: Get a scenario from a game parameters JSON file.
+    load_jsonl: Get every scenario in a JSON Lines file (one set of game parameters per line).
+    save_snapshot: Write every cached scenario to a binary file.
+    load_snapshot: Add every scenario in a binary file to the cache, without re-validating.
+    """
+
+    def __init__(self):
+        self.scenarios: Dict[str, Scenario] = {}
+
+    def __len__(self):
+        return len(self.scenarios)
+
+    def get(self, game_params: dict) -> Scenario:
+
+        # Keyed on the canonical JSON, so the same scenario from any source
+        # (file, JSON Lines or already parsed) is only validated once
+        raw = json.dumps(game_params, sort_keys=True)
+        key = hashlib.sha256(raw.encode()).hexdigest()
+
+        try:
+            return self.scenarios[key]
+        except KeyError:
+            pass
+
+        # Built from a copy, so the scenario can't be changed through game_params
+        scenario = Scenario(key, *build_game_parameters(json.loads(raw)))
+        self.scenarios[key] = scenario
+
+        return scenario
+
+    def load(self, path: str) -> Scenario:
+
+        with open(path) as f:
+            return self.get(json.load(f))
+
+    def load_jsonl(self, path: str) -> List[Scenario]:
+
+        with open(path) as f:
+            return [self.get(json.loads(line)) for line in f if line.strip()]
+
+    def save_snapshot(self, path: str):
+
+        with open(path, "wb") as f:
+            pickle.dump(self.scenarios, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load_snapshot(self, path: str):
+        """Only load snapshots created by save_snapshot from a trusted source."""
+
+        with open(path, "rb") as f:
+            self.scenarios.update(pickle.load(f))
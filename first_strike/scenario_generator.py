@@ -0,0 +1,306 @@
+"""Generate large numbers of random, valid arenas from a base set of game parameters.
+
+Obstacles, the turret and the rocket start location are placed on a spatial grid.
+Each object is given its own grid cell and is kept entirely inside it, so objects
+can never overlap and no placement is ever rejected. Every arena is then checked
+against the geometric rules of game_parameters._validate_game_parameters, with
+all arenas checked at once using numpy.
+
+Usage: python first_strike/scenario_generator.py <narenas> <seed> arenas.jsonl
+"""
+
+import copy
+import json
+import math
+import sys
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+from game_parameters import GAME_PARAMETERS_PATH
+from history import History, RocketHistory, TurretHistory
+from integrators import SEMI_IMPLICIT_EULER
+from math_helpers import Coordinate
+from parameters import (
+    EnvironmentParameters,
+    ObstacleParameters,
+    Parameters,
+    RocketParameters,
+    TimeParameters,
+    TurretParameters,
+)
+
+Arenas = Dict[str, np.ndarray]
+
+
+def validate_arenas(
+    arenas: Arenas,
+    width: float,
+    height: float,
+    rocket_radius: float,
+    turret_radius: float,
+) -> np.ndarray:
+    """Check the geometric rules of every arena at once.
+
+    Mirrors the location checks in game_parameters._validate_game_parameters:
+        - All objects are within the board.
+        - The rocket does not start hitting the turret or any obstacle.
+        - The turret is not hitting any obstacle.
+        - All obstacles have a positive radius.
+
+    Arguments
+    ----------
+    arenas: Arrays as produced by ScenarioGenerator.generate_arenas.
+    width (m): Width of the game board.
+    height (m): Height of the game board.
+    rocket_radius (m): Target radius of the rocket.
+    turret_radius (m): Radius of the turret.
+
+    Return
+    ----------
+    valid: Boolean array, True where the arena is valid.
+    """
+
+    rocket = arenas["rocket_location"]  # (n, 2)
+    turret = arenas["turret_location"]  # (n, 2)
+    obstacles = arenas["obstacle_locations"]  # (n, k, 2)
+    radii = arenas["obstacle_radii"]  # (n, k)
+
+    def within_bounds(locations):
+        return (np.abs(locations[..., 0]) <= width / 2) & (
+            np.abs(locations[..., 1]) <= height / 2
+        )
+
+    rocket2turret = np.linalg.norm(rocket - turret, axis=-1)
+    rocket2obstacles = np.linalg.norm(obstacles - rocket[:, None, :], axis=-1)
+    turret2obstacles = np.linalg.norm(obstacles - turret[:, None, :], axis=-1)
+
+    return (
+        within_bounds(rocket)
+        & within_bounds(turret)
+        & np.all(within_bounds(obstacles), axis=-1)
+        & np.all(radii > 0, axis=-1)
+        & (rocket2turret > turret_radius + rocket_radius)
+        & np.all(rocket2obstacles > radii + rocket_radius, axis=-1)
+        & np.all(turret2obstacles > radii + turret_radius, axis=-1)
+    )
+
+
+class ScenarioGenerator:
+    """Seeded generator of random arenas.
+
+    Everything other than the obstacles, the turret location and the start state
+    of the rocket and turret is taken unchanged from the base game parameters.
+
+    Attributes
+    ----------
+    base_params: Game parameters as read from the JSON file.
+    obstacle_density: Fraction of the grid cells (0 to 1) that hold an obstacle.
+    min_obstacle_radius (m): Smallest obstacle radius.
+    max_obstacle_radius (m): Largest obstacle radius.
+    clearance (m): Minimum gap between any object and the edge of its grid cell.
+    seed: Seed for the random number generator.
+
+    Methods
+    ----------
+    generate_arenas: Generate the arrays describing n arenas.
+    game_params: Convert a single arena into game parameters, as read from the JSON file.
+    build: Convert a single arena into Parameters and a starting History.
+    generate: Generate n arenas as Parameters and starting History.
+    write_jsonl: Write n arenas as game parameters to a JSON Lines file.
+    """
+
+    def __init__(
+        self,
+        base_params: dict,
+        obstacle_density: float = 0.05,
+        min_obstacle_radius: float = 5.0,
+        max_obstacle_radius: float = 20.0,
+        clearance: float = 1.0,
+        seed: int = None,
+    ):
+        if not 0 <= obstacle_density < 1:
+            raise ValueError("Obstacle density must be in the range [0, 1)")
+        if not 0 < min_obstacle_radius <= max_obstacle_radius:
+            raise ValueError("Obstacle radii must be positive, with min <= max")
+        if clearance <= 0:
+            raise ValueError("Clearance must be positive")
+
+        self.base_params = base_params
+        self.obstacle_density = obstacle_density
+        self.min_obstacle_radius = min_obstacle_radius
+        self.max_obstacle_radius = max_obstacle_radius
+        self.clearance = clearance
+        self.rng = np.random.default_rng(seed)
+
+        environment = base_params["environment"]
+        self.width = environment["width"]
+        self.height = environment["height"]
+        self.rocket_radius = base_params["rocket"]["length"] / 2
+        self.turret_radius = base_params["turret"]["radius"]
+
+        max_radius = max(max_obstacle_radius, self.rocket_radius, self.turret_radius)
+        self.cell_size = 2 * (max_radius + clearance)
+        self.ncols = int(self.width // self.cell_size)
+        self.nrows = int(self.height // self.cell_size)
+        self.ncells = self.ncols * self.nrows
+        self.nobstacles = int(obstacle_density * self.ncells)
+
+        if self.ncells < self.nobstacles + 2:
+            raise ValueError("Board is too small to fit the rocket and turret")
+
+    def _cell_origins(self, cells: np.ndarray) -> np.ndarray:
+        """Bottom-left corner of each grid cell, centring the grid on the board."""
+
+        x0 = -self.ncols * self.cell_size / 2
+        y0 = -self.nrows * self.cell_size / 2
+        cols = cells % self.ncols
+        rows = cells // self.ncols
+
+        return np.stack(
+            (x0 + cols * self.cell_size, y0 + rows * self.cell_size), axis=-1
+        )
+
+    def _place(self, cells: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """Uniformly place circles of the given radii fully inside their cells."""
+
+        free_space = self.cell_size - 2 * (radii + self.clearance)
+        offsets = (radii + self.clearance)[..., None] + self.rng.random(
+            cells.shape + (2,)
+        ) * free_space[..., None]
+
+        return self._cell_origins(cells) + offsets
+
+    def generate_arenas(self, n: int) -> Arenas:
+        """Generate the arrays describing n arenas.
+
+        Return
+        ----------
+        arenas: Arrays keyed by:
+            - rocket_location (n, 2)
+            - rocket_angle (n,)
+            - turret_location (n, 2)
+            - turret_angle (n,)
+            - obstacle_locations (n, nobstacles, 2)
+            - obstacle_radii (n, nobstacles)
+        """
+
+        # A random permutation of the cells per arena; take the first few
+        cells = np.argsort(self.rng.random((n, self.ncells)), axis=1)[
+            :, : self.nobstacles + 2
+        ]
+
+        obstacle_radii = self.rng.uniform(
+            self.min_obstacle_radius, self.max_obstacle_radius, (n, self.nobstacles)
+        )
+        rocket_radii = np.full(n, self.rocket_radius)
+        turret_radii = np.full(n, self.turret_radius)
+
+        arenas = {
+            "rocket_location": self._place(cells[:, 0], rocket_radii),
+            "rocket_angle": math.pi - self.rng.uniform(0.0, 2 * math.pi, n),
+            "turret_location": self._place(cells[:, 1], turret_radii),
+            "turret_angle": math.pi - self.rng.uniform(0.0, 2 * math.pi, n),
+            "obstacle_locations": self._place(cells[:, 2:], obstacle_radii),
+            "obstacle_radii": obstacle_radii,
+        }
+
+        valid = validate_arenas(
+            arenas, self.width, self.height, self.rocket_radius, self.turret_radius
+        )
+        if not valid.all():
+            raise RuntimeError(f"{np.count_nonzero(~valid)} generated arenas invalid")
+
+        return arenas
+
+    def game_params(self, arenas: Arenas, index: int) -> dict:
+        """Convert a single arena into game parameters, as read from the JSON file."""
+
+        game_params = copy.deepcopy(self.base_params)
+
+        obstacles = [
+            {"location": location, "radius": radius}
+            for location, radius in zip(
+                arenas["obstacle_locations"][index].tolist(),
+                arenas["obstacle_radii"][index].tolist(),
+            )
+        ]
+        game_params["environment"]["obstacles"] = obstacles or None
+
+        game_params["rocket"]["start_location"] = arenas["rocket_location"][
+            index
+        ].tolist()
+        game_params["rocket"]["start_angle"] = float(arenas["rocket_angle"][index])
+        game_params["turret"]["location"] = arenas["turret_location"][index].tolist()
+        game_params["turret"]["start_angle"] = float(arenas["turret_angle"][index])
+
+        return game_params
+
+    def build(self, arenas: Arenas, index: int) -> Tuple[Parameters, History]:
+        """Convert a single arena into Parameters and a starting History."""
+
+        time = self.base_params["time"]
+        rocket = self.base_params["rocket"]
+        turret = self.base_params["turret"]
+
+        obstacles = [
+            ObstacleParameters(Coordinate(location), radius)
+            for location, radius in zip(
+                arenas["obstacle_locations"][index].tolist(),
+                arenas["obstacle_radii"][index].tolist(),
+            )
+        ]
+
+        parameters = Parameters(
+            EnvironmentParameters(self.width, self.height, obstacles),
+            TimeParameters(
+                time["timestep"],
+                time["max_game_time"],
+                time.get("integrator", SEMI_IMPLICIT_EULER),
+                time.get("continuous_collisions", False),
+            ),
+            RocketParameters(
+                rocket["mass"],
+                rocket["length"],
+                rocket["max_main_engine_force"],
+                rocket["max_thruster_force"],
+            ),
+            TurretParameters(
+                turret["radius"],
+                Coordinate(arenas["turret_location"][index].tolist()),
+                turret["max_rotation_speed"],
+                turret["projectile_speed"],
+                turret["min_firing_interval"],
+            ),
+        )
+        history = History(
+            RocketHistory(
+                [Coordinate(arenas["rocket_location"][index].tolist())],
+                [float(arenas["rocket_angle"][index])],
+            ),
+            TurretHistory([float(arenas["turret_angle"][index])]),
+        )
+
+        return parameters, history
+
+    def generate(self, n: int) -> Iterator[Tuple[Parameters, History]]:
+
+        arenas = self.generate_arenas(n)
+
+        for index in range(n):
+            yield self.build(arenas, index)
+
+    def write_jsonl(self, n: int, path: str):
+
+        arenas = self.generate_arenas(n)
+
+        with open(path, "w") as f:
+            for index in range(n):
+                f.write(json.dumps(self.game_params(arenas, index)) + "\n")
+
+
+if __name__ == "__main__":
+    narenas, seed, arenas_path = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+    with open(GAME_PARAMETERS_PATH) as f:
+        base_params = json.load(f)
+    ScenarioGenerator(base_params, seed=seed).write_jsonl(narenas, arenas_path)
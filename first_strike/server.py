@@ -0,0 +1,341 @@
+"""Local match server: play games for controller authors over a socket.
+
+Clients connect over TCP on localhost (or a Unix socket) and exchange JSON
+Lines. Each request line asks for a match:
+
+    {"id": "a", "scenario": {...game parameters...}, "rocket": "player",
+     "turret": "default", "stream": true, "early_resolution": false}
+
+scenario is a full set of game parameters, as in game_parameters.json; if
+omitted, game_parameters.json is used. rocket and turret name the active
+controllers, as in a tournament matchup. With stream, the state after every
+tick is sent back in batches as the game is played:
+
+    {"id": "a", "event": "ticks", "ticks": [{"tick": 1, "time": ..., ...}, ...]}
+
+Every match ends with exactly one of:
+
+    {"id": "a", "event": "result", "cause": ..., "winner": ..., "ticks": ..., ...}
+    {"id": "a", "event": "cancelled"}
+    {"id": "a", "event": "error", "message": "..."}
+
+A match is cancelled by sending {"cancel": "a"}, or by disconnecting.
+
+Games are played headless, in determinism mode, in a bounded process pool.
+The worker processes stay up between games, with the controller modules
+imported and the scenarios they have validated cached (see GameRuntime), so
+each game only pays for playing it.
+
+Usage: python first_strike/server.py [port] [max_workers]
+"""
+
+import asyncio
+import json
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from game_parameters import _read_game_parameters
+from headless import summarise_game
+from history import History
+from worker_pool import PRELOADED_MODULES, _init_worker, runtime
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def tick_state(tick: int, history: History) -> Dict[str, Any]:
+    """The state of a game after a tick, as sent to clients."""
+
+    rocket = history.rocket
+    turret = history.turret
+
+    return {
+        "tick": tick,
+        "time": history.time,
+        "rocket_location": list(rocket.location),
+        "rocket_angle": rocket.angle,
+        "turret_angle": turret.angle,
+        "projectiles": [
+            [projectile.firing_angle, projectile.launch_time]
+            for projectile in history.active_projectiles
+        ],
+    }
+
+
+def run_match(
+    game_params: Optional[dict],
+    rocket: str,
+    turret: str,
+    early_resolution: bool = False,
+    ticks=None,
+    cancel=None,
+    batch_size: int = 20,
+) -> Dict[str, Any]:
+    """Play a match in a worker process.
+
+    The controllers are only resolved here, so a dotted path sent by a client
+    is never imported by the server itself. If they, or the scenario, can't be
+    loaded, the error is raised to be sent back to the client.
+
+    Arguments
+    ----------
+    game_params: Game parameters of the scenario; game_parameters.json if None.
+    rocket: Active rocket controller.
+    turret: Active turret controller.
+    early_resolution: Stop the game as soon as its outcome is certain.
+    ticks: Queue to put batches of tick states on as the game is played; the
+        batches end with None. Not streamed if None.
+    cancel: Event that stops the game when set.
+    batch_size: Ticks between each batch of tick states and cancellation check.
+
+    Return
+    ----------
+    outcome: Summary of the game, as played in a tournament; or
+        {"cancelled": True} if it was cancelled.
+    """
+
+    batch = []
+    try:
+        if game_params is None:
+            game_params = _read_game_parameters()
+        headless = runtime().new_game(game_params, (rocket, turret), early_resolution)
+
+        while not headless.result.winner:
+            headless.step()
+            if ticks is not None:
+                batch.append(tick_state(headless.movement.tick, headless.history))
+            if headless.movement.tick % batch_size == 0:
+                if batch:
+                    ticks.put(batch)
+                    batch = []
+                if cancel is not None and cancel.is_set():
+                    return {"cancelled": True}
+        if batch:
+            ticks.put(batch)
+    finally:
+        if ticks is not None:
+            ticks.put(None)
+
+    return summarise_game(headless)
+
+
+class MatchServer:
+    """Serve matches to clients on localhost.
+
+    Attributes
+    ----------
+    host: Address to listen on; localhost only by default.
+    port: TCP port to listen on.
+    unix_path: Path of a Unix socket to listen on instead of TCP.
+    max_workers: Maximum number of games played at once.
+    batch_size: Ticks sent in each streamed batch.
+
+    Methods
+    ----------
+    start: Start the worker processes and listen for clients.
+    serve_forever: Start, and serve clients until cancelled.
+    close: Stop listening and shut down the worker processes.
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        unix_path: str = None,
+        max_workers: int = None,
+        batch_size: int = 20,
+    ):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.manager = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.clients = set()
+
+    async def start(self):
+
+        self.executor = ProcessPoolExecutor(
+            self.max_workers, initializer=_init_worker, initargs=(PRELOADED_MODULES,)
+        )
+        # Proxies to the manager's queues and events can be sent to the workers
+        self.manager = multiprocessing.Manager()
+
+        if self.unix_path:
+            self.server = await asyncio.start_unix_server(
+                self._handle_client, self.unix_path
+            )
+        else:
+            self.server = await asyncio.start_server(
+                self._handle_client, self.host, self.port
+            )
+            self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+
+        if self.server is not None:
+            self.server.close()
+            for client in list(self.clients):
+                client.cancel()
+            await asyncio.gather(*self.clients, return_exceptions=True)
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.manager is not None:
+            self.manager.shutdown()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+
+        client = asyncio.current_task()
+        self.clients.add(client)
+        matches: Dict[Any, asyncio.Task] = {}
+
+        async def send(message: Dict[str, Any]):
+            if not writer.is_closing():
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            async for line in reader:
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as error:
+                    await send({"id": None, "event": "error", "message": str(error)})
+                    continue
+                if not isinstance(request, dict):
+                    await send(
+                        {
+                            "id": None,
+                            "event": "error",
+                            "message": "A request must be a JSON object",
+                        }
+                    )
+                    continue
+
+                if "cancel" in request:
+                    match = matches.get(request["cancel"])
+                    if match is not None:
+                        match.cancel()
+                    continue
+
+                match_id = request.get("id")
+                if match_id in matches:
+                    await send(
+                        {
+                            "id": match_id,
+                            "event": "error",
+                            "message": "A match with this id is already running",
+                        }
+                    )
+                    continue
+
+                task = asyncio.create_task(self._play(request, send))
+                matches[match_id] = task
+                task.add_done_callback(lambda _, key=match_id: matches.pop(key, None))
+        except asyncio.CancelledError:
+            pass  # The server is closing
+        finally:
+            # Nothing is left to send the results of a disconnected client's games to
+            for match in list(matches.values()):
+                match.cancel()
+            await asyncio.gather(*matches.values(), return_exceptions=True)
+            writer.close()
+            self.clients.discard(client)
+
+    async def _play(self, request: Dict[str, Any], send):
+
+        match_id = request.get("id")
+        rocket = request.get("rocket", "default")
+        turret = request.get("turret", "default")
+        loop = asyncio.get_running_loop()
+        ticks = self.manager.Queue() if request.get("stream") else None
+        cancel = self.manager.Event()
+        future = self.executor.submit(
+            run_match,
+            request.get("scenario"),
+            rocket,
+            turret,
+            bool(request.get("early_resolution", False)),
+            ticks,
+            cancel,
+            self.batch_size,
+        )
+
+        try:
+            if ticks is not None:
+                while True:
+                    batch: List[dict] = await loop.run_in_executor(None, ticks.get)
+                    if batch is None:
+                        break
+                    await send({"id": match_id, "event": "ticks", "ticks": batch})
+            outcome = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            cancel.set()
+            future.cancel()
+            if ticks is not None:
+                ticks.put(None)  # Frees the thread waiting on the queue
+            await send({"id": match_id, "event": "cancelled"})
+            raise
+        except Exception as error:
+            await send({"id": match_id, "event": "error", "message": repr(error)})
+            return
+
+        if outcome.get("cancelled"):
+            await send({"id": match_id, "event": "cancelled"})
+        else:
+            await send({"id": match_id, "event": "result", **outcome})
+
+
+async def request_matches(
+    requests: List[Dict[str, Any]],
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+):
+    """Send match requests to a server, yielding each message sent back.
+
+    Stops once every match has ended.
+    """
+
+    reader, writer = await asyncio.open_connection(host, port)
+    for request in requests:
+        writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+
+    pending = {request.get("id") for request in requests}
+    try:
+        while pending:
+            line = await reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if message["event"] in ("result", "cancelled", "error"):
+                pending.discard(message["id"])
+            yield message
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    server = MatchServer(port=port, max_workers=max_workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,183 @@
+"""Precomputed geometry of the shadows cast by obstacles, with the turret as the light source.
+
+The turret and obstacles never move, so everything here is built once per game.
+A point is in an obstacle's shadow if a projectile fired from the turret towards
+the point would hit the obstacle first.
+"""
+
+import math
+from functools import cached_property
+from typing import List, Optional, Tuple
+
+from math_helpers import Coordinate, Line, normalise_angle
+from parameters import ObstacleParameters, Parameters
+
+
+class ObstacleShadow:
+    """The shadow cast by a single obstacle.
+
+    Attributes
+    ----------
+    obstacle: The obstacle casting the shadow.
+    turret_location: The location of the turret.
+    line2turret: Line through the obstacle and turret centres.
+    dist2turret (m): Distance from the obstacle to the turret.
+    angle_from_turret (rad): Angle from the turret to the obstacle.
+    half_angle (rad): Half of the angle subtended by the obstacle at the turret.
+    edge_gradients: Gradients of the two shadow edges (tangents from the turret to the obstacle).
+    edge_lines: The two shadow edges.
+
+    Methods
+    ----------
+    angular_offset: Angle of a point from the centre line of the shadow, as seen from the turret.
+    entry_distance: Distance from the turret at which a ray first hits the obstacle.
+    contains: Is a point in the shadow.
+    """
+
+    def __init__(self, obstacle: ObstacleParameters, turret_location: Coordinate):
+        self.obstacle = obstacle
+        self.turret_location = turret_location
+        self.dist2turret = obstacle.location.distance2(turret_location)
+        self.angle_from_turret = (obstacle.location - turret_location).angle
+        self.half_angle = math.asin(min(1.0, obstacle.radius / self.dist2turret))
+
+    @cached_property
+    def line2turret(self) -> Line:
+        # Only built when used: it can't be, for an obstacle directly above or below
+        # the turret (the line is vertical)
+        return Line.calculate_line(self.obstacle.location, self.turret_location)
+
+    @cached_property
+    def edge_gradients(self) -> Tuple[float, float]:
+
+        dx = self.turret_location.x - self.obstacle.location.x
+        dy = self.turret_location.y - self.obstacle.location.y
+        a = self.obstacle.radius ** 2 - dx ** 2
+        b = 2 * dx * dy
+        c = self.obstacle.radius ** 2 - dy ** 2
+
+        neg_b = -b
+        sqrt_det = math.sqrt(b ** 2 - 4 * a * c)
+        denom = 2 * a
+
+        return ((neg_b + sqrt_det) / denom, (neg_b - sqrt_det) / denom)
+
+    @cached_property
+    def edge_lines(self) -> Tuple[Line, Line]:
+
+        return tuple(
+            Line(gradient, Line.calculate_y_intercept(gradient, self.turret_location))
+            for gradient in self.edge_gradients
+        )
+
+    def angular_offset(self, point: Coordinate) -> float:
+
+        return normalise_angle(
+            (point - self.turret_location).angle - self.angle_from_turret
+        )
+
+    def entry_distance(self, angle: float) -> Optional[float]:
+        """Distance from the turret at which a ray at angle first hits the obstacle.
+
+        None if the ray misses the obstacle.
+        """
+
+        offset = normalise_angle(angle - self.angle_from_turret)
+        if abs(offset) > self.half_angle:
+            return None
+
+        d_sin = self.dist2turret * math.sin(offset)
+        return self.dist2turret * math.cos(offset) - math.sqrt(
+            max(0.0, self.obstacle.radius ** 2 - d_sin ** 2)
+        )
+
+    def contains(self, point: Coordinate) -> bool:
+
+        entry_distance = self.entry_distance((point - self.turret_location).angle)
+        if entry_distance is None:
+            return False
+
+        return point.distance2(self.turret_location) >= entry_distance
+
+
+class ShadowMap:
+    """Shadows of every obstacle, indexed by angle around the turret.
+
+    The circle around the turret is divided into equal angular bins, and each
+    bin lists the shadows that overlap it. Finding the shadows that could
+    contain a point is then a single table lookup.
+
+    Methods
+    ----------
+    bin_index: Index of the bin containing an angle.
+    shadows_at_angle: Shadows that overlap the bin containing an angle.
+    obstacles_shadowing: Obstacles whose shadow contains a point.
+    in_shadow: Is a point in the shadow of any obstacle.
+    closest_shadow: The shadow with the smallest angular distance from a point.
+    """
+
+    def __init__(self, parameters: Parameters, nbins: int = 360):
+        self.turret_location = parameters.turret.location
+        self.shadows: List[ObstacleShadow] = [
+            ObstacleShadow(obstacle, self.turret_location)
+            for obstacle in parameters.environment.obstacles
+        ]
+        self.nbins = nbins
+        self.bin_width = 2 * math.pi / nbins
+        self.bins: List[List[ObstacleShadow]] = [[] for _ in range(nbins)]
+
+        for shadow in self.shadows:
+            start = self.bin_index(shadow.angle_from_turret - shadow.half_angle)
+            nbins_spanned = int(2 * shadow.half_angle / self.bin_width) + 2
+            for i in range(min(nbins_spanned, nbins)):
+                self.bins[(start + i) % nbins].append(shadow)
+
+    def bin_index(self, angle: float) -> int:
+
+        return int((normalise_angle(angle) + math.pi) / self.bin_width) % self.nbins
+
+    def shadows_at_angle(self, angle: float) -> List[ObstacleShadow]:
+
+        return self.bins[self.bin_index(angle)]
+
+    def obstacles_shadowing(self, point: Coordinate) -> List[ObstacleParameters]:
+
+        angle = (point - self.turret_location).angle
+
+        return [
+            shadow.obstacle
+            for shadow in self.shadows_at_angle(angle)
+            if shadow.contains(point)
+        ]
+
+    def in_shadow(self, point: Coordinate) -> bool:
+
+        angle = (point - self.turret_location).angle
+
+        return any(shadow.contains(point) for shadow in self.shadows_at_angle(angle))
+
+    def closest_shadow(
+        self, point: Coordinate
+    ) -> Optional[Tuple[ObstacleShadow, float]]:
+        """The shadow with the smallest angular distance from a point.
+
+        Return
+        ----------
+        shadow: The closest shadow; None if there are no obstacles.
+        angular_distance (rad): Angle the point would need to move around the turret
+            to enter the shadow; 0 if already within the angular span.
+        """
+
+        if not self.shadows:
+            return None
+
+        return min(
+            (
+                (
+                    shadow,
+                    max(0.0, abs(shadow.angular_offset(point)) - shadow.half_angle),
+                )
+                for shadow in self.shadows
+            ),
+            key=lambda output: output[1],
+        )
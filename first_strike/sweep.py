@@ -0,0 +1,258 @@
+"""Play a grid of scenarios derived from a base set of game parameters.
+
+Each axis of the sweep is a dotted path into the game parameters JSON
+(eg: "turret.projectile_speed" or "environment.obstacles") paired with the values
+to try. The default rocket's direction weights and controller gains can be
+swept in the same way, under "rocket_weights" and "rocket_gains"
+(eg: "rocket_weights.turret_attraction" or "rocket_gains.p_c"); they are only
+given to the rocket if set, so other rockets can be swept too. The grid is
+either the full cartesian product of the axes, or a latin hypercube sample over
+(lower, upper) ranges.
+
+A scenario that fails validation, or whose game raises, is written as a row
+with the error instead of the outcome, so the rest of the sweep is kept.
+
+Usage: python first_strike/sweep.py sweep.json results.csv
+Where sweep.json is of the form:
+    {
+        "base": "first_strike/game_parameters.json",
+        "mode": "cartesian",
+        "axes": {"turret.projectile_speed": [40.0, 60.0, 80.0]}
+    }
+"""
+
+import copy
+import csv
+import itertools
+import json
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from default_controllers.rocket_controller import ControlGains, DirectionWeights
+from game_parameters import GAME_PARAMETERS_PATH, build_game_parameters
+from headless import play_headless
+from result import CAUSE2WINNER
+
+CARTESIAN = "cartesian"
+LATIN_HYPERCUBE = "latin_hypercube"
+ROCKET_WEIGHTS = "rocket_weights"
+ROCKET_GAINS = "rocket_gains"
+
+ROCKET_OPTIONS = {ROCKET_WEIGHTS: DirectionWeights, ROCKET_GAINS: ControlGains}
+
+OUTCOME_FIELDS = ("cause", "winner", "game_time", "projectiles_fired", "error")
+
+Point = Dict[str, Any]
+
+
+def set_by_path(game_params: dict, path: str, value: Any):
+    """Set a value in the nested game parameters using a dotted path.
+
+    Arguments
+    ----------
+    game_params: Game parameters as read from the JSON file.
+    path: Dotted path to the value, eg: "rocket.max_main_engine_force"; or to a
+        default rocket option, eg: "rocket_gains.p_c".
+    value: The value to set.
+    """
+
+    section, _, name = path.partition(".")
+    if section in ROCKET_OPTIONS:
+        if name not in (field.name for field in fields(ROCKET_OPTIONS[section])):
+            raise KeyError(f"{path} is not a default rocket option")
+        game_params.setdefault(section, {})[name] = value
+        return
+
+    *parents, key = path.split(".")
+    node = game_params
+    for parent in parents:
+        node = node[parent]
+
+    if key not in node:
+        raise KeyError(f"{path} is not a game parameter")
+
+    node[key] = value
+
+
+def cartesian_grid(axes: Dict[str, Sequence]) -> Iterator[Point]:
+    """Every combination of the values along each axis."""
+
+    paths = list(axes)
+    for values in itertools.product(*(axes[path] for path in paths)):
+        yield dict(zip(paths, values))
+
+
+def latin_hypercube_grid(
+    axes: Dict[str, Tuple[float, float]], nsamples: int, seed: int = None
+) -> Iterator[Point]:
+    """A latin hypercube sample of the (lower, upper) range along each axis.
+
+    Each axis range is split into nsamples equal strata; every stratum of every
+    axis is sampled exactly once.
+    """
+
+    if nsamples <= 0:
+        return
+
+    rng = random.Random(seed)
+
+    columns = {}
+    for path, (lower, upper) in axes.items():
+        stride = (upper - lower) / nsamples
+        strata = list(range(nsamples))
+        rng.shuffle(strata)
+        columns[path] = [lower + (s + rng.random()) * stride for s in strata]
+
+    for i in range(nsamples):
+        yield {path: column[i] for path, column in columns.items()}
+
+
+def expand_grid(
+    base_params: dict, points: Iterator[Point]
+) -> Iterator[Tuple[Point, dict]]:
+
+    for point in points:
+        game_params = copy.deepcopy(base_params)
+        for path, value in point.items():
+            set_by_path(game_params, path, value)
+        yield point, game_params
+
+
+def play_scenario(game_params: dict) -> Dict[str, Any]:
+    """Validate and play a single scenario, returning a summary of the outcome.
+
+    The optional "rocket_weights" and "rocket_gains" entries set the default
+    rocket's direction weights and controller gains for this scenario only.
+    Without them, the rocket is created as in any other game. If the scenario
+    is invalid or the game raises, only the error is returned, as its repr.
+    """
+
+    outcome = dict.fromkeys(OUTCOME_FIELDS)
+    try:
+        weights = game_params.get(ROCKET_WEIGHTS)
+        gains = game_params.get(ROCKET_GAINS)
+        rocket_options = {}
+        if weights is not None:
+            rocket_options["weights"] = DirectionWeights(**weights)
+        if gains is not None:
+            rocket_options["gains"] = ControlGains(**gains)
+        controller_parameters, _, parameters, history = build_game_parameters(
+            game_params
+        )
+
+        result = play_headless(
+            controller_parameters, parameters, history, rocket_options=rocket_options
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        outcome["error"] = repr(error)
+        return outcome
+
+    outcome.update(
+        cause=result.cause,
+        winner=CAUSE2WINNER[result.cause],
+        game_time=history.time,
+        projectiles_fired=len(history.projectiles),
+    )
+
+    return outcome
+
+
+class Sweep:
+    """A parameter sweep over a base scenario.
+
+    Attributes
+    ----------
+    base_params: Game parameters that every scenario starts from.
+    axes: Dotted parameter paths and the values (or ranges) to vary them over.
+    mode: Either "cartesian" or "latin_hypercube".
+    nsamples: Number of samples (may be 0); only used for latin hypercube sweeps.
+    seed: Seed for the latin hypercube sample.
+
+    Methods
+    ----------
+    points: The parameter values of each scenario in the sweep.
+    run: Play every scenario, in parallel, and return a row per scenario.
+    write_csv: Write the rows from run to a CSV file, with a column per axis
+        and per outcome field.
+    """
+
+    def __init__(
+        self,
+        base_params: dict,
+        axes: Dict[str, Sequence],
+        mode: str = CARTESIAN,
+        nsamples: int = None,
+        seed: int = None,
+    ):
+        if mode not in (CARTESIAN, LATIN_HYPERCUBE):
+            raise ValueError(f"mode must be one of {(CARTESIAN, LATIN_HYPERCUBE)}")
+        if mode == LATIN_HYPERCUBE and nsamples is None:
+            raise ValueError("A latin hypercube sweep requires nsamples")
+
+        self.base_params = base_params
+        self.axes = axes
+        self.mode = mode
+        self.nsamples = nsamples
+        self.seed = seed
+
+    def points(self) -> List[Point]:
+
+        if self.mode == CARTESIAN:
+            return list(cartesian_grid(self.axes))
+
+        return list(latin_hypercube_grid(self.axes, self.nsamples, self.seed))
+
+    def run(self, max_workers: int = None) -> List[Dict[str, Any]]:
+
+        grid = list(expand_grid(self.base_params, self.points()))
+        if not grid:
+            return []
+
+        points, scenarios = zip(*grid)
+
+        with ProcessPoolExecutor(max_workers) as executor:
+            outcomes = executor.map(play_scenario, scenarios)
+
+            return [{**point, **outcome} for point, outcome in zip(points, outcomes)]
+
+    def write_csv(self, rows: List[Dict[str, Any]], path: str):
+
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=[*self.axes, *OUTCOME_FIELDS])
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(
+                    {
+                        key: json.dumps(value) if isinstance(value, list) else value
+                        for key, value in row.items()
+                    }
+                )
+
+    @classmethod
+    def from_json(cls, path: str) -> "Sweep":
+
+        with open(path) as f:
+            spec = json.load(f)
+
+        with open(spec.get("base", GAME_PARAMETERS_PATH)) as f:
+            base_params = json.load(f)
+
+        return cls(
+            base_params,
+            spec["axes"],
+            spec.get("mode", CARTESIAN),
+            spec.get("nsamples"),
+            spec.get("seed"),
+        )
+
+
+if __name__ == "__main__":
+    sweep_path, results_path = sys.argv[1:3]
+    sweep = Sweep.from_json(sweep_path)
+    rows = sweep.run()
+    if not rows:
+        print("No scenarios in the sweep")
+    sweep.write_csv(rows, results_path)
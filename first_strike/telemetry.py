@@ -0,0 +1,242 @@
+"""Per-tick telemetry of a game, streamed to a sink as it is played.
+
+When a game is given a Telemetry, a compact record is made after every tick
+that the objects move:
+
+    {"tick": 12, "time": 0.12, "rocket": [x, y, angle], "velocity": [vx, vy, w],
+     "engine_forces": [main, lf, lr, rf, rr], "turret_angle": ..., "projectiles": 3,
+     "controller_times": [rocket, turret], "phase_times": [controllers, movement]}
+
+controller_times are how long each controller took to calculate its inputs
+(0 if it held its inputs), and phase_times how long processing the inputs and
+moving the objects took; all in seconds of wall clock time.
+
+Records are gathered into batches, and the batches handed to a background thread
+that writes them to the sink. The game never waits on the sink: if the sink
+falls behind and max_pending batches are waiting, new batches are dropped (and
+counted) instead. Closing waits for the sink at most as long as it is told to.
+"""
+
+import json
+import queue
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from history import History
+
+Record = Dict[str, Any]
+
+
+class Sink(ABC):
+    """Somewhere to write batches of telemetry records.
+
+    Methods
+    ----------
+    write: Write a batch of records.
+    close: Release anything held by the sink.
+    """
+
+    @abstractmethod
+    def write(self, batch: List[Record]):
+        pass
+
+    def close(self):
+
+        pass
+
+
+class FileSink(Sink):
+    """Append records to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "a")
+
+    def write(self, batch: List[Record]):
+
+        self.file.write("".join(json.dumps(record) + "\n" for record in batch))
+        self.file.flush()
+
+    def close(self):
+
+        self.file.close()
+
+
+class UnixSocketSink(Sink):
+    """Send records to a listener on a Unix socket, one JSON object per line.
+
+    If the listener goes away, or stops reading for longer than timeout
+    seconds, the remaining records are discarded.
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        self.socket.connect(path)
+
+    def write(self, batch: List[Record]):
+
+        if self.socket is None:
+            return
+
+        data = "".join(json.dumps(record) + "\n" for record in batch).encode()
+        try:
+            self.socket.sendall(data)
+        except OSError:
+            self.close()
+
+    def close(self):
+
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+
+
+class QueueSink(Sink):
+    """Keep batches of records in memory, for a reader in the same process.
+
+    Once maxsize batches are waiting to be read, the oldest are discarded.
+
+    Attributes
+    ----------
+    batches: Batches of records, oldest first.
+    """
+
+    def __init__(self, maxsize: int = 100):
+        self.batches: queue.Queue = queue.Queue(maxsize)
+
+    def write(self, batch: List[Record]):
+
+        while True:
+            try:
+                self.batches.put_nowait(batch)
+                return
+            except queue.Full:
+                try:
+                    self.batches.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class Telemetry:
+    """Records the state of a game after every tick and streams it to a sink.
+
+    Attributes
+    ----------
+    sink: Where the records are written.
+    batch_size: Records in each batch handed to the sink.
+    max_pending: Batches that can wait for the sink before new ones are dropped.
+    records: Number of records made.
+    dropped: Number of records dropped because the sink fell behind or failed.
+
+    Methods
+    ----------
+    controllers_processed: Note how long the controllers took this tick.
+    objects_moved: Make the record of a tick, once the objects have moved.
+    flush: Hand the records not yet in a batch to the sink.
+    close: Flush, give the sink up to a timeout to write everything, then close it.
+    """
+
+    def __init__(self, sink: Sink, batch_size: int = 100, max_pending: int = 100):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.records = 0
+        # Each only counted by one thread, so neither needs a lock
+        self._dropped_behind = 0
+        self._dropped_failed = 0
+        self._batch: List[Record] = []
+        self._controller_times = [0.0, 0.0]
+        self._controllers_phase_time = 0.0
+        self._pending: queue.Queue = queue.Queue(max_pending)
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def _write(self):
+
+        while True:
+            batch = self._pending.get()
+            if batch is None:
+                return
+            try:
+                self.sink.write(batch)
+            except Exception:  # pylint: disable=broad-except
+                # A broken sink mustn't stop the game; later batches are still tried
+                self._dropped_failed += len(batch)
+
+    @property
+    def dropped(self) -> int:
+
+        return self._dropped_behind + self._dropped_failed
+
+    def controllers_processed(
+        self, rocket_time: float, turret_time: float, phase_time: float
+    ):
+
+        self._controller_times = [rocket_time, turret_time]
+        self._controllers_phase_time = phase_time
+
+    def objects_moved(self, tick: int, history: History, phase_time: float):
+
+        rocket = history.rocket
+        location = rocket.location
+        velocity = rocket.velocity
+
+        self._batch.append(
+            {
+                "tick": tick,
+                "time": history.time,
+                "rocket": [location.x, location.y, rocket.angle],
+                "velocity": [velocity.x, velocity.y, rocket.angular_velocity],
+                "engine_forces": list(rocket.engine_forces),
+                "turret_angle": history.turret.angle,
+                "projectiles": len(history.live_projectiles),
+                "controller_times": self._controller_times,
+                "phase_times": [self._controllers_phase_time, phase_time],
+            }
+        )
+        self.records += 1
+        self._controller_times = [0.0, 0.0]
+        self._controllers_phase_time = 0.0
+
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+
+        if not self._batch:
+            return
+
+        try:
+            self._pending.put_nowait(self._batch)
+        except queue.Full:
+            self._dropped_behind += len(self._batch)
+        self._batch = []
+
+    def close(self, timeout: Optional[float] = None):
+        """Flush, then wait up to timeout seconds (forever if None) for the sink.
+
+        Batches the sink hasn't written by then are discarded.
+        """
+
+        self.flush()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._pending.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        else:
+            self._writer.join(
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+        self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -0,0 +1,182 @@
+"""Play every matchup of rocket and turret controllers across a set of scenarios.
+
+Games are played headless, in determinism mode, in a pool of warm workers
+(see WorkerPool). When given a ResultStore, games whose controllers, scenario
+and engine are unchanged since they were last played are skipped and their
+stored outcome is used instead. With early resolution, games stop as soon as
+their outcome is certain; ticks and game_time are then those simulated, not
+those the full game would take.
+
+Only a summary of each game leaves the worker that played it. For tournaments
+too large to keep even a row per game, stream the rows into a TournamentStats
+(see aggregate), which keeps a fixed amount of statistics per matchup.
+"""
+
+import os
+from collections import deque
+from multiprocessing.pool import AsyncResult
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from controller_registry import ROCKET_CONTROLLERS, TURRET_CONTROLLERS
+from result_store import (
+    ResultStore,
+    engine_hash,
+    game_key,
+    scenario_hash,
+    source_hash,
+)
+from scenario_cache import Scenario
+from tournament_stats import TournamentStats
+from worker_pool import WorkerPool
+
+Matchup = Tuple[str, str]
+
+# Games started ahead of the oldest unfinished one per worker, so none sits idle
+GAMES_AHEAD_PER_WORKER = 4
+
+
+class Tournament:
+    """Every matchup played on every scenario.
+
+    Attributes
+    ----------
+    scenarios: The scenarios to play each matchup on.
+    matchups: Pairs of (rocket_active_controller, turret_active_controller);
+        registered names or dotted paths (see controller_registry).
+    store: Optional store of previous outcomes.
+    early_resolution: Stop each game as soon as its outcome is certain.
+
+    Methods
+    ----------
+    games: The matchup, scenario and hashes identifying every game.
+    run: Play every game not already in the store and return a row per game.
+    stream: As run, but yield each row as soon as it's ready, without keeping it.
+    aggregate: Fold every row into running statistics, without keeping the rows.
+    """
+
+    def __init__(
+        self,
+        scenarios: Sequence[Scenario],
+        matchups: Sequence[Matchup],
+        store: ResultStore = None,
+        early_resolution: bool = False,
+    ):
+        self.scenarios = scenarios
+        self.matchups = matchups
+        self.store = store
+        self.early_resolution = early_resolution
+
+    def games(self) -> Iterator[Tuple[Matchup, Scenario, Dict[str, str]]]:
+
+        engine = engine_hash(self.early_resolution)
+        # The active controllers are set by the matchup, not the scenario
+        scenario_hashes = [
+            scenario_hash(
+                scenario.controller_parameters[2:],
+                scenario.parameters,
+                scenario.history,
+            )
+            for scenario in self.scenarios
+        ]
+
+        for rocket, turret in self.matchups:
+            rocket_hash = source_hash(
+                ROCKET_CONTROLLERS[rocket], ROCKET_CONTROLLERS.options.get(rocket)
+            )
+            turret_hash = source_hash(
+                TURRET_CONTROLLERS[turret], TURRET_CONTROLLERS.options.get(turret)
+            )
+            for scenario, scenario_hash_ in zip(self.scenarios, scenario_hashes):
+                hashes = {
+                    "rocket_hash": rocket_hash,
+                    "turret_hash": turret_hash,
+                    "scenario_hash": scenario_hash_,
+                    "engine_hash": engine,
+                }
+                yield (rocket, turret), scenario, hashes
+
+    def _rows(
+        self, max_workers: int = None, time_controllers: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """A row per game, in order, from the store or played in a worker pool.
+
+        Each game is looked up in the store and, if it isn't there, started in
+        the pool only as it is reached, at most GAMES_AHEAD_PER_WORKER games per
+        worker ahead of the oldest unfinished one, so only that many rows are
+        held at once however many games there are. The pool is only started if
+        a game needs playing.
+        """
+
+        pool = None
+        games_ahead = GAMES_AHEAD_PER_WORKER * (max_workers or os.cpu_count() or 1)
+        waiting: Deque[tuple] = deque()
+        try:
+            for matchup, scenario, hashes in self.games():
+                key = game_key(*hashes.values())
+                row = {"rocket": matchup[0], "turret": matchup[1], "key": key}
+                outcome = self.store.get(key) if self.store else None
+                if outcome is None:
+                    if pool is None:
+                        pool = WorkerPool(max_workers, matchups=self.matchups)
+                    game = (scenario, matchup, self.early_resolution, time_controllers)
+                    waiting.append((row, hashes, pool.submit(game)))
+                else:
+                    row.update(outcome, cached=True)
+                    waiting.append((row, hashes, None))
+
+                while waiting and (
+                    waiting[0][2] is None
+                    or waiting[0][2].ready()
+                    or len(waiting) > games_ahead
+                ):
+                    yield self._finish(*waiting.popleft())
+
+            while waiting:
+                yield self._finish(*waiting.popleft())
+        finally:
+            if pool is not None:
+                pool.close()
+
+    def _finish(
+        self, row: Dict[str, Any], hashes: Dict[str, str], result: Optional[AsyncResult]
+    ) -> Dict[str, Any]:
+        """Fill in the row of a played game once it has finished, and store it."""
+
+        if result is None:
+            return row
+
+        outcome = result.get()
+        controller_times = outcome.pop("controller_times", None)
+        row.update(outcome, cached=False)
+        if self.store:
+            self.store.put(row["key"], hashes, outcome)
+        if controller_times is not None:
+            row["controller_times"] = controller_times
+
+        return row
+
+    def run(self, max_workers: int = None) -> List[Dict[str, Any]]:
+
+        return list(self._rows(max_workers))
+
+    def stream(
+        self, max_workers: int = None, time_controllers: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """As run, but yield each row once its game and every game before it is done.
+
+        With time_controllers, the row of every game played (not those in the
+        store) has the ControllerTimes of the game, under controller_times.
+        """
+
+        yield from self._rows(max_workers, time_controllers)
+
+    def aggregate(
+        self, max_workers: int = None, stats: TournamentStats = None
+    ) -> TournamentStats:
+        """Statistics of every game, adding to stats if given."""
+
+        if stats is None:
+            stats = TournamentStats()
+        stats.extend(self.stream(max_workers, time_controllers=True))
+
+        return stats
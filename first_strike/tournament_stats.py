@@ -0,0 +1,300 @@
+"""Running statistics of a tournament, updated as each game finishes.
+
+Each game is folded into the statistics of its matchup and then forgotten, so
+a tournament of any length takes the same memory per matchup:
+
+    - Games won by each side, and the number ending by each cause.
+    - A histogram of game lengths, in fixed width bins of ticks.
+    - Percentiles of the time each controller took per tick, from a
+      log-bucketed histogram (see LogHistogram) with a bounded number of buckets.
+    - Elo ratings of every rocket and turret controller.
+"""
+
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import result
+from result import DRAW, ROCKET_WIN, TURRET_WIN
+
+CAUSES = (
+    "ROCKET_ERROR",
+    "TURRET_ERROR",
+    "BOTH_ERROR",
+    "ROCKET_TIME_EXCEEDED",
+    "TURRET_TIME_EXCEEDED",
+    "BOTH_TIME_EXCEEDED",
+    "ROCKET_TAMPERED",
+    "TURRET_TAMPERED",
+    "ROCKET_INPUT_INVALID",
+    "TURRET_INPUT_INVALID",
+    "BOTH_INPUT_INVALID",
+    "ROCKET_OUT_OF_BOUNDS",
+    "ROCKET_HIT_OBSTACLE",
+    "PROJECTILE_HIT_ROCKET",
+    "ROCKET_HIT_TURRET",
+    "BOTH_DESTROYED",
+    "GAME_TIME_EXCEEDED",
+)
+CAUSE_NAMES = {getattr(result, name): name for name in CAUSES}
+
+PERCENTILES = (50, 90, 99)
+
+
+class LogHistogram:
+    """Histogram of positive values in logarithmically sized buckets.
+
+    Every value is counted in the bucket (gamma^(i-1), gamma^i], so any
+    percentile is found to within a relative error, however many values are
+    added. Values up to min_value are counted as zero. If there are ever more
+    than max_buckets buckets, the smallest are merged, losing accuracy only at
+    the low end.
+
+    Attributes
+    ----------
+    relative_error: Accuracy of the percentiles, relative to their value.
+    max_buckets: Most buckets kept.
+    count: Number of values added.
+
+    Methods
+    ----------
+    add: Count a value.
+    merge: Count every value of another histogram with the same relative_error.
+    percentile: The value below which a percentage of the values lie.
+    """
+
+    def __init__(
+        self,
+        relative_error: float = 0.01,
+        max_buckets: int = 1024,
+        min_value: float = 1e-9,
+    ):
+        self.relative_error = relative_error
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self.count = 0
+        self.zero_count = 0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, value: float, count: int = 1):
+
+        self.count += count
+        if value <= self.min_value:
+            self.zero_count += count
+            return
+
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+
+        lowest, second = sorted(self.buckets)[:2]
+        self.buckets[second] += self.buckets.pop(lowest)
+
+    def merge(self, other: "LogHistogram"):
+
+        if other.gamma != self.gamma:
+            raise ValueError("Histograms have a different relative error")
+
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        while len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """The value below which a percentage (0 to 100) of the values lie.
+
+        None if no values have been added.
+        """
+
+        if not self.count:
+            return None
+
+        rank = percent / 100 * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket, within relative_error of every value in it
+                return 2 * self.gamma ** index / (self.gamma + 1)
+
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class ControllerTimes:
+    """Histograms of the time each controller took to calculate its inputs.
+
+    Takes the place of a Telemetry in a game (see Controllers), without
+    recording anything else. Ticks a controller held its inputs are not counted.
+
+    Attributes
+    ----------
+    rocket: Time the rocket controller took, per tick it ran (s).
+    turret: Time the turret controller took, per tick it ran (s).
+    """
+
+    def __init__(self):
+        self.rocket = LogHistogram()
+        self.turret = LogHistogram()
+
+    def controllers_processed(
+        self, rocket_time: float, turret_time: float, phase_time: float
+    ):
+
+        if rocket_time:
+            self.rocket.add(rocket_time)
+        if turret_time:
+            self.turret.add(turret_time)
+
+    def objects_moved(self, tick, history, phase_time: float):
+
+        pass
+
+
+class Elo:
+    """Elo ratings of the rocket and turret controllers.
+
+    Rockets are only rated against turrets, so the two sides share one scale.
+    A draw scores half a win to each side.
+
+    Attributes
+    ----------
+    k: Most a rating can move after a single game.
+    initial: Rating of a controller before its first game.
+    ratings: Rating of each ("rocket" or "turret", controller) played so far.
+    """
+
+    def __init__(self, k: float = 16, initial: float = 1500):
+        self.k = k
+        self.initial = initial
+        self.ratings: Dict[Tuple[str, str], float] = {}
+
+    def update(self, rocket: str, turret: str, winner: int):
+
+        rocket_rating = self.ratings.get(("rocket", rocket), self.initial)
+        turret_rating = self.ratings.get(("turret", turret), self.initial)
+
+        expected = 1 / (1 + 10 ** ((turret_rating - rocket_rating) / 400))
+        score = {ROCKET_WIN: 1.0, TURRET_WIN: 0.0, DRAW: 0.5}[winner]
+        change = self.k * (score - expected)
+
+        self.ratings[("rocket", rocket)] = rocket_rating + change
+        self.ratings[("turret", turret)] = turret_rating - change
+
+
+class MatchupStats:
+    """Running statistics of every game of one matchup.
+
+    Attributes
+    ----------
+    games: Number of games played.
+    wins: Number of games won by each winner (ROCKET_WIN, TURRET_WIN or DRAW).
+    causes: Number of games ended by each cause.
+    lengths: Number of games whose length in ticks is in each bin, by the
+        first tick of the bin.
+    length_bin: Ticks in each bin of lengths.
+    total_ticks: Ticks played over every game.
+    rocket_times: Time the rocket controller took per tick, over every timed game (s).
+    turret_times: Time the turret controller took per tick, over every timed game (s).
+    """
+
+    def __init__(self, length_bin: int = 50):
+        self.games = 0
+        self.wins: Counter = Counter()
+        self.causes: Counter = Counter()
+        self.lengths: Counter = Counter()
+        self.length_bin = length_bin
+        self.total_ticks = 0
+        self.rocket_times = LogHistogram()
+        self.turret_times = LogHistogram()
+
+    def add(self, row: Dict[str, Any]):
+
+        self.games += 1
+        self.wins[row["winner"]] += 1
+        self.causes[row["cause"]] += 1
+        self.lengths[row["ticks"] // self.length_bin * self.length_bin] += 1
+        self.total_ticks += row["ticks"]
+
+        times: Optional[ControllerTimes] = row.get("controller_times")
+        if times is not None:
+            self.rocket_times.merge(times.rocket)
+            self.turret_times.merge(times.turret)
+
+    def summary(self) -> Dict[str, Any]:
+
+        summary = {
+            "games": self.games,
+            "rocket_win_rate": self.wins[ROCKET_WIN] / self.games,
+            "turret_win_rate": self.wins[TURRET_WIN] / self.games,
+            "draw_rate": self.wins[DRAW] / self.games,
+            "mean_ticks": self.total_ticks / self.games,
+            "ticks_histogram": dict(sorted(self.lengths.items())),
+        }
+        for cause, count in sorted(self.causes.items()):
+            summary[f"{CAUSE_NAMES[cause]}_rate"] = count / self.games
+        for side, times in (
+            ("rocket", self.rocket_times),
+            ("turret", self.turret_times),
+        ):
+            for percent in PERCENTILES:
+                summary[f"{side}_time_p{percent}"] = times.percentile(percent)
+
+        return summary
+
+
+class TournamentStats:
+    """Running statistics of a tournament, by matchup.
+
+    Attributes
+    ----------
+    matchups: Statistics of each (rocket, turret) matchup.
+    elo: Ratings of every controller.
+    length_bin: Ticks in each bin of the game length histograms.
+
+    Methods
+    ----------
+    add: Fold in the row of a finished game, as made by Tournament.
+    extend: Fold in the rows of many games.
+    summary: A row of statistics per matchup.
+    """
+
+    def __init__(self, length_bin: int = 50, elo: Elo = None):
+        self.matchups: Dict[Tuple[str, str], MatchupStats] = {}
+        self.elo = Elo() if elo is None else elo
+        self.length_bin = length_bin
+
+    def add(self, row: Dict[str, Any]):
+
+        matchup = (row["rocket"], row["turret"])
+        stats = self.matchups.get(matchup)
+        if stats is None:
+            stats = self.matchups[matchup] = MatchupStats(self.length_bin)
+        stats.add(row)
+        self.elo.update(row["rocket"], row["turret"], row["winner"])
+
+    def extend(self, rows: Iterable[Dict[str, Any]]):
+
+        for row in rows:
+            self.add(row)
+
+    def summary(self) -> List[Dict[str, Any]]:
+
+        return [
+            {
+                "rocket": rocket,
+                "turret": turret,
+                "rocket_elo": self.elo.ratings[("rocket", rocket)],
+                "turret_elo": self.elo.ratings[("turret", turret)],
+                **stats.summary(),
+            }
+            for (rocket, turret), stats in self.matchups.items()
+        ]
@@ -0,0 +1,84 @@
+"""Precomputed line of fire from the turret to the first obstacle, for every firing angle.
+
+Every projectile travels in a straight line from the turret, so whether and where
+it hits an obstacle depends only on its firing angle. The circle around the turret
+is divided into angular bins; each bin stores the obstacles that could be hit at
+an angle within it and a lower bound on the distance to the first of them.
+
+Most queries are answered from the bin alone. Only when a distance falls past a
+bin's lower bound are the (few) obstacles in that bin checked exactly.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+from parameters import ObstacleParameters, Parameters
+from shadow_map import ObstacleShadow, ShadowMap
+
+
+class VisibilityTable:
+    """First obstacle along every line of fire from the turret.
+
+    Attributes
+    ----------
+    shadow_map: Angular index of the shadows cast by obstacles.
+    min_distances (m): Per bin, a lower bound on the distance from the turret
+        to the first obstacle hit by a ray at an angle within the bin; inf if
+        the bin is clear.
+
+    Methods
+    ----------
+    candidates: Obstacles that a ray at an angle could hit.
+    first_obstacle: Distance to and the first obstacle hit by a ray at an angle.
+    is_clear: Can a ray at an angle travel a distance without hitting an obstacle.
+    """
+
+    def __init__(self, parameters: Parameters, nbins: int = 720):
+        self.shadow_map = ShadowMap(parameters, nbins)
+        self.min_distances: List[float] = [
+            min(
+                (shadow.dist2turret - shadow.obstacle.radius for shadow in shadows),
+                default=math.inf,
+            )
+            for shadows in self.shadow_map.bins
+        ]
+
+    def candidates(self, angle: float) -> List[ObstacleShadow]:
+
+        return self.shadow_map.shadows_at_angle(angle)
+
+    def first_obstacle(
+        self, angle: float
+    ) -> Optional[Tuple[float, ObstacleParameters]]:
+        """Distance to and the first obstacle hit by a ray from the turret.
+
+        Arguments
+        ----------
+        angle (rad): Angle of the ray.
+
+        Return
+        ----------
+        distance (m): Distance from the turret to where the ray enters the obstacle.
+        obstacle: The obstacle.
+            None if the ray doesn't hit any obstacle.
+        """
+
+        first = None
+        for shadow in self.candidates(angle):
+            distance = shadow.entry_distance(angle)
+            if distance is None:
+                continue
+            if first is None or distance < first[0]:
+                first = distance, shadow.obstacle
+
+        return first
+
+    def is_clear(self, angle: float, distance: float) -> bool:
+        """Can a ray from the turret travel a distance without hitting an obstacle."""
+
+        if distance < self.min_distances[self.shadow_map.bin_index(angle)]:
+            return True
+
+        first = self.first_obstacle(angle)
+
+        return first is None or not first[0] < distance
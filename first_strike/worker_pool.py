@@ -0,0 +1,220 @@
+"""Pool of warm worker processes for playing many short games.
+
+Starting a game from scratch means importing the engine and the controller
+modules, then reading and validating the game parameters. Each worker here
+does that once: the engine and controllers are imported when the worker
+starts (or, for other controllers, the first time the worker plays them), each
+scenario is validated the first time the worker sees it, and the Parameters
+and History of a finished game are reset in place for the next game of the
+same scenario (see Scenario.reset_game). A game then costs only the time
+taken to play it.
+
+Workers are replaced after a number of games, so anything a controller leaks
+(memory, module state, open files) can't build up over a long run.
+"""
+
+import importlib
+import multiprocessing
+from multiprocessing.pool import AsyncResult
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+from controller_registry import ROCKET_CONTROLLERS, TURRET_CONTROLLERS
+from headless import Headless, new_game, summarise_game
+from history import History
+from parameters import Parameters
+from scenario_cache import Scenario, ScenarioCache
+from tournament_stats import ControllerTimes
+
+Matchup = Tuple[str, str]
+
+# Modules and (rocket, turret) controllers every worker imports when it starts
+PRELOADED_MODULES = (
+    "controllers",
+    "headless",
+    "meta_controller",
+    "result",
+)
+PRELOADED_MATCHUPS = (("default", "default"), ("player", "player"))
+
+
+class GameRuntime:
+    """Plays games in a worker, reusing the state of previous games.
+
+    Attributes
+    ----------
+    scenarios: Every scenario validated by this worker.
+    games_played: Number of games played by this worker.
+
+    Methods
+    ----------
+    new_game: Set up a game of a matchup on a scenario, ready to be stepped.
+    play: Play a game and return a summary of the outcome.
+    """
+
+    def __init__(self):
+        self.scenarios = ScenarioCache()
+        self.games_played = 0
+        # Parameters and history of the last game of each scenario
+        self._states: Dict[str, Tuple[Parameters, History]] = {}
+
+    def scenario(self, scenario) -> Scenario:
+        """The cached scenario, from a Scenario or its game parameters."""
+
+        if isinstance(scenario, Scenario):
+            return self.scenarios.scenarios.setdefault(scenario.key, scenario)
+
+        return self.scenarios.get(scenario)
+
+    def new_game(
+        self,
+        scenario,
+        matchup: Matchup,
+        early_resolution: bool = False,
+        telemetry=None,
+    ) -> Headless:
+
+        scenario = self.scenario(scenario)
+        state = self._states.get(scenario.key)
+        if state is None:
+            _, _, *state = scenario.new_game()
+        else:
+            state = scenario.reset_game(*state)
+        self._states[scenario.key] = tuple(state)
+
+        return new_game(
+            scenario, matchup, early_resolution, self._states[scenario.key], telemetry
+        )
+
+    def play(
+        self,
+        scenario,
+        matchup: Matchup,
+        early_resolution: bool = False,
+        time_controllers: bool = False,
+    ) -> Dict[str, Any]:
+        """Play a game and return a summary of the outcome.
+
+        With time_controllers, the summary also holds the ControllerTimes of the
+        game, under controller_times.
+        """
+
+        times = ControllerTimes() if time_controllers else None
+        headless = self.new_game(scenario, matchup, early_resolution, times)
+        headless.run()
+        self.games_played += 1
+
+        outcome = summarise_game(headless)
+        if times is not None:
+            outcome["controller_times"] = times
+
+        return outcome
+
+
+_runtime: Optional[GameRuntime] = None
+
+
+def runtime() -> GameRuntime:
+    """The game runtime of this process, created on first use."""
+
+    global _runtime
+
+    if _runtime is None:
+        _runtime = GameRuntime()
+
+    return _runtime
+
+
+def _init_worker(
+    modules: Sequence[str], matchups: Sequence[Matchup] = PRELOADED_MATCHUPS
+):
+
+    for module in modules:
+        importlib.import_module(module)
+    for rocket, turret in matchups:
+        ROCKET_CONTROLLERS.get(rocket)
+        TURRET_CONTROLLERS.get(turret)
+    runtime()
+
+
+def _play(args):
+
+    return runtime().play(*args)
+
+
+class WorkerPool:
+    """Warm worker processes that play games.
+
+    Attributes
+    ----------
+    max_workers: Number of worker processes; one per CPU if None.
+    games_per_worker: Games each worker plays before it is replaced; never
+        replaced if None.
+    modules: Modules each worker imports when it starts.
+    matchups: Controllers each worker imports when it starts, as (rocket, turret)
+        names or dotted paths (see controller_registry).
+
+    Methods
+    ----------
+    play: Play a single game.
+    submit: Start playing a single game, without waiting for it.
+    map: Play games, returning their outcomes in order.
+    imap_unordered: Play games, yielding their outcomes as they finish.
+    close: Shut the workers down once their games are finished.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        games_per_worker: Optional[int] = 200,
+        modules: Sequence[str] = PRELOADED_MODULES,
+        matchups: Sequence[Matchup] = PRELOADED_MATCHUPS,
+    ):
+        self.max_workers = max_workers
+        self.games_per_worker = games_per_worker
+        self.modules = tuple(modules)
+        self.matchups = tuple(matchups)
+        self.pool = multiprocessing.Pool(
+            max_workers,
+            initializer=_init_worker,
+            initargs=(self.modules, self.matchups),
+            maxtasksperchild=games_per_worker,
+        )
+
+    def play(
+        self, scenario, matchup: Matchup, early_resolution: bool = False
+    ) -> Dict[str, Any]:
+
+        return self.pool.apply(_play, ((scenario, matchup, early_resolution),))
+
+    def submit(self, game: Tuple[Any, Matchup, bool]) -> AsyncResult:
+        """Start playing a game, given as to map; get its outcome from the result."""
+
+        return self.pool.apply_async(_play, (game,))
+
+    def map(
+        self, games: Iterable[Tuple[Any, Matchup, bool]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Outcome of each (scenario, matchup, early_resolution) game, in order.
+
+        A game can also be (scenario, matchup, early_resolution, time_controllers).
+        """
+
+        # One game per task, so games_per_worker counts games
+        return self.pool.imap(_play, games, chunksize=1)
+
+    def imap_unordered(
+        self, games: Iterable[Tuple[Any, Matchup, bool]]
+    ) -> Iterator[Dict[str, Any]]:
+
+        return self.pool.imap_unordered(_play, games, chunksize=1)
+
+    def close(self):
+
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The game's modules import each other by name, as when run from first_strike/
+GAME_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "first_strike")
+sys.path.insert(0, GAME_DIR)
@@ -0,0 +1,25 @@
+import copy
+import json
+import os
+
+from tests import GAME_DIR
+
+with open(os.path.join(GAME_DIR, "game_parameters.json")) as f:
+    GAME_PARAMETERS = json.load(f)
+
+
+def game_parameters(obstacles=(), **sections):
+    """The default game parameters, with other obstacles and sections updated.
+
+    eg: game_parameters([((50.0, 0.0), 5.0)], turret={"location": [0.0, 0.0]})
+    """
+
+    game_params = copy.deepcopy(GAME_PARAMETERS)
+    game_params["environment"]["obstacles"] = [
+        {"location": list(location), "radius": radius}
+        for location, radius in obstacles
+    ]
+    for section, values in sections.items():
+        game_params[section].update(values)
+
+    return game_params
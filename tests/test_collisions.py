@@ -0,0 +1,153 @@
+import math
+import unittest
+
+from tests.helpers import game_parameters
+
+from collisions import ContinuousCollisions, first_contact
+from game_parameters import build_game_parameters
+from history import ProjectileHistory
+from math_helpers import Coordinate
+
+
+class TestFirstContact(unittest.TestCase):
+    def test_already_touching(self):
+        fraction = first_contact(
+            Coordinate(0.0, 0.0),
+            Coordinate(10.0, 0.0),
+            Coordinate(1.0, 0.0),
+            Coordinate(1.0, 0.0),
+            2.0,
+        )
+        self.assertEqual(fraction, 0.0)
+
+    def test_passes_through_between_ticks(self):
+        # Moves from 20 m one side of b to 20 m the other; touches at 2 m away
+        fraction = first_contact(
+            Coordinate(-20.0, 0.0),
+            Coordinate(20.0, 0.0),
+            Coordinate(0.0, 0.0),
+            Coordinate(0.0, 0.0),
+            2.0,
+        )
+        self.assertAlmostEqual(fraction, 18 / 40)
+
+    def test_tangent(self):
+        # Grazes b at exactly the touching distance, half way through the sweep
+        fraction = first_contact(
+            Coordinate(-10.0, 2.0),
+            Coordinate(10.0, 2.0),
+            Coordinate(0.0, 0.0),
+            Coordinate(0.0, 0.0),
+            2.0,
+        )
+        self.assertAlmostEqual(fraction, 0.5)
+
+    def test_misses(self):
+        fraction = first_contact(
+            Coordinate(-10.0, 3.0),
+            Coordinate(10.0, 3.0),
+            Coordinate(0.0, 0.0),
+            Coordinate(0.0, 0.0),
+            2.0,
+        )
+        self.assertIsNone(fraction)
+
+    def test_parallel_motion(self):
+        # Same velocity, so the gap never changes
+        fraction = first_contact(
+            Coordinate(0.0, 0.0),
+            Coordinate(10.0, 0.0),
+            Coordinate(0.0, 5.0),
+            Coordinate(10.0, 5.0),
+            2.0,
+        )
+        self.assertIsNone(fraction)
+
+    def test_moving_apart(self):
+        fraction = first_contact(
+            Coordinate(3.0, 0.0),
+            Coordinate(10.0, 0.0),
+            Coordinate(0.0, 0.0),
+            Coordinate(-5.0, 0.0),
+            2.0,
+        )
+        self.assertIsNone(fraction)
+
+    def test_contact_after_the_sweep(self):
+        fraction = first_contact(
+            Coordinate(-20.0, 0.0),
+            Coordinate(-10.0, 0.0),
+            Coordinate(0.0, 0.0),
+            Coordinate(0.0, 0.0),
+            2.0,
+        )
+        self.assertIsNone(fraction)
+
+
+class TestContinuousCollisions(unittest.TestCase):
+    def setUp(self):
+        # A projectile travels 15 m per tick along the x axis from the turret
+        self.obstacle_location = (45.0, 0.0)
+        game_params = game_parameters(
+            [(self.obstacle_location, 1.0), ((0.0, -50.0), 5.0)],
+            turret={"location": [0.0, 0.0], "projectile_speed": 300.0},
+            rocket={"start_location": [0.0, 100.0]},
+        )
+        _, _, self.parameters, self.history = build_game_parameters(game_params)
+        self.collisions = ContinuousCollisions(self.parameters, self.history)
+        self.rocket_radius = self.parameters.rocket.target_radius
+
+    def test_rocket_hit_obstacle_between_ticks(self):
+        self.history.rocket.locations[:] = [
+            Coordinate(-20.0, -50.0),
+            Coordinate(20.0, -50.0),
+        ]
+
+        fraction = self.collisions.rocket_hit_obstacle()
+
+        self.assertAlmostEqual(fraction, (20 - 5 - self.rocket_radius) / 40)
+
+    def test_rocket_hit_turret_between_ticks(self):
+        self.history.rocket.locations[:] = [
+            Coordinate(-20.0, 0.0),
+            Coordinate(20.0, 0.0),
+        ]
+        turret_radius = self.parameters.turret.radius
+
+        fraction = self.collisions.rocket_hit_turret()
+
+        self.assertAlmostEqual(fraction, (20 - turret_radius - self.rocket_radius) / 40)
+
+    def test_projectile_hit_obstacle_between_ticks(self):
+        projectile = ProjectileHistory(0.0, 0.0, True)
+
+        # Sweeps from 40 m to 55 m, entering the obstacle at 44 m
+        fraction = self.collisions.projectile_hit_obstacle(projectile, 55 / 300)
+
+        self.assertAlmostEqual(fraction, 4 / 15)
+
+    def test_projectile_clear_of_obstacles(self):
+        projectile = ProjectileHistory(math.pi / 2, 0.0, True)
+
+        self.assertIsNone(self.collisions.projectile_hit_obstacle(projectile, 0.5))
+
+    def test_projectile_hit_rocket(self):
+        self.history.rocket.locations[:] = [Coordinate(0.0, 50.0)]
+        self.history.time = 55 / 300
+        projectile = ProjectileHistory(math.pi / 2, 0.0, True)
+
+        fraction = self.collisions.projectile_hit_rocket([projectile])
+
+        self.assertAlmostEqual(fraction, (10 - self.rocket_radius) / 15)
+
+    def test_projectile_stopped_by_obstacle_before_rocket(self):
+        # The rocket is behind the obstacle, both within a single sweep
+        self.history.rocket.locations[:] = [Coordinate(50.0, 0.0)]
+        self.history.time = 55 / 300
+        projectile = ProjectileHistory(0.0, 0.0, True)
+
+        self.assertIsNone(self.collisions.projectile_hit_rocket([projectile]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import copy
+import unittest
+
+from tests.helpers import GAME_PARAMETERS
+
+from headless import new_game
+from scenario_cache import ScenarioCache
+from scenario_generator import ScenarioGenerator
+
+
+class TestEarlyResolution(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        generator = ScenarioGenerator(
+            GAME_PARAMETERS,
+            obstacle_density=0.15,
+            min_obstacle_radius=3.0,
+            max_obstacle_radius=15.0,
+            seed=7,
+        )
+        arenas = generator.generate_arenas(40)
+        cache = ScenarioCache()
+        cls.scenarios = [
+            cache.get(generator.game_params(arenas, index)) for index in range(40)
+        ]
+
+    @staticmethod
+    def play(scenario, early_resolution):
+        """The cause a game ends with, or the error raised while playing it."""
+
+        headless = new_game(scenario, early_resolution=early_resolution)
+        try:
+            headless.run()
+        except Exception as error:  # pylint: disable=broad-except
+            return type(error), headless
+
+        return headless.result.cause, headless
+
+    def test_same_cause_as_full_play(self):
+        resolved_early = 0
+        for index, scenario in enumerate(self.scenarios):
+            played_cause, played = self.play(scenario, False)
+            resolved_cause, resolved = self.play(scenario, True)
+
+            self.assertEqual(resolved_cause, played_cause, index)
+            self.assertLessEqual(resolved.movement.tick, played.movement.tick)
+            resolved_early += resolved.ticks_skipped > 0
+
+        # Otherwise the comparison would prove nothing
+        self.assertGreater(resolved_early, 0)
+
+    def test_only_with_trusted_controllers(self):
+        scenario = self.scenarios[0]
+
+        self.assertIsNotNone(new_game(scenario, early_resolution=True).early_resolution)
+        for matchup in (("player", "default"), ("default", "player")):
+            headless = new_game(scenario, matchup, early_resolution=True)
+            self.assertIsNone(headless.early_resolution)
+
+    def test_not_with_execution_time_checked(self):
+        game_params = copy.deepcopy(GAME_PARAMETERS)
+        game_params["controllers"]["turret_check_execution_time"] = True
+        scenario = ScenarioCache().get(game_params)
+
+        self.assertIsNone(new_game(scenario, early_resolution=True).early_resolution)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import copy
+import math
+import random
+import unittest
+
+from tests.helpers import GAME_PARAMETERS
+
+from game_parameters import build_game_parameters
+from helpers import Helpers
+from history import ProjectileHistory
+from math_helpers import Coordinate
+
+
+class TestGetProjectilesNear(unittest.TestCase):
+    """The broad phase must keep every projectile the exact check would find."""
+
+    def setUp(self):
+        _, _, self.parameters, self.history = build_game_parameters(
+            copy.deepcopy(GAME_PARAMETERS)
+        )
+        self.helpers = Helpers(self.parameters, self.history)
+        self.random = random.Random(0)
+
+        # A projectile every 0.05 s, some already off the board
+        timestep = self.parameters.time.timestep
+        for tick in range(200):
+            projectile = ProjectileHistory(
+                self.random.uniform(-math.pi, math.pi), tick * timestep, True
+            )
+            self.history.add_projectile(projectile)
+            if self.random.random() < 0.2:
+                self.history.retire_projectile(projectile)
+        self.history.time = 200 * timestep
+
+    def brute_force_near(self, location, distance):
+
+        return [
+            projectile
+            for projectile, projectile_location in zip(
+                self.history.active_projectiles,
+                self.helpers.get_active_projectile_locations(),
+            )
+            if location.distance2(projectile_location) <= distance
+        ]
+
+    def assert_broad_phase_keeps(self, location, distance):
+
+        near = self.helpers.get_projectiles_near(location, distance)
+        for projectile in self.brute_force_near(location, distance):
+            self.assertIn(projectile, near)
+        for projectile in near:
+            self.assertTrue(projectile.on_board)
+
+    def test_random_locations(self):
+        half_width = self.parameters.environment.width / 2
+        half_height = self.parameters.environment.height / 2
+
+        for _ in range(2000):
+            location = Coordinate(
+                self.random.uniform(-half_width, half_width),
+                self.random.uniform(-half_height, half_height),
+            )
+            self.assert_broad_phase_keeps(location, self.random.uniform(0.5, 30.0))
+
+    def test_at_projectile_locations(self):
+        # Exactly on a projectile, and just within the distance of one
+        for projectile, location in zip(
+            self.history.active_projectiles,
+            self.helpers.get_active_projectile_locations(),
+        ):
+            self.assert_broad_phase_keeps(location, 0.0)
+            offset = Coordinate(math.cos(1.0), math.sin(1.0)) * 2.5
+            self.assert_broad_phase_keeps(location + offset, 2.5)
+
+    def test_at_the_turret(self):
+        self.assert_broad_phase_keeps(self.parameters.turret.location, 10.0)
+
+    def test_does_projectile_impact_rocket(self):
+        target_radius = self.parameters.rocket.target_radius
+        locations = self.helpers.get_active_projectile_locations()
+
+        for location in locations[:50] + [Coordinate(0.0, 0.0)]:
+            self.history.rocket.locations.append(location)
+            self.assertEqual(
+                self.helpers.does_projectile_impact_rocket(),
+                bool(self.brute_force_near(location, target_radius)),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import cmath
+import copy
+import math
+import random
+import unittest
+
+from tests.helpers import GAME_PARAMETERS
+
+from game_parameters import build_game_parameters
+from integrators import (
+    EXACT,
+    INTEGRATORS,
+    RK4,
+    SEMI_IMPLICIT_EULER,
+    VELOCITY_VERLET,
+    RocketState,
+)
+from math_helpers import Coordinate, normalise_angle
+from movement import Movement
+
+
+def original_step(state, acc_relative, angular_acc, timestep):
+    """The step Movement.move_the_rocket took before the integrators."""
+
+    acc = acc_relative.rotate_by(state.angle - math.pi / 2)
+    updated_vel = state.velocity + acc * timestep
+    updated_angular_vel = state.angular_velocity + angular_acc * timestep
+    return RocketState(
+        state.location + updated_vel * timestep,
+        updated_vel,
+        normalise_angle(state.angle + updated_angular_vel * timestep),
+        updated_angular_vel,
+    )
+
+
+def random_state(rng):
+    return RocketState(
+        Coordinate(rng.uniform(-100, 100), rng.uniform(-100, 100)),
+        Coordinate(rng.uniform(-20, 20), rng.uniform(-20, 20)),
+        rng.uniform(-math.pi, math.pi),
+        rng.uniform(-3, 3),
+    )
+
+
+def integrate(integrator, state, acc_relative, angular_acc, duration, nsteps):
+    for _ in range(nsteps):
+        state = integrator(state, acc_relative, angular_acc, duration / nsteps)
+    return state
+
+
+def distance(state, other):
+    return max(
+        (state.location - other.location).magnitude,
+        (state.velocity - other.velocity).magnitude,
+        abs(normalise_angle(state.angle - other.angle)),
+        abs(state.angular_velocity - other.angular_velocity),
+    )
+
+
+class TestSemiImplicitEuler(unittest.TestCase):
+    def test_reproduces_the_original_step(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            state = random_state(rng)
+            acc_relative = Coordinate(rng.uniform(-10, 10), rng.uniform(-10, 10))
+            angular_acc = rng.uniform(-5, 5)
+            timestep = rng.uniform(0.001, 0.1)
+
+            self.assertEqual(
+                INTEGRATORS[SEMI_IMPLICIT_EULER](
+                    state, acc_relative, angular_acc, timestep
+                ),
+                original_step(state, acc_relative, angular_acc, timestep),
+            )
+
+    def test_movement_steps_with_it_by_default(self):
+        _, _, parameters, history = build_game_parameters(
+            copy.deepcopy(GAME_PARAMETERS)
+        )
+        rocket = history.rocket
+        rocket.main_engine_forces.append(40.0)
+        rocket.left_front_thruster_forces.append(3.0)
+        rocket.left_rear_thruster_forces.append(0.0)
+        rocket.right_front_thruster_forces.append(0.0)
+        rocket.right_rear_thruster_forces.append(2.0)
+        state = RocketState(
+            rocket.location, rocket.velocity, rocket.angle, rocket.angular_velocity
+        )
+        expected = original_step(
+            state,
+            parameters.rocket.calc_acc_relative2rocket(rocket.engine_forces),
+            parameters.rocket.calc_angular_acc(rocket.thruster_forces),
+            parameters.time.timestep,
+        )
+
+        Movement(parameters, history).move_the_rocket()
+
+        self.assertEqual(
+            RocketState(
+                rocket.location,
+                rocket.velocity,
+                rocket.angle,
+                rocket.angular_velocity,
+            ),
+            expected,
+        )
+
+
+class TestExact(unittest.TestCase):
+    def setUp(self):
+        self.state = RocketState(Coordinate(3.0, -4.0), Coordinate(2.0, 1.0), 0.7, 0.0)
+        self.acc_relative = Coordinate(1.5, 6.0)
+
+    def test_constant_angle(self):
+        acc = self.acc_relative.rotate_by(self.state.angle - math.pi / 2)
+        for duration in (0.01, 0.5, 3.0):
+            with self.subTest(duration=duration):
+                end = INTEGRATORS[EXACT](self.state, self.acc_relative, 0.0, duration)
+                velocity = self.state.velocity + acc * duration
+                location = (
+                    self.state.location
+                    + self.state.velocity * duration
+                    + acc * (duration ** 2 / 2)
+                )
+
+                self.assertAlmostEqual(end.velocity.x, velocity.x, places=12)
+                self.assertAlmostEqual(end.velocity.y, velocity.y, places=12)
+                self.assertAlmostEqual(end.location.x, location.x, places=12)
+                self.assertAlmostEqual(end.location.y, location.y, places=12)
+                self.assertEqual(end.angle, self.state.angle)
+                self.assertEqual(end.angular_velocity, 0.0)
+
+    def test_zero_angular_acceleration(self):
+        # The thrust turns at a constant rate w: in the complex plane it is
+        # c * exp(iwt), which integrates once and twice in closed form.
+        w = 2.5
+        state = RocketState(
+            self.state.location, self.state.velocity, self.state.angle, w
+        )
+        c = complex(self.acc_relative.x, self.acc_relative.y) * cmath.exp(
+            1j * (state.angle - math.pi / 2)
+        )
+        for duration in (0.01, 0.1, 0.5):
+            with self.subTest(duration=duration):
+                end = INTEGRATORS[EXACT](state, self.acc_relative, 0.0, duration)
+                turn = cmath.exp(1j * w * duration)
+                velocity = c * (turn - 1) / (1j * w)
+                location = -c * (turn - 1 - 1j * w * duration) / w ** 2
+
+                self.assertAlmostEqual(
+                    end.velocity.x, state.velocity.x + velocity.real, places=10
+                )
+                self.assertAlmostEqual(
+                    end.velocity.y, state.velocity.y + velocity.imag, places=10
+                )
+                self.assertAlmostEqual(
+                    end.location.x,
+                    state.location.x + state.velocity.x * duration + location.real,
+                    places=10,
+                )
+                self.assertAlmostEqual(
+                    end.location.y,
+                    state.location.y + state.velocity.y * duration + location.imag,
+                    places=10,
+                )
+                self.assertAlmostEqual(
+                    end.angle, normalise_angle(state.angle + w * duration)
+                )
+                self.assertEqual(end.angular_velocity, w)
+
+
+class TestConvergence(unittest.TestCase):
+    def assertConvergesAtOrder(self, name, order):
+        state = RocketState(Coordinate(0.0, 0.0), Coordinate(5.0, -2.0), 0.3, 1.5)
+        acc_relative = Coordinate(2.0, 8.0)
+        angular_acc = -2.0
+        duration = 1.0
+        reference = integrate(
+            INTEGRATORS[EXACT], state, acc_relative, angular_acc, duration, 256
+        )
+
+        errors = [
+            distance(
+                integrate(
+                    INTEGRATORS[name], state, acc_relative, angular_acc, duration, n
+                ),
+                reference,
+            )
+            for n in (8, 16, 32)
+        ]
+
+        for coarse, fine in zip(errors, errors[1:]):
+            self.assertAlmostEqual(math.log2(coarse / fine), order, delta=0.3)
+
+    def test_velocity_verlet_is_second_order(self):
+        self.assertConvergesAtOrder(VELOCITY_VERLET, 2)
+
+    def test_rk4_is_fourth_order(self):
+        self.assertConvergesAtOrder(RK4, 4)
+
+
+class TestIntegratorParameter(unittest.TestCase):
+    def test_unknown_integrator_is_rejected(self):
+        game_params = copy.deepcopy(GAME_PARAMETERS)
+        game_params["time"]["integrator"] = "nope"
+
+        with self.assertRaises(AssertionError):
+            build_game_parameters(game_params)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import copy
+import math
+import unittest
+
+from tests.helpers import GAME_PARAMETERS
+
+from controller import Controller
+from controllers import Controllers
+from game_parameters import build_game_parameters
+from movement import Movement
+
+
+class HoldingRocket(Controller):
+    """Switches the engines off, then holds that for hold_time."""
+
+    hold_time = 0.0
+
+    def __init__(self, parameters, history):
+        super().__init__(parameters, history)
+        self.calls = []
+
+    def calc_inputs(self):
+
+        self.calls.append(self.history.time)
+        return 0.0, 0.0, 0.0, 0.0, 0.0
+
+    def calc_hold_time(self):
+
+        return self.hold_time
+
+
+class HoldingTurret(Controller):
+    """Fires once at fire_at, then holds its commands for hold_time."""
+
+    hold_time = 0.0
+    fire_at = math.inf
+
+    def __init__(self, parameters, history):
+        super().__init__(parameters, history)
+        self.calls = []
+        self.fired = 0
+
+    def calc_inputs(self):
+
+        self.calls.append(self.history.time)
+        fire = not self.fired and self.history.time >= self.fire_at - 1e-9
+        self.fired += fire
+        return 0.0, fire
+
+    def calc_hold_time(self):
+
+        return self.hold_time if self.fired else 0.0
+
+
+def controller_class(base, **attributes):
+    return type(base.__name__, (base,), attributes)
+
+
+class TestHolds(unittest.TestCase):
+    def play(self, rocket, turret, ticks):
+        """Step the controllers and the movement for a number of ticks."""
+
+        _, _, parameters, history = build_game_parameters(
+            copy.deepcopy(GAME_PARAMETERS)
+        )
+        controllers = Controllers(
+            parameters, history, (rocket, turret, True, True, False, False)
+        )
+        movement = Movement(parameters, history, deterministic=True)
+        for _ in range(ticks):
+            controllers.process_inputs()
+            self.assertFalse(controllers.issue_raised)
+            movement.move_objects()
+
+        self.history = history
+        return (
+            controllers.rocket_controller.controller,
+            controllers.turret_controller.controller,
+        )
+
+    def assertTimesEqual(self, times, expected):
+        self.assertEqual(len(times), len(expected), (times, expected))
+        for time, expected_time in zip(times, expected):
+            self.assertAlmostEqual(time, expected_time)
+
+    def test_held_inputs_skip_the_controller(self):
+        rocket, turret = self.play(
+            controller_class(HoldingRocket, hold_time=0.5), HoldingTurret, 40
+        )
+
+        self.assertTimesEqual(rocket.calls, [0.0, 0.5, 1.0, 1.5])
+        self.assertEqual(len(turret.calls), 40)
+        self.assertEqual(len(self.history.rocket.main_engine_forces), 40)
+
+    def test_hold_ends_when_a_projectile_is_fired(self):
+        rocket, turret = self.play(
+            controller_class(HoldingRocket, hold_time=10.0),
+            controller_class(HoldingTurret, hold_time=10.0, fire_at=0.5),
+            20,
+        )
+
+        self.assertTimesEqual(rocket.calls, [0.0, 0.55])
+        self.assertTimesEqual(turret.calls, [tick * 0.05 for tick in range(12)])
+
+    def test_hold_ends_when_a_projectile_leaves_the_board(self):
+        # The projectile flies from the turret along the x axis to the edge at
+        # x = 150, which takes 140 / 60 s
+        rocket, turret = self.play(
+            controller_class(HoldingRocket, hold_time=10.0),
+            controller_class(HoldingTurret, hold_time=10.0, fire_at=0.5),
+            70,
+        )
+        (projectile,) = self.history.projectiles
+        self.assertFalse(projectile.on_board)
+        retired = 0.5 + math.ceil(140 / 60 / 0.05) * 0.05
+
+        self.assertTimesEqual(rocket.calls, [0.0, 0.55, retired + 0.05])
+        self.assertTimesEqual(
+            turret.calls, [tick * 0.05 for tick in range(12)] + [retired + 0.05]
+        )
+
+    def test_held_fire_is_used_once(self):
+        _, turret = self.play(
+            HoldingRocket,
+            controller_class(HoldingTurret, hold_time=10.0, fire_at=0.5),
+            20,
+        )
+
+        self.assertEqual(turret.fired, 1)
+        self.assertTimesEqual(self.history.turret.when_fired, [0.5])
+        self.assertEqual(len(self.history.projectiles), 1)
+
+    def test_hold_drops_the_fire_command(self):
+        _, _, parameters, history = build_game_parameters(
+            copy.deepcopy(GAME_PARAMETERS)
+        )
+        history.time = 0.5
+        controllers = Controllers(
+            parameters,
+            history,
+            (
+                HoldingRocket,
+                controller_class(HoldingTurret, hold_time=10.0, fire_at=0.5),
+                True,
+                True,
+                False,
+                False,
+            ),
+        )
+        controllers.process_inputs()
+        turret = controllers.turret_controller
+        self.assertEqual(turret.inputs, (0.0, True))
+
+        turret.hold_inputs()
+
+        self.assertEqual(turret.inputs, (0.0, False))
+
+
+class TestHoldTimeValidation(unittest.TestCase):
+    def inputs_valid(self, hold_time):
+
+        _, _, parameters, history = build_game_parameters(
+            copy.deepcopy(GAME_PARAMETERS)
+        )
+        controllers = Controllers(
+            parameters,
+            history,
+            (
+                controller_class(HoldingRocket, hold_time=hold_time),
+                controller_class(HoldingTurret, hold_time=hold_time, fire_at=0.0),
+                True,
+                True,
+                False,
+                False,
+            ),
+        )
+        controllers.process_inputs()
+
+        return (
+            controllers.rocket_controller.inputs_valid,
+            controllers.turret_controller.inputs_valid,
+        )
+
+    def test_valid_hold_times(self):
+        for hold_time in (0.0, 0.05, 2.5):
+            with self.subTest(hold_time=hold_time):
+                self.assertEqual(self.inputs_valid(hold_time), (True, True))
+
+    def test_invalid_hold_times(self):
+        for hold_time in (None, "1.0", 1, -0.05, math.nan, math.inf):
+            with self.subTest(hold_time=hold_time):
+                self.assertEqual(self.inputs_valid(hold_time), (False, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
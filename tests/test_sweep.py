@@ -0,0 +1,100 @@
+import copy
+import csv
+import os
+import tempfile
+import unittest
+
+from tests.helpers import GAME_PARAMETERS
+
+from result import ROCKET_ERROR, TURRET_WIN
+from sweep import (
+    LATIN_HYPERCUBE,
+    OUTCOME_FIELDS,
+    ROCKET_GAINS,
+    ROCKET_WEIGHTS,
+    Sweep,
+    expand_grid,
+)
+
+
+def base_params(rocket="default"):
+
+    game_params = copy.deepcopy(GAME_PARAMETERS)
+    game_params["controllers"]["rocket_active_controller"] = rocket
+    game_params["controllers"]["rocket_raise_errors"] = False
+
+    return game_params
+
+
+class TestExpandGrid(unittest.TestCase):
+    def test_rocket_options_only_when_swept(self):
+        points = [{"turret.projectile_speed": 40.0}]
+        [(_, game_params)] = expand_grid(base_params(), points)
+
+        self.assertNotIn(ROCKET_WEIGHTS, game_params)
+        self.assertNotIn(ROCKET_GAINS, game_params)
+        self.assertEqual(game_params["turret"]["projectile_speed"], 40.0)
+
+    def test_rocket_option_axis(self):
+        points = [{"rocket_gains.p_c": 0.5}]
+        [(_, game_params)] = expand_grid(base_params(), points)
+
+        self.assertEqual(game_params[ROCKET_GAINS], {"p_c": 0.5})
+        self.assertNotIn(ROCKET_WEIGHTS, game_params)
+
+    def test_unknown_rocket_option(self):
+        with self.assertRaises(KeyError):
+            list(expand_grid(base_params(), [{"rocket_gains.nope": 1.0}]))
+
+
+class TestSweep(unittest.TestCase):
+    def test_player_rocket(self):
+        # The player rocket takes no weights or gains, so none must be given to it
+        sweep = Sweep(base_params("player"), {"turret.projectile_speed": [40.0, 60.0]})
+        rows = sweep.run(max_workers=1)
+
+        self.assertEqual(len(rows), 2)
+        for row in rows:
+            self.assertEqual(row["cause"], ROCKET_ERROR)
+            self.assertEqual(row["winner"], TURRET_WIN)
+
+    def test_default_rocket_with_gains(self):
+        sweep = Sweep(base_params(), {"rocket_gains.p_c": [0.5, 0.75]})
+        rows = sweep.run(max_workers=1)
+
+        self.assertEqual([row["rocket_gains.p_c"] for row in rows], [0.5, 0.75])
+
+    def test_invalid_point_kept_as_error(self):
+        # An int fails validation; the other points are still played
+        sweep = Sweep(base_params(), {"turret.projectile_speed": [20, 40.0]})
+        invalid, valid = sweep.run(max_workers=1)
+
+        self.assertIn("AssertionError", invalid["error"])
+        self.assertIsNone(invalid["cause"])
+        self.assertIsNone(valid["error"])
+        self.assertIsNotNone(valid["cause"])
+
+    def test_controller_error_kept_as_error(self):
+        game_params = base_params("player")
+        game_params["controllers"]["rocket_raise_errors"] = True
+        (row,) = Sweep(game_params, {"turret.projectile_speed": [40.0]}).run(1)
+
+        self.assertIn("NotImplementedError", row["error"])
+
+    def test_no_points(self):
+        sweep = Sweep(
+            base_params(), {"turret.projectile_speed": (20.0, 40.0)}, LATIN_HYPERCUBE, 0
+        )
+        self.assertEqual(sweep.run(max_workers=1), [])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.csv")
+            sweep.write_csv([], path)
+            with open(path, newline="") as f:
+                rows = list(csv.reader(f))
+
+        self.assertEqual(rows, [["turret.projectile_speed", *OUTCOME_FIELDS]])
+
+
+if __name__ == "__main__":
+    unittest.main()
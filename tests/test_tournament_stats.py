@@ -0,0 +1,141 @@
+import random
+import unittest
+
+from result import DRAW, ROCKET_WIN, TURRET_WIN
+from tournament_stats import Elo, LogHistogram
+
+
+class TestLogHistogram(unittest.TestCase):
+    def setUp(self):
+        self.random = random.Random(0)
+        # Controller times span several orders of magnitude
+        self.values = [10 ** self.random.uniform(-6, -1) for _ in range(10000)]
+
+    @staticmethod
+    def exact_percentile(values, percent):
+
+        values = sorted(values)
+        return values[int(percent / 100 * (len(values) - 1))]
+
+    def assert_within_relative_error(self, histogram, values):
+
+        for percent in (0, 1, 10, 50, 90, 99, 99.9, 100):
+            exact = self.exact_percentile(values, percent)
+            self.assertLessEqual(
+                abs(histogram.percentile(percent) - exact),
+                histogram.relative_error * exact * (1 + 1e-9),
+                f"p{percent}",
+            )
+
+    def test_empty(self):
+        self.assertIsNone(LogHistogram().percentile(50))
+
+    def test_percentiles_within_relative_error(self):
+        for relative_error in (0.01, 0.05):
+            histogram = LogHistogram(relative_error)
+            for value in self.values:
+                histogram.add(value)
+
+            self.assertEqual(histogram.count, len(self.values))
+            self.assert_within_relative_error(histogram, self.values)
+
+    def test_values_up_to_min_value_count_as_zero(self):
+        histogram = LogHistogram(min_value=1e-6)
+        for value in (0.0, 1e-7, 1e-6, 1.0):
+            histogram.add(value)
+
+        self.assertEqual(histogram.zero_count, 3)
+        self.assertEqual(histogram.percentile(50), 0.0)
+        self.assertAlmostEqual(histogram.percentile(100), 1.0, delta=0.01)
+
+    def test_merge(self):
+        first = LogHistogram()
+        second = LogHistogram()
+        both = LogHistogram()
+        for i, value in enumerate(self.values):
+            (first if i % 3 else second).add(value)
+            both.add(value)
+
+        first.merge(second)
+
+        self.assertEqual(first.count, both.count)
+        self.assertEqual(first.zero_count, both.zero_count)
+        self.assertEqual(first.buckets, both.buckets)
+        self.assert_within_relative_error(first, self.values)
+
+    def test_merge_different_relative_error(self):
+        with self.assertRaises(ValueError):
+            LogHistogram(0.01).merge(LogHistogram(0.02))
+
+    def test_collapse_keeps_the_high_percentiles(self):
+        histogram = LogHistogram(max_buckets=50)
+        for value in self.values:
+            histogram.add(value)
+
+        self.assertLessEqual(len(histogram.buckets), 50)
+        self.assertEqual(histogram.count, len(self.values))
+        self.assertEqual(sum(histogram.buckets.values()), len(self.values))
+        # Only the smallest buckets are merged; the top 50 still hold the top 8%
+        for percent in (95, 99, 100):
+            exact = self.exact_percentile(self.values, percent)
+            self.assertLessEqual(
+                abs(histogram.percentile(percent) - exact),
+                histogram.relative_error * exact * (1 + 1e-9),
+            )
+        # The lowest values are counted in a bucket above them
+        self.assertGreater(histogram.percentile(0), min(self.values))
+
+    def test_merge_collapses_to_max_buckets(self):
+        first = LogHistogram(max_buckets=50)
+        second = LogHistogram(max_buckets=50)
+        for value in self.values:
+            (first if value < 1e-3 else second).add(value)
+
+        first.merge(second)
+
+        self.assertLessEqual(len(first.buckets), 50)
+        self.assertEqual(sum(first.buckets.values()), len(self.values))
+
+
+class TestElo(unittest.TestCase):
+    def test_equal_ratings(self):
+        elo = Elo(k=16, initial=1500)
+        elo.update("a", "b", ROCKET_WIN)
+
+        self.assertAlmostEqual(elo.ratings[("rocket", "a")], 1508)
+        self.assertAlmostEqual(elo.ratings[("turret", "b")], 1492)
+
+    def test_draw_between_equals_changes_nothing(self):
+        elo = Elo()
+        elo.update("a", "b", DRAW)
+
+        self.assertAlmostEqual(elo.ratings[("rocket", "a")], elo.initial)
+        self.assertAlmostEqual(elo.ratings[("turret", "b")], elo.initial)
+
+    def test_expected_score(self):
+        # 400 points ahead, the turret is expected to score 10/11
+        elo = Elo(k=22)
+        elo.ratings[("turret", "b")] = 1900
+        elo.update("a", "b", TURRET_WIN)
+
+        self.assertAlmostEqual(elo.ratings[("rocket", "a")], 1500 - 2)
+        self.assertAlmostEqual(elo.ratings[("turret", "b")], 1900 + 2)
+
+    def test_upset(self):
+        elo = Elo(k=22)
+        elo.ratings[("turret", "b")] = 1900
+        elo.update("a", "b", ROCKET_WIN)
+
+        self.assertAlmostEqual(elo.ratings[("rocket", "a")], 1500 + 20)
+        self.assertAlmostEqual(elo.ratings[("turret", "b")], 1900 - 20)
+
+    def test_sides_rated_separately(self):
+        elo = Elo()
+        elo.update("default", "default", ROCKET_WIN)
+
+        self.assertGreater(elo.ratings[("rocket", "default")], elo.initial)
+        self.assertLess(elo.ratings[("turret", "default")], elo.initial)
+
+
+if __name__ == "__main__":
+    unittest.main()